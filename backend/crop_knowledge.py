@@ -4,1022 +4,537 @@ Comprehensive farming guidance based on ICAR, Ministry of Agriculture recommenda
 Enhanced with pulses, oilseeds, vegetables and benefit analysis
 """
 
-# Crop-specific knowledge based on Indian agricultural practices
-CROP_KNOWLEDGE = {
-    # ============ PULSES ============
-    "chickpea": {
-        "name_hi": "चना",
-        "name_te": "శనగలు",
-        "category": "Pulses",
-        "optimal_season": ["Rabi"],
-        "sowing_months": {"Rabi": "October-November"},
-        "harvest_months": {"Rabi": "February-March"},
-        "water_requirement_mm": 350,
-        "optimal_soil": ["Black", "Loamy", "Sandy loam"],
-        "optimal_ph": "6.0-8.0",
-        "seed_rate_kg_ha": 75,
-        "spacing_cm": "30x10",
-        "fertilizer_recommendation": {"N": "20 kg/ha", "P": "40 kg/ha", "K": "20 kg/ha"},
-        "major_pests": ["Pod borer", "Cutworm", "Aphids"],
-        "major_diseases": ["Wilt", "Ascochyta blight", "Root rot"],
-        "irrigation_stages": ["Pre-sowing", "Flowering", "Pod formation"],
-        "top_states": ["Madhya Pradesh", "Maharashtra", "Rajasthan", "Uttar Pradesh", "Karnataka"],
-        "yield_range_kg_ha": {"min": 800, "max": 2000, "avg": 1200},
-        "msp_2024": 5440,
-        "tips": [
-            "Seed treatment with Rhizobium culture increases yield by 15-20%",
-            "Avoid waterlogging - chickpea is highly sensitive",
-            "One irrigation at flowering critical for pod filling",
-            "Use wilt-resistant varieties in endemic areas"
-        ],
-        "benefits_analysis": {
-            "organic_premium": "20-30% higher price for organic chickpea",
-            "nitrogen_fixation": "Fixes 50-80 kg N/ha, saves Rs 2000-3000 on next crop fertilizer",
-            "intercropping_benefit": "With mustard increases total income by 25%"
-        }
-    },
-    "pigeon_pea": {
-        "name_hi": "अरहर/तूर",
-        "name_te": "కందులు",
-        "category": "Pulses",
-        "optimal_season": ["Kharif"],
-        "sowing_months": {"Kharif": "June-July"},
-        "harvest_months": {"Kharif": "December-February"},
-        "water_requirement_mm": 600,
-        "optimal_soil": ["Loamy", "Sandy loam", "Red"],
-        "optimal_ph": "5.5-7.0",
-        "seed_rate_kg_ha": 15,
-        "spacing_cm": "60x20",
-        "fertilizer_recommendation": {"N": "20 kg/ha", "P": "50 kg/ha", "K": "20 kg/ha"},
-        "major_pests": ["Pod borer", "Pod fly", "Blister beetle"],
-        "major_diseases": ["Wilt", "Sterility mosaic", "Phytophthora blight"],
-        "irrigation_stages": ["Flowering", "Pod development"],
-        "top_states": ["Maharashtra", "Karnataka", "Madhya Pradesh", "Uttar Pradesh", "Gujarat"],
-        "yield_range_kg_ha": {"min": 600, "max": 1500, "avg": 900},
-        "msp_2024": 7000,
-        "tips": [
-            "Use ICPL 87119 (Asha) for wilt resistance",
-            "Nipping at 30 days promotes branching",
-            "IPM with pheromone traps reduces pod borer by 40%",
-            "Intercrop with sorghum or cotton for better returns"
-        ],
-        "benefits_analysis": {
-            "ipm_benefit": "IPM reduces pesticide cost by 40% and increases yield by 15%",
-            "intercropping_income": "Intercropping adds Rs 15,000-20,000/ha additional income",
-            "soil_improvement": "Improves soil nitrogen by 40-50 kg/ha"
-        }
-    },
-    "lentil": {
-        "name_hi": "मसूर",
-        "name_te": "మసూర్ పప్పు",
-        "category": "Pulses",
-        "optimal_season": ["Rabi"],
-        "sowing_months": {"Rabi": "October-November"},
-        "harvest_months": {"Rabi": "February-March"},
-        "water_requirement_mm": 300,
-        "optimal_soil": ["Loamy", "Clay loam", "Alluvial"],
-        "optimal_ph": "6.0-7.5",
-        "seed_rate_kg_ha": 40,
-        "spacing_cm": "25x5",
-        "fertilizer_recommendation": {"N": "20 kg/ha", "P": "40 kg/ha", "K": "20 kg/ha"},
-        "major_pests": ["Aphids", "Pod borer", "Cutworm"],
-        "major_diseases": ["Rust", "Wilt", "Root rot"],
-        "irrigation_stages": ["Pre-sowing", "Flowering"],
-        "top_states": ["Madhya Pradesh", "Uttar Pradesh", "Bihar", "West Bengal"],
-        "yield_range_kg_ha": {"min": 600, "max": 1500, "avg": 900},
-        "msp_2024": 6425,
-        "tips": [
-            "Conserve soil moisture with mulching",
-            "Avoid late sowing - reduces yield significantly",
-            "Spray 2% urea at flowering for better grain filling",
-            "Harvest when 80% pods turn brown"
-        ],
-        "benefits_analysis": {
-            "water_saving": "Requires 40% less water than wheat",
-            "export_potential": "Premium quality fetches 30% higher export prices",
-            "residue_benefit": "Crop residue adds Rs 3000/ha value as fodder"
-        }
-    },
-    "moong": {
-        "name_hi": "मूंग",
-        "name_te": "పెసలు",
-        "category": "Pulses",
-        "optimal_season": ["Kharif", "Zaid"],
-        "sowing_months": {"Kharif": "July", "Zaid": "March-April"},
-        "harvest_months": {"Kharif": "September-October", "Zaid": "May-June"},
-        "water_requirement_mm": 250,
-        "optimal_soil": ["Loamy", "Sandy loam", "Alluvial"],
-        "optimal_ph": "6.5-7.5",
-        "seed_rate_kg_ha": 20,
-        "spacing_cm": "30x10",
-        "fertilizer_recommendation": {"N": "20 kg/ha", "P": "40 kg/ha", "K": "20 kg/ha"},
-        "major_pests": ["Whitefly", "Thrips", "Pod borer"],
-        "major_diseases": ["Yellow mosaic virus", "Powdery mildew", "Cercospora leaf spot"],
-        "irrigation_stages": ["Flowering", "Pod development"],
-        "top_states": ["Rajasthan", "Maharashtra", "Andhra Pradesh", "Karnataka"],
-        "yield_range_kg_ha": {"min": 500, "max": 1200, "avg": 800},
-        "msp_2024": 8558,
-        "tips": [
-            "Use virus-resistant varieties (IPM 02-3, SML 668)",
-            "Short duration crop - ideal for crop intensification",
-            "Yellow sticky traps reduce whitefly by 60%",
-            "Pick mature pods every 3-4 days for multiple harvests"
-        ],
-        "benefits_analysis": {
-            "short_duration": "60-65 day crop allows 3 crops per year",
-            "premium_price": "Summer moong fetches 20-30% premium",
-            "nitrogen_value": "Adds 20-25 kg N/ha to soil worth Rs 1000"
-        }
-    },
-    "urad": {
-        "name_hi": "उड़द",
-        "name_te": "మినుములు",
-        "category": "Pulses",
-        "optimal_season": ["Kharif"],
-        "sowing_months": {"Kharif": "June-July"},
-        "harvest_months": {"Kharif": "September-October"},
-        "water_requirement_mm": 300,
-        "optimal_soil": ["Loamy", "Clay loam", "Black"],
-        "optimal_ph": "6.5-7.8",
-        "seed_rate_kg_ha": 20,
-        "spacing_cm": "30x10",
-        "fertilizer_recommendation": {"N": "20 kg/ha", "P": "40 kg/ha", "K": "20 kg/ha"},
-        "major_pests": ["Stem fly", "Whitefly", "Pod borer"],
-        "major_diseases": ["Yellow mosaic virus", "Leaf crinkle", "Powdery mildew"],
-        "irrigation_stages": ["Flowering", "Pod filling"],
-        "top_states": ["Madhya Pradesh", "Uttar Pradesh", "Maharashtra", "Andhra Pradesh"],
-        "yield_range_kg_ha": {"min": 500, "max": 1200, "avg": 750},
-        "msp_2024": 6950,
-        "tips": [
-            "Select YMV resistant varieties",
-            "Avoid waterlogging at all costs",
-            "Seed treatment with Trichoderma prevents root rot",
-            "Harvest when 80% pods mature to avoid shattering"
-        ],
-        "benefits_analysis": {
-            "dal_premium": "Whole urad fetches 40% premium over split dal",
-            "idli_industry": "Quality urad for idli makers gets 25% premium",
-            "crop_rotation": "Excellent rotation crop after paddy"
-        }
-    },
-    # ============ OILSEEDS ============
-    "mustard": {
-        "name_hi": "सरसों",
-        "name_te": "ఆవాలు",
-        "category": "Oilseeds",
-        "optimal_season": ["Rabi"],
-        "sowing_months": {"Rabi": "October-November"},
-        "harvest_months": {"Rabi": "February-March"},
-        "water_requirement_mm": 350,
-        "optimal_soil": ["Loamy", "Sandy loam", "Alluvial"],
-        "optimal_ph": "6.0-7.5",
-        "seed_rate_kg_ha": 5,
-        "spacing_cm": "45x15",
-        "fertilizer_recommendation": {"N": "80 kg/ha", "P": "40 kg/ha", "K": "40 kg/ha", "Sulphur": "40 kg/ha"},
-        "major_pests": ["Aphids", "Sawfly", "Painted bug"],
-        "major_diseases": ["White rust", "Alternaria blight", "Downy mildew"],
-        "irrigation_stages": ["Pre-flowering", "Siliqua formation"],
-        "top_states": ["Rajasthan", "Uttar Pradesh", "Haryana", "Madhya Pradesh", "Gujarat"],
-        "yield_range_kg_ha": {"min": 1000, "max": 2500, "avg": 1500},
-        "msp_2024": 5650,
-        "tips": [
-            "Apply sulphur for higher oil content (increases by 2-3%)",
-            "Control aphids before flowering stage",
-            "Thiram seed treatment prevents seedling diseases",
-            "Harvest when 75% siliquae turn yellow"
-        ],
-        "benefits_analysis": {
-            "sulphur_roi": "Rs 40 spent on sulphur gives Rs 400 additional return",
-            "oil_bonus": "Each 1% increase in oil content = Rs 200/quintal premium",
-            "bee_keeping": "Bee colonies increase yield by 20% and give honey income"
-        }
-    },
-    "sunflower": {
-        "name_hi": "सूरजमुखी",
-        "name_te": "పొద్దుతిరుగుడు",
-        "category": "Oilseeds",
-        "optimal_season": ["Kharif", "Rabi", "Zaid"],
-        "sowing_months": {"Kharif": "June-July", "Rabi": "September-October", "Zaid": "January-February"},
-        "harvest_months": {"Kharif": "September-October", "Rabi": "January-February", "Zaid": "April-May"},
-        "water_requirement_mm": 500,
-        "optimal_soil": ["Loamy", "Clay loam", "Black"],
-        "optimal_ph": "6.5-8.0",
-        "seed_rate_kg_ha": 5,
-        "spacing_cm": "60x30",
-        "fertilizer_recommendation": {"N": "60 kg/ha", "P": "60 kg/ha", "K": "30 kg/ha"},
-        "major_pests": ["Head borer", "Capitulum borer", "Aphids"],
-        "major_diseases": ["Alternaria leaf spot", "Rust", "Downy mildew"],
-        "irrigation_stages": ["Button stage", "Flowering", "Seed development"],
-        "top_states": ["Karnataka", "Andhra Pradesh", "Maharashtra", "Tamil Nadu"],
-        "yield_range_kg_ha": {"min": 1000, "max": 2000, "avg": 1400},
-        "msp_2024": 6760,
-        "tips": [
-            "Use hybrids for 30-40% higher yield",
-            "Boron application improves seed setting",
-            "Bird scaring needed during maturity",
-            "Harvest when back of head turns yellow"
-        ],
-        "benefits_analysis": {
-            "hybrid_advantage": "Hybrids give Rs 8000-12000/ha more income",
-            "boron_roi": "Rs 100 boron investment gives Rs 1500 return",
-            "oil_quality": "High oleic varieties fetch 15% premium"
-        }
-    },
-    "castor": {
-        "name_hi": "अरंडी",
-        "name_te": "ఆముదం",
-        "category": "Oilseeds",
-        "optimal_season": ["Kharif"],
-        "sowing_months": {"Kharif": "July-August"},
-        "harvest_months": {"Kharif": "November-January"},
-        "water_requirement_mm": 500,
-        "optimal_soil": ["Sandy loam", "Loamy", "Red"],
-        "optimal_ph": "5.5-6.5",
-        "seed_rate_kg_ha": 10,
-        "spacing_cm": "90x60",
-        "fertilizer_recommendation": {"N": "60 kg/ha", "P": "40 kg/ha", "K": "20 kg/ha"},
-        "major_pests": ["Semilooper", "Capsule borer", "Tobacco caterpillar"],
-        "major_diseases": ["Wilt", "Root rot", "Grey rot"],
-        "irrigation_stages": ["Branching", "Flowering", "Capsule development"],
-        "top_states": ["Gujarat", "Rajasthan", "Andhra Pradesh", "Telangana"],
-        "yield_range_kg_ha": {"min": 1000, "max": 2500, "avg": 1500},
-        "msp_2024": 5650,
-        "tips": [
-            "India is world's largest castor producer",
-            "Use GCH-7 hybrid for high yield",
-            "IPM reduces pest management cost by 50%",
-            "Harvest spikes when capsules turn brown"
-        ],
-        "benefits_analysis": {
-            "export_earning": "India exports 80% of world castor oil - stable demand",
-            "intercrop_income": "Intercropping with groundnut adds Rs 10,000/ha",
-            "industrial_demand": "Industrial oil demand growing 8% annually"
-        }
-    },
-    "sesame": {
-        "name_hi": "तिल",
-        "name_te": "నువ్వులు",
-        "category": "Oilseeds",
-        "optimal_season": ["Kharif"],
-        "sowing_months": {"Kharif": "June-July"},
-        "harvest_months": {"Kharif": "September-October"},
-        "water_requirement_mm": 300,
-        "optimal_soil": ["Sandy loam", "Loamy", "Alluvial"],
-        "optimal_ph": "5.5-8.0",
-        "seed_rate_kg_ha": 4,
-        "spacing_cm": "45x15",
-        "fertilizer_recommendation": {"N": "40 kg/ha", "P": "20 kg/ha", "K": "20 kg/ha"},
-        "major_pests": ["Leaf webber", "Gall fly", "Hawk moth"],
-        "major_diseases": ["Phyllody", "Bacterial blight", "Alternaria leaf spot"],
-        "irrigation_stages": ["Flowering", "Capsule formation"],
-        "top_states": ["West Bengal", "Rajasthan", "Gujarat", "Madhya Pradesh"],
-        "yield_range_kg_ha": {"min": 300, "max": 800, "avg": 450},
-        "msp_2024": 8635,
-        "tips": [
-            "Drought tolerant - ideal for rainfed areas",
-            "White seeded varieties fetch premium",
-            "Harvest when lower capsules start browning",
-            "Stack harvested plants upside down to dry"
-        ],
-        "benefits_analysis": {
-            "organic_premium": "Organic sesame fetches 50-100% premium",
-            "export_quality": "Japan/Korea markets pay 40% premium for quality",
-            "low_input": "Minimal input crop - high profit margin"
-        }
-    },
-    # ============ VEGETABLES ============
-    "tomato": {
-        "name_hi": "टमाटर",
-        "name_te": "టమాట",
-        "category": "Vegetables",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {"Kharif": "June-July", "Rabi": "September-October"},
-        "harvest_months": {"Kharif": "October-November", "Rabi": "January-March"},
-        "water_requirement_mm": 600,
-        "optimal_soil": ["Loamy", "Sandy loam", "Red"],
-        "optimal_ph": "6.0-7.0",
-        "seed_rate_kg_ha": 0.5,
-        "spacing_cm": "60x45",
-        "fertilizer_recommendation": {"N": "120 kg/ha", "P": "60 kg/ha", "K": "60 kg/ha"},
-        "major_pests": ["Fruit borer", "Whitefly", "Leaf miner", "Thrips"],
-        "major_diseases": ["Late blight", "Early blight", "Bacterial wilt", "Tomato leaf curl virus"],
-        "irrigation_stages": ["Transplanting", "Flowering", "Fruit development"],
-        "top_states": ["Andhra Pradesh", "Madhya Pradesh", "Karnataka", "Odisha", "West Bengal"],
-        "yield_range_kg_ha": {"min": 20000, "max": 50000, "avg": 30000},
-        "tips": [
-            "Stake plants for better quality fruits",
-            "Drip irrigation increases yield by 30%",
-            "Use TLCV resistant hybrids in endemic areas",
-            "Harvest at breaker stage for distant markets"
-        ],
-        "benefits_analysis": {
-            "drip_roi": "Drip saves 40% water and increases yield 30%",
-            "staking_benefit": "Staking reduces fruit rot by 50%, increases A-grade by 40%",
-            "off_season": "Off-season production fetches 200-300% premium",
-            "processing": "Processing grade contract gives stable Rs 8-10/kg"
-        }
-    },
-    "potato": {
-        "name_hi": "आलू",
-        "name_te": "బంగాళాదుంప",
-        "category": "Vegetables",
-        "optimal_season": ["Rabi"],
-        "sowing_months": {"Rabi": "October-November"},
-        "harvest_months": {"Rabi": "February-March"},
-        "water_requirement_mm": 500,
-        "optimal_soil": ["Sandy loam", "Loamy", "Alluvial"],
-        "optimal_ph": "5.5-6.5",
-        "seed_rate_kg_ha": 2500,
-        "spacing_cm": "60x20",
-        "fertilizer_recommendation": {"N": "150 kg/ha", "P": "100 kg/ha", "K": "120 kg/ha"},
-        "major_pests": ["Aphids", "Cutworm", "Potato tuber moth"],
-        "major_diseases": ["Late blight", "Early blight", "Black scurf", "Common scab"],
-        "irrigation_stages": ["Stolon formation", "Tuber bulking", "Maturation"],
-        "top_states": ["Uttar Pradesh", "West Bengal", "Bihar", "Gujarat", "Punjab"],
-        "yield_range_kg_ha": {"min": 15000, "max": 35000, "avg": 22000},
-        "tips": [
-            "Use certified seed tubers only",
-            "Earthing up twice is essential",
-            "Stop irrigation 10 days before harvest",
-            "Cure tubers before storage"
-        ],
-        "benefits_analysis": {
-            "certified_seed": "Certified seed gives 25-30% higher yield",
-            "cold_storage": "Cold storage allows selling at 40-60% premium",
-            "chips_variety": "Chips varieties (Chipsona) fetch Rs 3-5/kg premium",
-            "export_quality": "EU export grade fetches 50% premium"
-        }
-    },
-    "onion": {
-        "name_hi": "प्याज",
-        "name_te": "ఉల్లిపాయ",
-        "category": "Vegetables",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {"Kharif": "June-July", "Rabi": "October-November"},
-        "harvest_months": {"Kharif": "October-November", "Rabi": "April-May"},
-        "water_requirement_mm": 550,
-        "optimal_soil": ["Loamy", "Clay loam", "Alluvial"],
-        "optimal_ph": "6.0-7.0",
-        "seed_rate_kg_ha": 10,
-        "spacing_cm": "15x10",
-        "fertilizer_recommendation": {"N": "100 kg/ha", "P": "50 kg/ha", "K": "50 kg/ha", "Sulphur": "30 kg/ha"},
-        "major_pests": ["Thrips", "Onion fly", "Mites"],
-        "major_diseases": ["Purple blotch", "Stemphylium blight", "Basal rot"],
-        "irrigation_stages": ["Bulb initiation", "Bulb development"],
-        "top_states": ["Maharashtra", "Karnataka", "Madhya Pradesh", "Gujarat", "Rajasthan"],
-        "yield_range_kg_ha": {"min": 15000, "max": 30000, "avg": 20000},
-        "tips": [
-            "Stop irrigation 15 days before harvest",
-            "Cure bulbs for 7-10 days before storage",
-            "Proper ventilation in storage reduces losses",
-            "Grade before selling for better prices"
-        ],
-        "benefits_analysis": {
-            "storage_timing": "3-month storage can give 100-200% price increase",
-            "grading_premium": "A-grade onions fetch 30-40% premium",
-            "export_window": "Export during June-August gives best returns",
-            "dehydration": "Dehydrated onion contract gives stable income"
-        }
-    },
-    "chilli": {
-        "name_hi": "मिर्च",
-        "name_te": "మిర్చి",
-        "category": "Vegetables",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {"Kharif": "June-July", "Rabi": "September-October"},
-        "harvest_months": {"Kharif": "October-February", "Rabi": "January-May"},
-        "water_requirement_mm": 600,
-        "optimal_soil": ["Loamy", "Sandy loam", "Black"],
-        "optimal_ph": "6.0-7.0",
-        "seed_rate_kg_ha": 1.5,
-        "spacing_cm": "60x45",
-        "fertilizer_recommendation": {"N": "100 kg/ha", "P": "50 kg/ha", "K": "50 kg/ha"},
-        "major_pests": ["Thrips", "Mites", "Fruit borer", "Aphids"],
-        "major_diseases": ["Leaf curl", "Anthracnose", "Powdery mildew", "Bacterial wilt"],
-        "irrigation_stages": ["Transplanting", "Flowering", "Fruit development"],
-        "top_states": ["Andhra Pradesh", "Telangana", "Karnataka", "Madhya Pradesh", "Maharashtra"],
-        "yield_range_kg_ha": {"min": 8000, "max": 20000, "avg": 12000},
-        "tips": [
-            "Use virus-free seedlings from protected nursery",
-            "Mulching reduces thrips and conserves moisture",
-            "Pick red chillies at 75% color development",
-            "Solar drying gives better color and quality"
-        ],
-        "benefits_analysis": {
-            "mulching_roi": "Mulching increases yield 25% and reduces pesticide 30%",
-            "color_value": "High ASTA color fetches Rs 20-30/kg premium",
-            "teja_premium": "Teja variety for export gets 40% premium",
-            "oleoresin": "Oleoresin grade chilli fetches stable contract price"
-        }
-    },
-    "brinjal": {
-        "name_hi": "बैंगन",
-        "name_te": "వంకాయ",
-        "category": "Vegetables",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {"Kharif": "June-July", "Rabi": "October-November"},
-        "harvest_months": {"Kharif": "September-December", "Rabi": "January-April"},
-        "water_requirement_mm": 550,
-        "optimal_soil": ["Loamy", "Clay loam", "Alluvial"],
-        "optimal_ph": "5.5-6.5",
-        "seed_rate_kg_ha": 0.5,
-        "spacing_cm": "60x60",
-        "fertilizer_recommendation": {"N": "100 kg/ha", "P": "50 kg/ha", "K": "50 kg/ha"},
-        "major_pests": ["Shoot and fruit borer", "Jassids", "Aphids", "Whitefly"],
-        "major_diseases": ["Bacterial wilt", "Phomopsis blight", "Little leaf"],
-        "irrigation_stages": ["Transplanting", "Flowering", "Fruiting"],
-        "top_states": ["West Bengal", "Odisha", "Bihar", "Gujarat", "Andhra Pradesh"],
-        "yield_range_kg_ha": {"min": 25000, "max": 50000, "avg": 35000},
-        "tips": [
-            "Use pheromone traps @ 5/acre for borer monitoring",
-            "Clip and destroy affected shoots weekly",
-            "Harvest at right maturity - shiny fruits",
-            "Avoid waterlogging to prevent bacterial wilt"
-        ],
-        "benefits_analysis": {
-            "ipm_benefit": "IPM reduces borer damage 60% and pesticide cost 40%",
-            "frequency_picking": "Regular picking increases total yield 20%",
-            "local_varieties": "Local varieties fetch premium in traditional markets"
-        }
-    },
-    "okra": {
-        "name_hi": "भिंडी",
-        "name_te": "బెండకాయ",
-        "category": "Vegetables",
-        "optimal_season": ["Kharif", "Zaid"],
-        "sowing_months": {"Kharif": "June-July", "Zaid": "February-March"},
-        "harvest_months": {"Kharif": "August-October", "Zaid": "April-June"},
-        "water_requirement_mm": 400,
-        "optimal_soil": ["Loamy", "Sandy loam", "Alluvial"],
-        "optimal_ph": "6.0-7.0",
-        "seed_rate_kg_ha": 10,
-        "spacing_cm": "45x30",
-        "fertilizer_recommendation": {"N": "100 kg/ha", "P": "60 kg/ha", "K": "50 kg/ha"},
-        "major_pests": ["Shoot and fruit borer", "Jassids", "Whitefly", "Mites"],
-        "major_diseases": ["Yellow vein mosaic", "Powdery mildew", "Cercospora leaf spot"],
-        "irrigation_stages": ["Germination", "Flowering", "Pod development"],
-        "top_states": ["Uttar Pradesh", "Bihar", "West Bengal", "Odisha", "Gujarat"],
-        "yield_range_kg_ha": {"min": 8000, "max": 15000, "avg": 10000},
-        "tips": [
-            "Use YVMV resistant varieties",
-            "Pick tender fruits every 2-3 days",
-            "Seed treatment with Imidacloprid prevents early pest attack",
-            "Summer crop fetches premium prices"
-        ],
-        "benefits_analysis": {
-            "frequent_harvest": "Alternate day picking increases yield 25%",
-            "summer_premium": "Summer okra fetches 50-100% premium",
-            "export_quality": "Tender 6-8cm fruits get export premium"
-        }
-    },
-    "rice": {
-        "name_hi": "धान/चावल",
-        "name_te": "వరి/బియ్యం",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {
-            "Kharif": "June-July",
-            "Rabi": "November-December"
-        },
-        "harvest_months": {
-            "Kharif": "October-November", 
-            "Rabi": "April-May"
-        },
-        "water_requirement_mm": 1200,
-        "optimal_soil": ["Alluvial", "Clay", "Loamy"],
-        "optimal_ph": "5.5-6.5",
-        "seed_rate_kg_ha": 20,
-        "spacing_cm": "20x15",
-        "fertilizer_recommendation": {
-            "N": "120 kg/ha",
-            "P": "60 kg/ha", 
-            "K": "40 kg/ha"
-        },
-        "major_pests": ["Stem borer", "Brown planthopper", "Leaf folder"],
-        "major_diseases": ["Blast", "Bacterial leaf blight", "Sheath blight"],
-        "irrigation_stages": ["Transplanting", "Tillering", "Flowering", "Grain filling"],
-        "top_states": ["West Bengal", "Punjab", "Uttar Pradesh", "Andhra Pradesh", "Tamil Nadu"],
-        "yield_range_kg_ha": {"min": 2500, "max": 6500, "avg": 4000},
-        "tips": [
-            "Maintain 5cm water level during vegetative stage",
-            "Apply nitrogen in 3 splits: basal, tillering, panicle initiation",
-            "Use zinc sulfate @ 25 kg/ha in zinc deficient soils",
-            "Drain field 15 days before harvest"
-        ]
-    },
-    "wheat": {
-        "name_hi": "गेहूं",
-        "name_te": "గోధుమ",
-        "optimal_season": ["Rabi"],
-        "sowing_months": {
-            "Rabi": "October-November"
-        },
-        "harvest_months": {
-            "Rabi": "March-April"
-        },
-        "water_requirement_mm": 450,
-        "optimal_soil": ["Alluvial", "Loamy", "Clay loam"],
-        "optimal_ph": "6.0-7.5",
-        "seed_rate_kg_ha": 100,
-        "spacing_cm": "22.5 row spacing",
-        "fertilizer_recommendation": {
-            "N": "120 kg/ha",
-            "P": "60 kg/ha",
-            "K": "40 kg/ha"
-        },
-        "major_pests": ["Aphids", "Termites", "Pink stem borer"],
-        "major_diseases": ["Rust (Yellow, Brown, Black)", "Karnal bunt", "Powdery mildew"],
-        "irrigation_stages": ["Crown root initiation (21 days)", "Tillering (45 days)", "Late jointing (65 days)", "Flowering (85 days)", "Milk stage (100 days)"],
-        "top_states": ["Uttar Pradesh", "Punjab", "Haryana", "Madhya Pradesh", "Rajasthan"],
-        "yield_range_kg_ha": {"min": 2500, "max": 5500, "avg": 3500},
-        "tips": [
-            "Timely sowing before November 25 for optimal yield",
-            "First irrigation at 21 days is critical for crown root development",
-            "Apply nitrogen in 2-3 splits",
-            "Watch for yellow rust in North India during February"
-        ]
-    },
-    "cotton": {
-        "name_hi": "कपास",
-        "name_te": "పత్తి",
-        "optimal_season": ["Kharif"],
-        "sowing_months": {
-            "Kharif": "April-May (irrigated), June-July (rainfed)"
-        },
-        "harvest_months": {
-            "Kharif": "October-January"
-        },
-        "water_requirement_mm": 700,
-        "optimal_soil": ["Black", "Alluvial"],
-        "optimal_ph": "6.0-8.0",
-        "seed_rate_kg_ha": 2.5,
-        "spacing_cm": "90x60",
-        "fertilizer_recommendation": {
-            "N": "60-80 kg/ha",
-            "P": "30 kg/ha",
-            "K": "30 kg/ha"
-        },
-        "major_pests": ["Bollworm", "Whitefly", "Pink bollworm", "Jassids"],
-        "major_diseases": ["Root rot", "Bacterial blight", "Verticillium wilt"],
-        "irrigation_stages": ["Sowing", "Square formation", "Flowering", "Boll development"],
-        "top_states": ["Gujarat", "Maharashtra", "Telangana", "Andhra Pradesh", "Haryana"],
-        "yield_range_kg_ha": {"min": 1200, "max": 2200, "avg": 1500},
-        "tips": [
-            "Use Bt cotton varieties for bollworm resistance",
-            "Maintain proper plant population (11,000-13,000 plants/ha)",
-            "Install pheromone traps for pink bollworm monitoring",
-            "Apply potash for better fiber quality"
-        ]
-    },
-    "sugarcane": {
-        "name_hi": "गन्ना",
-        "name_te": "చెరకు",
-        "optimal_season": ["Annual"],
-        "sowing_months": {
-            "Annual": "February-March (Spring), October (Autumn)"
-        },
-        "harvest_months": {
-            "Annual": "November-April (10-12 months after planting)"
-        },
-        "water_requirement_mm": 2000,
-        "optimal_soil": ["Alluvial", "Loamy", "Black"],
-        "optimal_ph": "6.5-7.5",
-        "seed_rate_kg_ha": "35,000-40,000 three-budded setts",
-        "spacing_cm": "90-120 between rows",
-        "fertilizer_recommendation": {
-            "N": "250-300 kg/ha",
-            "P": "60-80 kg/ha",
-            "K": "60 kg/ha"
-        },
-        "major_pests": ["Early shoot borer", "Top borer", "Pyrilla", "Woolly aphid"],
-        "major_diseases": ["Red rot", "Smut", "Ratoon stunting", "Grassy shoot"],
-        "irrigation_stages": ["Germination", "Tillering", "Grand growth", "Maturity"],
-        "top_states": ["Uttar Pradesh", "Maharashtra", "Karnataka", "Tamil Nadu", "Gujarat"],
-        "yield_range_kg_ha": {"min": 50000, "max": 100000, "avg": 75000},
-        "tips": [
-            "Use disease-free seed material from registered nurseries",
-            "Earthing up twice at 90 and 120 days after planting",
-            "Stop irrigation 3 weeks before harvest for better sugar recovery",
-            "Ratoon management can give 80% of plant crop yield"
-        ]
-    },
-    "groundnut": {
-        "name_hi": "मूंगफली",
-        "name_te": "వేరుశెనగ",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {
-            "Kharif": "June-July",
-            "Rabi": "October-November"
-        },
-        "harvest_months": {
-            "Kharif": "October-November",
-            "Rabi": "March-April"
-        },
-        "water_requirement_mm": 500,
-        "optimal_soil": ["Sandy loam", "Red", "Loamy"],
-        "optimal_ph": "6.0-6.5",
-        "seed_rate_kg_ha": 100,
-        "spacing_cm": "30x10",
-        "fertilizer_recommendation": {
-            "N": "10-20 kg/ha",
-            "P": "40 kg/ha",
-            "K": "40 kg/ha",
-            "Gypsum": "500 kg/ha at flowering"
-        },
-        "major_pests": ["Leaf miner", "Aphids", "White grub", "Red hairy caterpillar"],
-        "major_diseases": ["Tikka disease", "Collar rot", "Stem rot", "Rust"],
-        "irrigation_stages": ["Flowering", "Pegging", "Pod development"],
-        "top_states": ["Gujarat", "Andhra Pradesh", "Tamil Nadu", "Karnataka", "Rajasthan"],
-        "yield_range_kg_ha": {"min": 1000, "max": 2500, "avg": 1500},
-        "tips": [
-            "Apply gypsum at flowering for better pod filling",
-            "Maintain soil moisture during pegging stage",
-            "Harvest at 75-80% mature pods",
-            "Dry pods to 8-10% moisture before storage"
-        ]
-    },
-    "soybean": {
-        "name_hi": "सोयाबीन",
-        "name_te": "సోయాబీన్",
-        "optimal_season": ["Kharif"],
-        "sowing_months": {
-            "Kharif": "June-July (with monsoon onset)"
-        },
-        "harvest_months": {
-            "Kharif": "October-November"
-        },
-        "water_requirement_mm": 450,
-        "optimal_soil": ["Black", "Alluvial", "Loamy"],
-        "optimal_ph": "6.0-7.5",
-        "seed_rate_kg_ha": 75,
-        "spacing_cm": "45x5",
-        "fertilizer_recommendation": {
-            "N": "20-30 kg/ha (starter)",
-            "P": "60-80 kg/ha",
-            "K": "40 kg/ha"
-        },
-        "major_pests": ["Stem fly", "Girdle beetle", "Leaf eating caterpillar", "Pod borer"],
-        "major_diseases": ["Yellow mosaic virus", "Bacterial pustule", "Charcoal rot", "Rust"],
-        "irrigation_stages": ["Flowering", "Pod formation"],
-        "top_states": ["Madhya Pradesh", "Maharashtra", "Rajasthan", "Karnataka"],
-        "yield_range_kg_ha": {"min": 1500, "max": 2500, "avg": 2000},
-        "tips": [
-            "Treat seeds with Rhizobium culture before sowing",
-            "Ensure good drainage - waterlogging is fatal",
-            "Use certified virus-free seeds",
-            "Harvest when 95% pods turn brown"
-        ]
-    },
-    "maize": {
-        "name_hi": "मक्का",
-        "name_te": "మొక్కజొన్న",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {
-            "Kharif": "June-July",
-            "Rabi": "October-November"
-        },
-        "harvest_months": {
-            "Kharif": "September-October",
-            "Rabi": "February-March"
-        },
-        "water_requirement_mm": 500,
-        "optimal_soil": ["Loamy", "Alluvial", "Black"],
-        "optimal_ph": "5.5-7.5",
-        "seed_rate_kg_ha": 20,
-        "spacing_cm": "60x25",
-        "fertilizer_recommendation": {
-            "N": "120 kg/ha",
-            "P": "60 kg/ha",
-            "K": "40 kg/ha"
-        },
-        "major_pests": ["Fall armyworm", "Stem borer", "Shoot fly"],
-        "major_diseases": ["Turcicum leaf blight", "Maydis leaf blight", "Downy mildew"],
-        "irrigation_stages": ["Knee height", "Tasseling", "Silking", "Grain filling"],
-        "top_states": ["Karnataka", "Andhra Pradesh", "Tamil Nadu", "Bihar", "Maharashtra"],
-        "yield_range_kg_ha": {"min": 2500, "max": 6000, "avg": 4000},
-        "tips": [
-            "Critical water requirement during tasseling and silking",
-            "Use single cross hybrids for higher yield",
-            "Watch for fall armyworm - spray at first sign",
-            "Harvest at 20-25% grain moisture"
-        ]
-    },
-    "bajra": {
-        "name_hi": "बाजरा",
-        "name_te": "సజ్జ",
-        "optimal_season": ["Kharif"],
-        "sowing_months": {
-            "Kharif": "June-July"
-        },
-        "harvest_months": {
-            "Kharif": "September-October"
-        },
-        "water_requirement_mm": 350,
-        "optimal_soil": ["Sandy", "Sandy loam", "Light soils"],
-        "optimal_ph": "6.0-7.0",
-        "seed_rate_kg_ha": 4,
-        "spacing_cm": "45x15",
-        "fertilizer_recommendation": {
-            "N": "40-60 kg/ha",
-            "P": "20 kg/ha",
-            "K": "20 kg/ha"
-        },
-        "major_pests": ["Shoot fly", "Stem borer", "Blister beetle"],
-        "major_diseases": ["Downy mildew", "Ergot", "Smut"],
-        "irrigation_stages": ["Seedling", "Flowering", "Grain filling"],
-        "top_states": ["Rajasthan", "Uttar Pradesh", "Gujarat", "Haryana", "Maharashtra"],
-        "yield_range_kg_ha": {"min": 800, "max": 2000, "avg": 1200},
-        "tips": [
-            "Best suited for arid and semi-arid regions",
-            "Sow with onset of monsoon",
-            "Use hybrid varieties for better yield",
-            "Good for intercropping with pulses"
-        ]
-    },
-    "jowar": {
-        "name_hi": "ज्वार",
-        "name_te": "జొన్న",
-        "optimal_season": ["Kharif", "Rabi"],
-        "sowing_months": {
-            "Kharif": "June-July",
-            "Rabi": "September-October"
-        },
-        "harvest_months": {
-            "Kharif": "October-November",
-            "Rabi": "January-February"
-        },
-        "water_requirement_mm": 400,
-        "optimal_soil": ["Black", "Clay loam", "Medium black"],
-        "optimal_ph": "6.0-8.5",
-        "seed_rate_kg_ha": 10,
-        "spacing_cm": "45x15",
-        "fertilizer_recommendation": {
-            "N": "80 kg/ha",
-            "P": "40 kg/ha",
-            "K": "40 kg/ha"
-        },
-        "major_pests": ["Shoot fly", "Stem borer", "Armyworm"],
-        "major_diseases": ["Grain mold", "Charcoal rot", "Downy mildew"],
-        "irrigation_stages": ["Boot stage", "Flowering", "Grain filling"],
-        "top_states": ["Maharashtra", "Karnataka", "Madhya Pradesh", "Tamil Nadu", "Andhra Pradesh"],
-        "yield_range_kg_ha": {"min": 1000, "max": 3000, "avg": 1500},
-        "tips": [
-            "Rabi jowar gives better grain quality",
-            "Deep black soils retain moisture for rabi season",
-            "Use shoot fly resistant varieties for kharif",
-            "Harvest at physiological maturity for fodder+grain"
-        ]
-    }
-}
+import functools
+import hashlib
+import json
+import logging
+import marshal
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
 
-# State-wise agricultural information
-STATE_AGRI_INFO = {
-    "andhra pradesh": {
-        "name_hi": "आंध्र प्रदेश",
-        "name_te": "ఆంధ్ర ప్రదేశ్",
-        "major_crops": ["Rice", "Cotton", "Groundnut", "Sugarcane", "Maize", "Chillies"],
-        "soil_types": ["Alluvial", "Red", "Black", "Laterite"],
-        "rainfall_mm": {"min": 500, "max": 1200, "avg": 900},
-        "kharif_crops": ["Rice", "Cotton", "Groundnut", "Maize"],
-        "rabi_crops": ["Rice", "Groundnut", "Sunflower"],
-        "agri_helpline": "1800-180-1551",
-        "major_issues": ["Cyclones", "Drought in Rayalaseema", "Pest attacks"],
-        "govt_schemes": ["YSR Rythu Bharosa", "YSR Free Crop Insurance"]
-    },
-    "telangana": {
-        "name_hi": "तेलंगाना",
-        "name_te": "తెలంగాణ",
-        "major_crops": ["Rice", "Cotton", "Maize", "Soybean", "Red gram"],
-        "soil_types": ["Red", "Black", "Alluvial"],
-        "rainfall_mm": {"min": 700, "max": 1100, "avg": 900},
-        "kharif_crops": ["Rice", "Cotton", "Maize", "Soybean"],
-        "rabi_crops": ["Rice", "Groundnut", "Maize"],
-        "agri_helpline": "1800-599-5553",
-        "major_issues": ["Irregular rainfall", "Pink bollworm in cotton"],
-        "govt_schemes": ["Rythu Bandhu", "Rythu Bima"]
-    },
-    "punjab": {
-        "name_hi": "पंजाब",
-        "name_te": "పంజాబ్",
-        "major_crops": ["Wheat", "Rice", "Cotton", "Sugarcane", "Maize"],
-        "soil_types": ["Alluvial"],
-        "rainfall_mm": {"min": 350, "max": 700, "avg": 500},
-        "kharif_crops": ["Rice", "Cotton", "Maize", "Sugarcane"],
-        "rabi_crops": ["Wheat", "Potato", "Vegetables"],
-        "agri_helpline": "1800-180-1551",
-        "major_issues": ["Groundwater depletion", "Stubble burning", "Water logging"],
-        "govt_schemes": ["PM-KISAN", "Mera Pani Meri Virasat"]
-    },
-    "uttar pradesh": {
-        "name_hi": "उत्तर प्रदेश",
-        "name_te": "ఉత్తర ప్రదేశ్",
-        "major_crops": ["Wheat", "Rice", "Sugarcane", "Potato", "Pulses"],
-        "soil_types": ["Alluvial"],
-        "rainfall_mm": {"min": 600, "max": 1200, "avg": 900},
-        "kharif_crops": ["Rice", "Sugarcane", "Maize", "Bajra"],
-        "rabi_crops": ["Wheat", "Potato", "Mustard", "Pulses"],
-        "agri_helpline": "1800-180-1551",
-        "major_issues": ["Floods in eastern UP", "Water scarcity in Bundelkhand"],
-        "govt_schemes": ["PM-KISAN", "Pardarshi Kisan Seva Yojana"]
-    },
-    "maharashtra": {
-        "name_hi": "महाराष्ट्र",
-        "name_te": "మహారాష్ట్ర",
-        "major_crops": ["Cotton", "Sugarcane", "Soybean", "Jowar", "Rice"],
-        "soil_types": ["Black", "Laterite", "Alluvial"],
-        "rainfall_mm": {"min": 500, "max": 2500, "avg": 1000},
-        "kharif_crops": ["Cotton", "Soybean", "Jowar", "Rice"],
-        "rabi_crops": ["Wheat", "Jowar", "Gram"],
-        "agri_helpline": "1800-233-4000",
-        "major_issues": ["Farmer distress", "Erratic monsoon", "Pink bollworm"],
-        "govt_schemes": ["Mahatma Phule Shetkari Yojana", "Jalyukt Shivar"]
-    },
-    "madhya pradesh": {
-        "name_hi": "मध्य प्रदेश",
-        "name_te": "మధ్య ప్రదేశ్",
-        "major_crops": ["Soybean", "Wheat", "Rice", "Cotton", "Pulses"],
-        "soil_types": ["Black", "Alluvial", "Red"],
-        "rainfall_mm": {"min": 750, "max": 1500, "avg": 1100},
-        "kharif_crops": ["Soybean", "Rice", "Cotton", "Maize"],
-        "rabi_crops": ["Wheat", "Gram", "Mustard"],
-        "agri_helpline": "1800-180-1551",
-        "major_issues": ["Irrigation dependency", "Soil degradation"],
-        "govt_schemes": ["Mukhyamantri Kisan Kalyan Yojana", "Bhavantar Bhugtan Yojana"]
-    },
-    "gujarat": {
-        "name_hi": "गुजरात",
-        "name_te": "గుజరాత్",
-        "major_crops": ["Cotton", "Groundnut", "Wheat", "Sugarcane", "Castor"],
-        "soil_types": ["Black", "Alluvial", "Sandy"],
-        "rainfall_mm": {"min": 300, "max": 1000, "avg": 600},
-        "kharif_crops": ["Cotton", "Groundnut", "Castor", "Bajra"],
-        "rabi_crops": ["Wheat", "Cumin", "Tobacco"],
-        "agri_helpline": "1800-180-1551",
-        "major_issues": ["Drought in Saurashtra", "Salinity in coastal areas"],
-        "govt_schemes": ["Kisan Suryoday Yojana", "PM-KISAN"]
-    },
-    "rajasthan": {
-        "name_hi": "राजस्थान",
-        "name_te": "రాజస్థాన్",
-        "major_crops": ["Bajra", "Wheat", "Mustard", "Groundnut", "Cotton"],
-        "soil_types": ["Sandy", "Alluvial", "Arid"],
-        "rainfall_mm": {"min": 150, "max": 600, "avg": 350},
-        "kharif_crops": ["Bajra", "Jowar", "Groundnut", "Cotton"],
-        "rabi_crops": ["Wheat", "Mustard", "Gram", "Cumin"],
-        "agri_helpline": "1800-180-6127",
-        "major_issues": ["Water scarcity", "Desertification", "Locust attacks"],
-        "govt_schemes": ["Mukhyamantri Krishak Sathi Yojana"]
-    },
-    "karnataka": {
-        "name_hi": "कर्नाटक",
-        "name_te": "కర్ణాటక",
-        "major_crops": ["Rice", "Sugarcane", "Maize", "Cotton", "Coffee"],
-        "soil_types": ["Red", "Black", "Laterite", "Alluvial"],
-        "rainfall_mm": {"min": 500, "max": 4000, "avg": 1200},
-        "kharif_crops": ["Rice", "Maize", "Cotton", "Sugarcane"],
-        "rabi_crops": ["Rice", "Groundnut", "Jowar"],
-        "agri_helpline": "1800-425-1552",
-        "major_issues": ["Cauvery water dispute", "Drought in North Karnataka"],
-        "govt_schemes": ["Raitha Siri", "PM-KISAN"]
-    },
-    "tamil nadu": {
-        "name_hi": "तमिलनाडु",
-        "name_te": "తమిళనాడు",
-        "major_crops": ["Rice", "Sugarcane", "Cotton", "Groundnut", "Banana"],
-        "soil_types": ["Alluvial", "Red", "Black", "Laterite"],
-        "rainfall_mm": {"min": 600, "max": 1500, "avg": 950},
-        "kharif_crops": ["Rice", "Cotton", "Maize", "Groundnut"],
-        "rabi_crops": ["Rice", "Groundnut", "Pulses"],
-        "agri_helpline": "1800-425-1661",
-        "major_issues": ["Northeast monsoon dependency", "Cyclones"],
-        "govt_schemes": ["Chief Minister's Comprehensive Insurance", "PM-KISAN"]
-    }
-}
+import numpy as np
+import pandas as pd
 
-# Disease and pest control recommendations (ICAR guidelines)
-PEST_DISEASE_CONTROL = {
-    "yellow_leaves": {
-        "possible_causes": [
-            "Nitrogen deficiency",
-            "Iron deficiency (in alkaline soils)",
-            "Waterlogging",
-            "Root rot",
-            "Viral infection"
-        ],
-        "diagnosis_tips": [
-            "Check if yellowing starts from older leaves (nitrogen deficiency)",
-            "Check if yellowing is between veins (iron/zinc deficiency)",
-            "Check for waterlogging in field",
-            "Examine roots for rot"
-        ],
-        "recommendations": {
-            "nitrogen_deficiency": "Apply urea @ 20-25 kg/ha as foliar spray (2% solution)",
-            "iron_deficiency": "Apply ferrous sulfate @ 0.5% foliar spray",
-            "waterlogging": "Improve drainage, make channels",
-            "general": "Get soil tested, consult local agricultural officer"
-        }
-    },
-    "pest_attack": {
-        "stem_borer": {
-            "symptoms": "Dead hearts in vegetative stage, white ears in reproductive stage",
-            "control": [
-                "Apply Carbofuran 3G @ 25 kg/ha in leaf whorls",
-                "Release Trichogramma japonicum @ 50,000/ha",
-                "Use light traps for moth monitoring"
-            ]
-        },
-        "bollworm": {
-            "symptoms": "Bore holes in bolls, excreta visible",
-            "control": [
-                "Use pheromone traps @ 5/ha",
-                "Spray NPV @ 250 LE/ha",
-                "Apply Spinosad 45 SC @ 0.3 ml/L"
-            ]
-        },
-        "fall_armyworm": {
-            "symptoms": "Leaves eaten, presence of caterpillar in whorls",
-            "control": [
-                "Apply Emamectin benzoate @ 0.4 g/L",
-                "Use sand + lime mixture in whorls",
-                "Release Trichogramma chilonis"
-            ]
-        }
-    },
-    "diseases": {
-        "blast": {
-            "crop": "Rice",
-            "symptoms": "Diamond shaped lesions on leaves, neck rot",
-            "control": [
-                "Use resistant varieties",
-                "Apply Tricyclazole 75 WP @ 0.6 g/L",
-                "Avoid excess nitrogen"
-            ]
-        },
-        "rust": {
-            "crop": "Wheat",
-            "symptoms": "Orange/brown pustules on leaves",
-            "control": [
-                "Use resistant varieties",
-                "Spray Propiconazole 25 EC @ 0.1%",
-                "Early sowing helps escape rust"
-            ]
-        },
-        "red_rot": {
-            "crop": "Sugarcane",
-            "symptoms": "Drying of leaves, red discoloration inside cane",
-            "control": [
-                "Use disease-free seed material",
-                "Hot water treatment of setts (50°C for 2 hours)",
-                "Avoid waterlogging"
-            ]
-        }
-    }
+DATA_DIR = Path(__file__).parent / 'data'
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'agrocarbonnet'
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(obj):
+    """Recursively make loaded data read-only: dicts become mappingproxies, lists tuples
+
+    Keys and short strings are interned so repeated values (seasons, soils,
+    pests) share one object across the whole knowledge base.
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({sys.intern(k): _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    if isinstance(obj, str) and len(obj) < 32:
+        return sys.intern(obj)
+    return obj
+
+
+def thaw(obj):
+    """Deep-copy frozen knowledge-base data back into plain dicts/lists (e.g. for pydantic models)"""
+    if isinstance(obj, MappingProxyType):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+def _load_json_snapshot(path: Path):
+    """Parse a JSON data file into frozen data, reusing a marshal snapshot when one exists
+
+    marshal rebuilds the nested dicts/lists much faster than json parses them.
+    Snapshots are keyed by the file's content hash and the Python version, so
+    an edited data file or a new interpreter simply produces a new snapshot.
+    """
+    raw = path.read_bytes()
+    digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
+    snapshot = CACHE_DIR / f'{path.stem}_{digest}_py{sys.version_info[0]}{sys.version_info[1]}.marshal'
+    try:
+        return _freeze(marshal.loads(snapshot.read_bytes()))
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    data = json.loads(raw)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_bytes(marshal.dumps(data))
+        os.replace(tmp, snapshot)
+    except OSError as e:
+        logger.debug(f"Could not write knowledge snapshot {snapshot}: {e}")
+    return _freeze(data)
+
+
+# Crop-specific knowledge based on Indian agricultural practices.
+# Kept in data/crop_knowledge.json and parsed on first access, so importers
+# that never touch CROP_KNOWLEDGE don't pay for building it.
+@functools.cache
+def _load_crop_knowledge() -> dict:
+    """Load the crop knowledge base from disk (once per process)"""
+    return _load_json_snapshot(DATA_DIR / 'crop_knowledge.json')
+
+
+# Hindi/Telugu crop names live in per-locale tables (data/crop_names_<lang>.json)
+# and are only loaded when a caller asks for that language.
+CROP_NAME_LANGUAGES = ('hi', 'te')
+
+
+@functools.cache
+def _load_crop_names(language: str) -> dict:
+    """Load the crop name table for one language (once per process)"""
+    with open(DATA_DIR / f'crop_names_{language}.json', encoding='utf-8') as f:
+        return _freeze(json.load(f))
+
+
+def localized_name(crop_id: str, language: str) -> Optional[str]:
+    """Get a crop's name in Hindi or Telugu, or None if there is no translation"""
+    if language not in CROP_NAME_LANGUAGES:
+        return None
+    return _load_crop_names(language).get(resolve_crop(crop_id))
+
+
+# Tips and benefit analysis prose lives in data/crop_tips.json; it is only
+# needed for advice/detail views, so the core crop table stays compact.
+@functools.cache
+def _load_crop_tips() -> dict:
+    """Load the crop tips table (once per process)"""
+    return _load_json_snapshot(DATA_DIR / 'crop_tips.json')
+
+
+def get_crop_tips(crop_name: str) -> dict:
+    """Get a crop's tips and benefits_analysis (empty dict for unknown crops)"""
+    return _load_crop_tips().get(resolve_crop(crop_name), {})
+
+
+# Normalised lookup keys: crop ids plus their Hindi/Telugu names, built once
+@functools.cache
+def _crop_aliases() -> dict:
+    """Map lower-cased crop ids and localized names to crop ids (once per process)"""
+    aliases = {}
+    for language in CROP_NAME_LANGUAGES:
+        for crop_id, names in _load_crop_names(language).items():
+            for name in names.split('/'):
+                aliases[name.strip().lower()] = crop_id
+    aliases.update((crop_id, crop_id) for crop_id in _load_crop_knowledge())
+    return aliases
+
+
+def resolve_crop(crop_name: str) -> Optional[str]:
+    """Resolve a crop id or its Hindi/Telugu name to the crop id, None if unknown"""
+    return _crop_aliases().get(crop_name.strip().lower())
+
+
+# State-wise agricultural information, disease and pest control recommendations
+# (ICAR guidelines) and government schemes for farmers, loaded on first access
+@functools.cache
+def _load_state_agri_info() -> dict:
+    """Load the state agricultural information table (once per process)"""
+    return _load_json_snapshot(DATA_DIR / 'state_agri_info.json')
+
+
+@functools.cache
+def _load_pest_disease_control() -> dict:
+    """Load the pest/disease control table (once per process)"""
+    return _load_json_snapshot(DATA_DIR / 'pest_disease_control.json')
+
+
+@functools.cache
+def _load_govt_schemes() -> dict:
+    """Load the government schemes table (once per process)"""
+    return _load_json_snapshot(DATA_DIR / 'govt_schemes.json')
+
+
+_LAZY_TABLES = {
+    'CROP_KNOWLEDGE': _load_crop_knowledge,
+    'STATE_AGRI_INFO': _load_state_agri_info,
+    'PEST_DISEASE_CONTROL': _load_pest_disease_control,
+    'GOVT_SCHEMES': _load_govt_schemes,
 }
 
-# Government schemes for farmers
-GOVT_SCHEMES = {
-    "pm_kisan": {
-        "name": "PM-KISAN",
-        "full_name": "Pradhan Mantri Kisan Samman Nidhi",
-        "benefit": "Rs 6,000 per year in 3 installments",
-        "eligibility": "All land-holding farmer families",
-        "website": "pmkisan.gov.in"
-    },
-    "pmfby": {
-        "name": "PMFBY",
-        "full_name": "Pradhan Mantri Fasal Bima Yojana",
-        "benefit": "Crop insurance against natural calamities",
-        "premium": "2% for Kharif, 1.5% for Rabi, 5% for commercial crops",
-        "website": "pmfby.gov.in"
-    },
-    "kcc": {
-        "name": "Kisan Credit Card",
-        "benefit": "Short-term credit at 4% interest (with subsidy)",
-        "limit": "Up to Rs 3 lakh at subsidized rate",
-        "eligibility": "All farmers including tenant farmers"
-    },
-    "soil_health_card": {
-        "name": "Soil Health Card Scheme",
-        "benefit": "Free soil testing and recommendations",
-        "website": "soilhealth.dac.gov.in"
-    },
-    "enam": {
-        "name": "e-NAM",
-        "full_name": "National Agriculture Market",
-        "benefit": "Online trading platform for better prices",
-        "website": "enam.gov.in"
+
+def __getattr__(name: str):
+    if name in _LAZY_TABLES:
+        return _LAZY_TABLES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Lookup indexes over the state and pest tables, keyed by normalised name;
+# states are also reachable by their Hindi/Telugu names
+@functools.cache
+def _state_index() -> dict:
+    """Map lower-cased state names (English, Hindi, Telugu) to state info (once per process)"""
+    states = _load_state_agri_info()
+    return {
+        **{name.lower(): info for info in states.values() for name in (info['name_hi'], info['name_te'])},
+        **{state.lower(): info for state, info in states.items()},
     }
-}
+
+
+@functools.cache
+def _pest_index() -> dict:
+    """Map lower-cased pest/disease issue keys to control info (once per process)"""
+    return {issue.lower(): info for issue, info in _load_pest_disease_control().items()}
+
+
+_LOOKUP_TABLES = {'state': _state_index, 'pest': _pest_index}
+
+
+@functools.lru_cache(maxsize=512)
+def lookup(kind: str, key: str) -> Optional[Mapping]:
+    """Look up a 'crop', 'state' or 'pest' entry by name (case-insensitive)
+
+    Entries are frozen, so cached results can be shared between callers.
+    """
+    key = key.strip().lower()
+    if kind == 'crop':
+        return _load_crop_knowledge().get(_crop_aliases().get(key))
+    return _LOOKUP_TABLES[kind]().get(key)
+
 
 def get_crop_info(crop_name: str) -> dict:
     """Get detailed crop information"""
-    crop_key = crop_name.lower().strip()
-    return CROP_KNOWLEDGE.get(crop_key, None)
+    return lookup('crop', crop_name)
+
 
 def get_state_info(state_name: str) -> dict:
     """Get state agricultural information"""
-    state_key = state_name.lower().strip()
-    return STATE_AGRI_INFO.get(state_key, None)
+    return lookup('state', state_name)
+
 
 def get_pest_disease_info(issue: str) -> dict:
     """Get pest/disease control information"""
-    return PEST_DISEASE_CONTROL.get(issue, None)
+    return lookup('pest', issue)
+
+
+# Typed per-crop records with numeric fields parsed once
+def _parse_range(text: str) -> tuple:
+    """Parse a "low-high" range string such as "6.0-8.0" into floats"""
+    low, high = text.split('-')
+    return float(low), float(high)
+
+
+NO_SPACING = -1
+_SPACING_RE = re.compile(r'(\d+)x(\d+)')
+
+
+def _parse_spacing(text: str) -> tuple:
+    """Parse a "row x plant" spacing string such as "30x10" into ints"""
+    match = _SPACING_RE.fullmatch(text.strip())
+    if not match:
+        return NO_SPACING, NO_SPACING
+    return int(match.group(1)), int(match.group(2))
+
+
+@dataclass(slots=True, frozen=True)
+class Crop:
+    """Immutable typed record for one crop, with numeric fields pre-parsed"""
+    id: str
+    category: str
+    seasons: Tuple[str, ...]
+    soils: Tuple[str, ...]
+    water_mm: int
+    ph_min: float
+    ph_max: float
+    seed_rate: Optional[float]
+    row_spacing_cm: int
+    plant_spacing_cm: int
+    msp_2024: Optional[int]
+    yield_min: float
+    yield_avg: float
+    yield_max: float
+    top_states: Tuple[str, ...]
+    major_pests: Tuple[str, ...]
+    major_diseases: Tuple[str, ...]
+
+
+@functools.cache
+def _crop_records() -> dict:
+    """Build a Crop record per CROP_KNOWLEDGE entry (once per process)"""
+    records = {}
+    for crop_id, info in _load_crop_knowledge().items():
+        ph_min, ph_max = _parse_range(info['optimal_ph'])
+        row_spacing, plant_spacing = _parse_spacing(info['spacing_cm'])
+        seed_rate = info['seed_rate_kg_ha']
+        yield_range = info['yield_range_kg_ha']
+        records[crop_id] = Crop(
+            id=crop_id,
+            category=info.get('category', ''),
+            seasons=tuple(info['optimal_season']),
+            soils=tuple(info['optimal_soil']),
+            water_mm=info['water_requirement_mm'],
+            ph_min=ph_min,
+            ph_max=ph_max,
+            seed_rate=float(seed_rate) if isinstance(seed_rate, (int, float)) else None,
+            row_spacing_cm=row_spacing,
+            plant_spacing_cm=plant_spacing,
+            msp_2024=info.get('msp_2024'),
+            yield_min=yield_range['min'],
+            yield_avg=yield_range['avg'],
+            yield_max=yield_range['max'],
+            top_states=tuple(info['top_states']),
+            major_pests=tuple(info['major_pests']),
+            major_diseases=tuple(info['major_diseases']),
+        )
+    return records
+
+
+def get_crop(crop_name: str) -> Optional[Crop]:
+    """Get the typed record for a crop"""
+    return _crop_records().get(resolve_crop(crop_name))
+
+
+# Column-wise (structure-of-arrays) view of CROP_KNOWLEDGE for filter queries
+SEASONS = ("Kharif", "Rabi", "Zaid", "Annual")
+CATEGORIES = ("Pulses", "Oilseeds", "Vegetables")
+NO_CATEGORY = 255
+
+
+class CropColumns(NamedTuple):
+    """Parallel arrays over crops, one entry per CROP_KNOWLEDGE key"""
+    names: np.ndarray             # crop ids
+    category_code: np.ndarray     # uint8 index into CATEGORIES, NO_CATEGORY when uncategorised
+    water_mm: np.ndarray          # int32
+    ph_min: np.ndarray            # float32
+    ph_max: np.ndarray            # float32
+    seed_rate: np.ndarray         # float32, NaN when not a plain kg/ha figure
+    row_spacing_cm: np.ndarray    # int16, NO_SPACING when not "<row>x<plant>"
+    plant_spacing_cm: np.ndarray  # int16, NO_SPACING when not "<row>x<plant>"
+    msp_2024: np.ndarray          # int32, 0 when the crop has no MSP
+    season_mask: np.ndarray       # uint8, bit i set for SEASONS[i]
+    soil_mask: np.ndarray         # uint16, bit i set for soils[i]
+    soils: tuple                  # soil names in bit order
+
+
+def season_names(mask: int) -> List[str]:
+    """Decode a season bitmask from CropColumns.season_mask into season names"""
+    return [season for i, season in enumerate(SEASONS) if mask & (1 << i)]
+
+
+def category_name(code: int) -> str:
+    """Decode a CropColumns.category_code entry, '' when uncategorised"""
+    return '' if code == NO_CATEGORY else CATEGORIES[code]
+
+
+@functools.cache
+def crop_columns() -> CropColumns:
+    """Build the columnar crop view (once per process)"""
+    crops = list(_crop_records().values())
+    soils = tuple(dict.fromkeys(s for crop in crops for s in crop.soils))
+    season_bit = {s: 1 << i for i, s in enumerate(SEASONS)}
+    soil_bit = {s: 1 << i for i, s in enumerate(soils)}
+    category_code = {c: i for i, c in enumerate(CATEGORIES)}
+
+    return CropColumns(
+        names=np.array([crop.id for crop in crops], dtype=object),
+        category_code=np.array([category_code.get(crop.category, NO_CATEGORY) for crop in crops],
+                               dtype=np.uint8),
+        water_mm=np.array([crop.water_mm for crop in crops], dtype=np.int32),
+        ph_min=np.array([crop.ph_min for crop in crops], dtype=np.float32),
+        ph_max=np.array([crop.ph_max for crop in crops], dtype=np.float32),
+        seed_rate=np.array([np.nan if crop.seed_rate is None else crop.seed_rate for crop in crops],
+                           dtype=np.float32),
+        row_spacing_cm=np.array([crop.row_spacing_cm for crop in crops], dtype=np.int16),
+        plant_spacing_cm=np.array([crop.plant_spacing_cm for crop in crops], dtype=np.int16),
+        msp_2024=np.array([crop.msp_2024 or 0 for crop in crops], dtype=np.int32),
+        season_mask=np.array([sum(season_bit[s] for s in crop.seasons) for crop in crops], dtype=np.uint8),
+        soil_mask=np.array([sum(soil_bit[s] for s in crop.soils) for crop in crops], dtype=np.uint16),
+        soils=soils,
+    )
+
+
+@functools.cache
+def crops_df() -> pd.DataFrame:
+    """Get the crop table as a DataFrame indexed by crop id (built once; treat as read-only)
+
+    Numeric columns share the CropColumns arrays; category and the season/soil
+    masks make group-bys and filters vectorised, and list-valued fields are
+    kept as tuples for explode()-style analysis.
+    """
+    cols = crop_columns()
+    crops = list(_crop_records().values())
+    return pd.DataFrame(
+        {
+            'category': pd.Categorical.from_codes(
+                np.where(cols.category_code == NO_CATEGORY, -1, cols.category_code.astype(np.int16)),
+                CATEGORIES),
+            'water_mm': cols.water_mm,
+            'ph_min': cols.ph_min,
+            'ph_max': cols.ph_max,
+            'seed_rate': cols.seed_rate,
+            'row_spacing_cm': cols.row_spacing_cm,
+            'plant_spacing_cm': cols.plant_spacing_cm,
+            'msp_2024': cols.msp_2024,
+            'yield_avg': np.array([crop.yield_avg for crop in crops], dtype=np.float32),
+            'season_mask': cols.season_mask,
+            'soil_mask': cols.soil_mask,
+            'top_states': [crop.top_states for crop in crops],
+            'major_pests': [crop.major_pests for crop in crops],
+            'major_diseases': [crop.major_diseases for crop in crops],
+        },
+        index=pd.Index(cols.names, name='id'),
+        copy=False,
+    )
+
+
+# Precomputed suitability scores: crop x soil x season x soil-pH bucket
+PH_BUCKET_MIN = 4.0
+PH_BUCKET_WIDTH = 0.25
+PH_BUCKETS = 21  # 4.0 .. 9.0
+
+
+def _ph_bucket(ph: float) -> int:
+    """Map a soil pH onto its bucket index in the suitability tensor"""
+    return int(np.clip(round((ph - PH_BUCKET_MIN) / PH_BUCKET_WIDTH), 0, PH_BUCKETS - 1))
+
+
+@functools.cache
+def suitability_scores() -> np.ndarray:
+    """Build the float32[crop, soil, season, ph_bucket] suitability tensor (once per process)
+
+    A crop scores 0 outside its seasons; otherwise the score is the product of
+    a soil term (1.0 for a listed soil, 0.5 otherwise) and a pH term that is
+    1.0 inside the optimal range and falls to 0 one pH unit outside it.
+    """
+    cols = crop_columns()
+    season_ok = (cols.season_mask[:, None] >> np.arange(len(SEASONS))) & 1
+    soil_ok = (cols.soil_mask[:, None] >> np.arange(len(cols.soils))) & 1
+
+    ph = PH_BUCKET_MIN + PH_BUCKET_WIDTH * np.arange(PH_BUCKETS, dtype=np.float32)
+    ph_distance = np.maximum(cols.ph_min[:, None] - ph, ph - cols.ph_max[:, None]).clip(min=0)
+    ph_score = (1.0 - ph_distance).clip(min=0)
+
+    soil_score = np.where(soil_ok, 1.0, 0.5)
+    scores = (soil_score[:, :, None, None]
+              * season_ok[:, None, :, None]
+              * ph_score[:, None, None, :])
+    return scores.astype(np.float32)
+
+
+# A crop's water need differing from seasonal rainfall by this much scores 0
+RAINFALL_TOLERANCE_MM = 2000.0
+
+
+def rainfall_factor(rainfall_mm: float) -> np.ndarray:
+    """Per-crop float32 factor in [0, 1] for how well rainfall covers water needs"""
+    water_mm = crop_columns().water_mm
+    gap = np.abs(water_mm - np.float32(rainfall_mm)) / np.float32(RAINFALL_TOLERANCE_MM)
+    return (1.0 - gap).clip(min=0).astype(np.float32)
+
+
+def recommend_crops(soil: str, season: str, ph: Optional[float] = None,
+                    top_k: int = 5, rainfall_mm: Optional[float] = None) -> List[Tuple[str, float]]:
+    """Rank crops for a soil type, season and (optional) soil pH and rainfall, best first"""
+    cols = crop_columns()
+    soils = [s.lower() for s in cols.soils]
+    seasons = [s.lower() for s in SEASONS]
+    soil_key, season_key = soil.lower().strip(), season.lower().strip()
+    if soil_key not in soils or season_key not in seasons:
+        return []
+
+    scores = suitability_scores()[:, soils.index(soil_key), seasons.index(season_key)]
+    scores = scores.max(axis=-1) if ph is None else scores[:, _ph_bucket(ph)]
+    if rainfall_mm is not None:
+        scores = scores * rainfall_factor(rainfall_mm)
+
+    # Stable sort keeps ties in knowledge-base order
+    top = np.argsort(-scores, kind='stable')[:top_k]
+    return [(cols.names[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+# Inverted indexes: lower-cased field value -> ids of crops listing it
+_INDEXED_FIELDS = {
+    'state': 'top_states',
+    'soil': 'optimal_soil',
+    'season': 'optimal_season',
+    'category': 'category',
+    'pest': 'major_pests',
+    'disease': 'major_diseases',
+}
+
+
+@functools.cache
+def _crop_indexes() -> dict:
+    """Build the inverted indexes over CROP_KNOWLEDGE (once per process)"""
+    indexes = {kind: {} for kind in _INDEXED_FIELDS}
+    for crop, info in _load_crop_knowledge().items():
+        for kind, field in _INDEXED_FIELDS.items():
+            values = info.get(field, [])
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                indexes[kind].setdefault(value.lower(), set()).add(crop)
+    # A state's own major crops count too, where they are crops we know about
+    for state, info in _load_state_agri_info().items():
+        for name in info['major_crops']:
+            crop = resolve_crop(name)
+            if crop:
+                indexes['state'].setdefault(state.lower(), set()).add(crop)
+    return {
+        kind: {value: frozenset(crops) for value, crops in index.items()}
+        for kind, index in indexes.items()
+    }
+
+
+def crops_with(kind: str, value: str) -> FrozenSet[str]:
+    """Get crops whose `kind` field (state, soil, season, category, pest, disease) lists value"""
+    return _crop_indexes()[kind].get(value.lower().strip(), frozenset())
+
+
+def crops_by_state(state_name: str) -> FrozenSet[str]:
+    """Get crops for which the state is a top producer or lists as a major crop"""
+    return crops_with('state', state_name)
+
+
+def crops_for(soil: Optional[str] = None, season: Optional[str] = None,
+              state: Optional[str] = None) -> FrozenSet[str]:
+    """Get crops matching every given soil, season and state (all crops if none given)"""
+    crops = frozenset(_load_crop_knowledge())
+    for kind, value in (('soil', soil), ('season', season), ('state', state)):
+        if value:
+            crops &= crops_with(kind, value)
+    return crops
+
+
+@functools.lru_cache(maxsize=1024)
+def filter_crops(season: Optional[str] = None, soil: Optional[str] = None,
+                 ph: Optional[float] = None, state: Optional[str] = None,
+                 category: Optional[str] = None) -> Tuple[str, ...]:
+    """Get crops suited to a season, soil type, soil pH and/or state, optionally of one category"""
+    cols = crop_columns()
+    mask = np.ones(len(cols.names), dtype=bool)
+
+    if season:
+        seasons = [s.lower() for s in SEASONS]
+        season_key = season.lower().strip()
+        if season_key not in seasons:
+            return ()
+        mask &= (cols.season_mask & (1 << seasons.index(season_key))) != 0
+    if soil:
+        soils = [s.lower() for s in cols.soils]
+        soil_key = soil.lower().strip()
+        if soil_key not in soils:
+            return ()
+        mask &= (cols.soil_mask & (1 << soils.index(soil_key))) != 0
+    if ph is not None:
+        mask &= (cols.ph_min <= ph) & (ph <= cols.ph_max)
+    if state:
+        mask &= np.isin(cols.names, list(crops_by_state(state)))
+    if category:
+        categories = [c.lower() for c in CATEGORIES]
+        category_key = category.lower().strip()
+        if category_key not in categories:
+            return ()
+        mask &= cols.category_code == categories.index(category_key)
+
+    return tuple(cols.names[mask])
@@ -1,76 +1,209 @@
+import asyncio
 import httpx
 import logging
-from typing import List, Dict, Any
+import orjson
+import random
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
+# One pooled client per process so keep-alive connections to the LLM API are
+# reused across messages instead of paying a TCP+TLS handshake each time
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return _http_client
+
+async def close_client():
+    """Close the shared HTTP client (call on application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 class UserMessage:
+    __slots__ = ("text",)
+
     def __init__(self, text: str):
         self.text = text
 
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# Rate limits and gateway errors are usually transient, so retry those
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_ATTEMPTS = 4
+MAX_RETRY_AFTER = 30.0
+ERROR_BODY_LIMIT = 500
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before the next attempt: Retry-After if given, else backoff with jitter
+
+    Retry-After may be a number of seconds or an HTTP date; either is capped
+    at MAX_RETRY_AFTER, and an unparseable value falls back to backoff.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+        try:
+            until = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            until = None
+        if until is not None:
+            if until.tzinfo is None:
+                until = until.replace(tzinfo=timezone.utc)
+            seconds = (until - datetime.now(timezone.utc)).total_seconds()
+            return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+    return min(2 ** attempt, 8) + random.random() * 0.25
+
 class LlmChat:
-    def __init__(self, api_key: str, session_id: str, system_message: str):
+    __slots__ = (
+        "api_key", "session_id", "system_message", "max_turns", "temperature",
+        "turns", "model", "_system_turn", "_is_openrouter", "_base_url", "_headers", "_payload_model"
+    )
+
+    def __init__(self, api_key: str, session_id: str, system_message: str, max_turns: int = 12,
+                 temperature: float = 0.7):
         self.api_key = api_key
         self.session_id = session_id
         self.system_message = system_message
-        self.model = "gpt-4o"
-        self.history: List[Dict[str, str]] = [
-            {"role": "system", "content": system_message}
-        ]
+        self.max_turns = max_turns
+        self.temperature = temperature
+        # The system message is pinned; the bounded deque drops the oldest
+        # user/assistant pair once more than max_turns exchanges are held
+        self._system_turn = {"role": "system", "content": system_message}
+        self.turns: "deque[Dict[str, str]]" = deque(maxlen=2 * max_turns)
+
+        # Routing and headers depend only on the key, so work them out once
+        self._is_openrouter = bool(api_key) and api_key.startswith("sk-or-v1")
+        self._base_url = OPENROUTER_URL if self._is_openrouter else OPENAI_URL
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        if self._is_openrouter:
+            self._headers["HTTP-Referer"] = "https://github.com/AgroBot/AgroBot"
+            self._headers["X-Title"] = "AgroBot"
+        self.with_model("openai", "gpt-4o")
 
     def with_model(self, provider: str, model: str):
         self.model = model
+        # OpenRouter requires 'openai/' prefix for GPT models usually, or we should use a default if not set
+        self._payload_model = "openai/gpt-4o" if self._is_openrouter and model == "gpt-4o" else model
         return self
 
-    async def send_message(self, message: UserMessage) -> str:
-        self.history.append({"role": "user", "content": message.text})
-        
+    @property
+    def history(self) -> List[Dict[str, str]]:
+        """The messages sent as context: the system message plus the retained turns"""
+        return [self._system_turn, *self.turns]
+
+    def _add_exchange(self, user_turn: Dict[str, str], content: str):
+        """Record a completed exchange (the deque keeps only the last max_turns exchanges)"""
+        self.turns.append(user_turn)
+        self.turns.append({"role": "assistant", "content": content})
+
+    async def _post(self, body: bytes, stream: bool = False) -> httpx.Response:
+        """POST a request body, retrying transient failures with backoff
+
+        With stream=True the response body is left unread; the caller must close it.
+        """
+        client = _get_client()
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
+            try:
+                request = client.build_request("POST", self._base_url, headers=self._headers, content=body)
+                response = await client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                logger.warning("LLM request failed (%r), retrying", e)
+                await asyncio.sleep(_retry_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+            await response.aclose()
+            logger.warning("LLM API returned %s, retrying", response.status_code)
+            await asyncio.sleep(_retry_delay(attempt, response))
+
+    async def stream_message(self, message: UserMessage) -> AsyncIterator[str]:
+        """Yield the reply as it is generated (server-sent events from the completions API)"""
+        # The user turn only joins the history once some reply has been received
+        user_turn = {"role": "user", "content": message.text}
+
         if not self.api_key or self.api_key == "your_key_here":
             # Mock response if no key provided
             mock_response = "I am a mock AI assistant. Please provide a valid API Key in .env to get real responses."
-            self.history.append({"role": "assistant", "content": mock_response})
-            return mock_response
+            self._add_exchange(user_turn, mock_response)
+            yield mock_response
+            return
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
-            "model": self.model,
-            "messages": self.history,
-            "temperature": 0.7,
-            "max_tokens": 1000
+            "model": self._payload_model,
+            "messages": [self._system_turn, *self.turns, user_turn],
+            "temperature": self.temperature,
+            "max_tokens": 1000,
+            "stream": True
         }
+        body = orjson.dumps(payload)
 
-        if self.api_key.startswith("sk-or-v1"):
-            base_url = "https://openrouter.ai/api/v1/chat/completions"
-            headers["HTTP-Referer"] = "https://github.com/AgroBot/AgroBot" 
-            headers["X-Title"] = "AgroBot"
-            # OpenRouter requires 'openai/' prefix for GPT models usually, or we should use a default if not set
-            if self.model == "gpt-4o":
-                 payload["model"] = "openai/gpt-4o"
-        else:
-            base_url = "https://api.openai.com/v1/chat/completions"
-
+        parts = []
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    base_url,
-                    headers=headers,
-                    json=payload
-                )
-                
+            response = await self._post(body, stream=True)
+            try:
                 if response.status_code != 200:
-                    error_msg = f"API Error ({response.status_code}): {response.text}"
-                    logger.error(error_msg)
-                    return f"I encountered an error connecting to the AI service. Details: {error_msg}"
-
-                data = response.json()
-                content = data['choices'][0]['message']['content']
-                self.history.append({"role": "assistant", "content": content})
-                return content
-                
+                    # Error pages can be large; only decode the start of the body
+                    body = (await response.aread())[:ERROR_BODY_LIMIT].decode("utf-8", errors="replace")
+                    logger.error("API Error (%s): %s", response.status_code, body)
+                    error_msg = f"API Error ({response.status_code}): {body}"
+                    yield f"I encountered an error connecting to the AI service. Details: {error_msg}"
+                    return
+
+                async for line in response.aiter_lines():
+                    # Skip blank separators and ": keep-alive" comments
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        chunk = orjson.loads(data)
+                    except orjson.JSONDecodeError:
+                        logger.warning("Skipping malformed stream event: %.200s", data)
+                        continue
+                    choices = chunk.get('choices')
+                    delta = choices[0].get('delta', {}).get('content') if choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            finally:
+                await response.aclose()
+
         except Exception as e:
-            logger.error(f"Error sending message: {e}")
-            return f"Sorry, I am having trouble connecting to the server. Error: {str(e)}"
+            if not parts:
+                logger.error("Error sending message: %s", e)
+                yield f"Sorry, I am having trouble connecting to the server. Error: {str(e)}"
+                return
+            # The user has already seen part of the reply: end it there and keep
+            # that much in the history rather than appending an error message
+            logger.error("Reply stream interrupted after %d chunks: %s", len(parts), e)
+            self._add_exchange(user_turn, "".join(parts))
+            return
+
+        self._add_exchange(user_turn, "".join(parts))
+
+    async def send_message(self, message: UserMessage) -> str:
+        return "".join([chunk async for chunk in self.stream_message(message)])
@@ -0,0 +1,145 @@
+"""
+Yield Model Artifacts
+Flattened forest arrays and encoder classes derived from the trained model,
+written by train_model.py and loaded by the API server without scikit-learn
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+class ForestArrays(NamedTuple):
+    """A regression forest's trees as padded (n_trees, max_nodes) arrays
+
+    Leaves point back at themselves, so every tree can be walked for a fixed
+    number of steps (the forest's depth) without checking for the end. Node
+    fields use the narrowest types that keep predictions exact: thresholds are
+    float32 (see float32_thresholds), feature and child indexes small ints.
+    nan_left says where a NaN input goes at each split, as sklearn decides it.
+    """
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    value: np.ndarray
+    nan_left: np.ndarray
+    depth: int
+
+def float32_thresholds(threshold: np.ndarray) -> np.ndarray:
+    """Round split thresholds down to float32
+
+    For a float32 input x, x <= t holds exactly when x <= the largest float32
+    not above t, so the rounded thresholds send every input the same way.
+    """
+    rounded = threshold.astype(np.float32)
+    over = rounded > threshold
+    rounded[over] = np.nextafter(rounded[over], np.float32(-np.inf))
+    return rounded
+
+def flatten_forest(model) -> ForestArrays:
+    """Copy a fitted single-output RandomForestRegressor's trees into ForestArrays"""
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    shape = (len(trees), max(tree.node_count for tree in trees))
+    feature = np.zeros(shape, dtype=np.min_scalar_type(model.n_features_in_ - 1))
+    left, right = np.zeros(shape, dtype=np.int32), np.zeros(shape, dtype=np.int32)
+    threshold, value = np.zeros(shape, dtype=np.float32), np.zeros(shape)
+    nan_left = np.zeros(shape, dtype=bool)
+    for i, tree in enumerate(trees):
+        n = tree.node_count
+        leaf = tree.children_left[:n] == -1
+        nodes = np.arange(n)
+        feature[i, :n] = np.where(leaf, 0, tree.feature[:n])
+        threshold[i, :n] = float32_thresholds(tree.threshold[:n])
+        left[i, :n] = np.where(leaf, nodes, tree.children_left[:n])
+        right[i, :n] = np.where(leaf, nodes, tree.children_right[:n])
+        value[i, :n] = tree.value[:n, 0, 0]
+        # Older scikit-learn has no missing-value routing and rejects NaN inputs outright
+        if hasattr(tree, 'missing_go_to_left'):
+            nan_left[i, :n] = tree.missing_go_to_left[:n]
+    return ForestArrays(feature, threshold, left, right, value, nan_left, max(tree.max_depth for tree in trees))
+
+def forest_predict(forest: ForestArrays, X: np.ndarray) -> np.ndarray:
+    """Predict like the forest's own predict(), walking all trees at once with numpy
+
+    Skips sklearn's per-call validation and per-tree thread dispatch, which
+    dominate for the single rows the API predicts. Tree outputs are summed in
+    tree order, as sklearn does, so results match it exactly. Like sklearn,
+    infinite inputs raise ValueError and NaN inputs follow each split's
+    missing-value direction.
+    """
+    nan = None
+    if not np.isfinite(X).all():
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity or a value too large for dtype('float32')")
+        nan = np.isnan(X)
+    trees = np.arange(forest.left.shape[0])
+    rows = np.arange(X.shape[0])[:, None]
+    nodes = np.zeros((X.shape[0], trees.size), dtype=np.int32)
+    for _ in range(forest.depth):
+        feature = forest.feature[trees, nodes]
+        go_left = X[rows, feature] <= forest.threshold[trees, nodes]
+        if nan is not None:
+            go_left |= nan[rows, feature] & forest.nan_left[trees, nodes]
+        nodes = np.where(go_left, forest.left[trees, nodes], forest.right[trees, nodes])
+    return np.cumsum(forest.value[trees, nodes], axis=1)[:, -1] / trees.size
+
+# Name of the file recording which pickle a saved artifact set was derived from
+SOURCE_DIGEST_FILE = 'source_digest.txt'
+
+def file_digest(path: Path) -> str:
+    """Content hash of a file, used to tie derived artifacts to the pickle they came from"""
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+def save_forest(forest: ForestArrays, directory: Path, source_digest: str) -> None:
+    """Write each ForestArrays field to directory as .npy, replacing files atomically
+
+    The source digest is written last, so an interrupted save reads as stale.
+    """
+    directory.mkdir(exist_ok=True)
+    fields = [(f"{name}.npy", array) for name, array in zip(ForestArrays._fields, forest)]
+    for filename, array in fields:
+        tmp_path = directory / f"{filename}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(array))
+        os.replace(tmp_path, directory / filename)
+    tmp_path = directory / f"{SOURCE_DIGEST_FILE}.{os.getpid()}.tmp"
+    tmp_path.write_text(source_digest)
+    os.replace(tmp_path, directory / SOURCE_DIGEST_FILE)
+
+def load_forest(directory: Path, source_digest: str) -> Optional[ForestArrays]:
+    """Memory-map saved ForestArrays read-only, so workers share pages via the page cache
+
+    Returns None when the arrays are missing or were derived from a different pickle.
+    """
+    try:
+        if (directory / SOURCE_DIGEST_FILE).read_text().strip() != source_digest:
+            return None
+        arrays = [np.asarray(np.load(directory / f"{name}.npy", mmap_mode='r')) for name in ForestArrays._fields]
+    except (OSError, ValueError):
+        return None
+    return ForestArrays(*arrays[:-1], int(arrays[-1]))
+
+def save_encoder_classes(encoders: dict, path: Path, source_digest: str) -> None:
+    """Write each LabelEncoder's class names to a JSON file, replacing it atomically"""
+    payload = {
+        "source_digest": source_digest,
+        "classes": {col: [str(c) for c in enc.classes_] for col, enc in encoders.items()}
+    }
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+def load_encoder_classes(path: Path, source_digest: str) -> Optional[Dict[str, List[str]]]:
+    """Class names per encoded column, None if missing or derived from a different pickle"""
+    try:
+        payload = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if payload.get("source_digest") != source_digest:
+        return None
+    return payload["classes"]
@@ -0,0 +1,35 @@
+"""
+Name Scan
+Finds which of a table's names occur in a text, with the same result as checking
+`name in text` for each name in table order, but in one regex pass
+"""
+
+import re
+from typing import Iterable, Optional
+
+
+class NameScan:
+    """Earliest-listed name from a table that occurs anywhere in a text"""
+    __slots__ = ('_pattern', '_rank', '_best_prefix')
+
+    def __init__(self, names: Iterable[str]):
+        names = list(dict.fromkeys(names))
+        self._rank = {name: i for i, name in enumerate(names)}
+        # Zero-width lookahead, so names overlapping an earlier match are still
+        # found; at each position the longest name is tried first
+        self._pattern = re.compile('(?=(' + '|'.join(
+            re.escape(name) for name in sorted(names, key=len, reverse=True)
+        ) + '))')
+        # Shorter names starting at the same position are prefixes of the
+        # longest one, so the best name there is its earliest-listed prefix
+        self._best_prefix = {
+            name: min((other for other in names if name.startswith(other)), key=self._rank.__getitem__)
+            for name in names
+        }
+
+    def first(self, text: str) -> Optional[str]:
+        """The earliest-listed name occurring in text, None if there is none"""
+        found = self._pattern.findall(text)
+        if not found:
+            return None
+        return min((self._best_prefix[name] for name in found), key=self._rank.__getitem__)
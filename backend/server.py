@@ -1,28 +1,43 @@
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File
+from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern
 import os
+import importlib.util
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Mapping, NamedTuple, Tuple
 import uuid
+import hashlib
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
-from backend.emergentintegrations.llm.chat import LlmChat, UserMessage
+from types import MappingProxyType
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from backend.emergentintegrations.llm.chat import LlmChat, UserMessage, close_client as close_llm_client
 import joblib
 import numpy as np
 import pandas as pd
 import base64
 import httpx
+import orjson
+import re
+import threading
 
 # Import knowledge base
 from backend.crop_knowledge import (
     CROP_KNOWLEDGE, STATE_AGRI_INFO, PEST_DISEASE_CONTROL, GOVT_SCHEMES,
-    get_crop_info, get_state_info
+    Crop, get_crop, get_crop_info, get_crop_tips, get_state_info, filter_crops, localized_name,
+    recommend_crops, thaw
 )
 
-from backend.weather_service import get_weather_advisory, weather_service
+from backend.weather_service import get_weather_advisory, get_weather_advisories, weather_service
+from backend.model_artifacts import file_digest, flatten_forest, forest_predict, load_encoder_classes, load_forest
+from backend.name_scan import NameScan
 
 
 ROOT_DIR = Path(__file__).parent
@@ -31,15 +46,23 @@ load_dotenv(ROOT_DIR / '.env')
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL')
 
+# Keep a warm pool of sockets so bursts of chat traffic don't pay for new connections
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 50))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 10))
+
+client = None
 db = None
+message_log = None
 if mongo_url:
-    client = AsyncIOMotorClient(mongo_url)
+    client = AsyncIOMotorClient(mongo_url, maxPoolSize=MONGO_MAX_POOL_SIZE, minPoolSize=MONGO_MIN_POOL_SIZE)
     db = client[os.environ.get('DB_NAME', 'farmer_assistant')]
+    # Chat transcripts are logging, not state: don't wait for the server to acknowledge them
+    message_log = db.messages.with_options(write_concern=WriteConcern(w=0))
 else:
     print("⚠️ MongoDB not configured, running without database")
 
 # Create the main app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],   # later you can restrict this
@@ -74,20 +97,65 @@ logger = logging.getLogger(__name__)
 MODEL_DIR = ROOT_DIR / 'models'
 DATA_DIR = ROOT_DIR / 'data'
 
+def build_crop_state_yields(df: pd.DataFrame) -> Dict[str, Dict[str, tuple]]:
+    """Group historical yields into {crop: {state: (yield sum, record count)}}, keys lower-cased"""
+    grouped = df.groupby([df['Crop'].str.lower(), df['State'].str.lower()], observed=True)['Yield_Kg_Ha'].agg(['sum', 'count'])
+    stats: Dict[str, Dict[str, tuple]] = {}
+    for (crop, state), total, count in zip(grouped.index, grouped['sum'], grouped['count']):
+        stats.setdefault(crop, {})[state] = (float(total), int(count))
+    return stats
+
+def pooled_mean(sums_counts) -> Optional[float]:
+    """Mean over the records behind (sum, count) pairs, None if there are none"""
+    total = count = 0
+    for group_sum, group_count in sums_counts:
+        total += group_sum
+        count += group_count
+    return total / count if count else None
+
+# Flattened forest arrays written by train_model.py, memory-mapped by every worker,
+# plus the encoder classes; all derived from the pickles and rebuilt when they change
+FOREST_DIR = MODEL_DIR / 'forest'
+
+@lru_cache(maxsize=1)
+def get_yield_model():
+    """Unpickle the sklearn model, only needed for batches too large for the forest walk"""
+    return joblib.load(MODEL_DIR / 'yield_model.pkl')
+
 try:
-    yield_model = joblib.load(MODEL_DIR / 'yield_model.pkl')
-    encoders = joblib.load(MODEL_DIR / 'encoders.pkl')
+    yield_forest = load_forest(FOREST_DIR, file_digest(MODEL_DIR / 'yield_model.pkl'))
+    if yield_forest is None:
+        # Nothing is written here; train_model.py produces the arrays next to the pickle
+        logger.warning(f"Forest arrays in {FOREST_DIR} are missing or stale; flattening the model in memory")
+        yield_forest = flatten_forest(get_yield_model())
+    # Unpickling the LabelEncoders imports scikit-learn (most of a second), so
+    # their classes are read from train_model.py's JSON copy when it is current
+    encoder_classes = load_encoder_classes(FOREST_DIR / 'encoder_classes.json', file_digest(MODEL_DIR / 'encoders.pkl'))
+    if encoder_classes is None:
+        logger.warning(f"Encoder classes in {FOREST_DIR} are missing or stale; unpickling the encoders")
+        encoder_classes = {col: enc.classes_.tolist() for col, enc in joblib.load(MODEL_DIR / 'encoders.pkl').items()}
     model_stats = joblib.load(MODEL_DIR / 'model_stats.pkl')
-    crop_data = pd.read_csv(DATA_DIR / 'india_crop_data.csv')
+    # Lower-cased class name -> label per encoder (LabelEncoder labels are class positions)
+    class_maps = {col: {c.lower(): i for i, c in enumerate(classes)} for col, classes in encoder_classes.items()}
+    # Only per-crop, per-state yields are used at runtime; categories and float32 keep the frame small
+    crop_data = pd.read_csv(
+        DATA_DIR / 'india_crop_data.csv',
+        usecols=['State', 'Crop', 'Yield_Kg_Ha'],
+        dtype={'State': 'category', 'Crop': 'category', 'Yield_Kg_Ha': 'float32'}
+    )
+    # Yield averages are looked up per request, so group the data once here
+    crop_state_yields = build_crop_state_yields(crop_data)
     logger.info(f"ML Model loaded successfully. Training R²: {model_stats['train_score']:.4f}")
     ML_MODEL_LOADED = True
 except Exception as e:
     logger.warning(f"Could not load ML model: {e}. Using fallback predictions.")
     ML_MODEL_LOADED = False
-    yield_model = None
-    encoders = None
+    yield_forest = None
+    encoder_classes = {}
+    class_maps = {}
     model_stats = None
     crop_data = None
+    crop_state_yields = {}
 
 # Enhanced System Prompt - Human-like Conversational Assistant
 SYSTEM_PROMPT = """You are Farmer Voice Assistant, an expert multilingual agricultural AI assistant designed specifically for Indian farmers. You communicate like a knowledgeable, caring agricultural officer who genuinely wants to help farmers succeed.
@@ -219,64 +287,150 @@ class Session(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 # Helper Functions
-def detect_language(text: str) -> str:
-    """Detect language from text"""
-    telugu_chars = sum(1 for c in text if '\u0C00' <= c <= '\u0C7F')
-    hindi_chars = sum(1 for c in text if '\u0900' <= c <= '\u097F')
-    
+# Script lookup table indexed by code point >> 7: the Devanagari (0x0900-0x097F)
+# and Telugu (0x0C00-0x0C7F) blocks are each exactly one 128-code-point row
+SCRIPT_OTHER, SCRIPT_DEVANAGARI, SCRIPT_TELUGU = 0, 1, 2
+SCRIPT_TABLE = np.zeros(0x110000 >> 7, dtype=np.uint8)
+SCRIPT_TABLE[0x0900 >> 7] = SCRIPT_DEVANAGARI
+SCRIPT_TABLE[0x0C00 >> 7] = SCRIPT_TELUGU
+# Below this length a plain Python scan beats the numpy set-up cost
+SHORT_TEXT_CHARS = 32
+# Common Hindi words in Roman script, matched as whole words in one pass
+HINDI_ROMAN_RE = re.compile(r'\b(?:kya|hai|mera|meri|kaise|karo|karna|fasal|kheti|pani|baarish)\b')
+
+# A script must make up more than this share of the text to decide the language
+SCRIPT_SHARE_PCT = 15
+
+def script_language(text: str) -> Optional[str]:
+    """Return "te" or "hi" when Telugu/Devanagari makes up enough of the text, else None
+
+    Telugu takes precedence, as it always has. Short texts are scanned once,
+    stopping as soon as the outcome is settled; longer ones are bucketed by
+    script through SCRIPT_TABLE in one vectorised gather. Pure-ASCII text,
+    the common case, can't contain either script and skips the scan.
+    """
+    if text.isascii():
+        return None
+
     total = len(text)
-    if total == 0:
-        return "en"
-    
-    if telugu_chars / total > 0.15:
+    if total < SHORT_TEXT_CHARS:
+        telugu_chars = hindi_chars = 0
+        for i, c in enumerate(text):
+            if '\u0C00' <= c <= '\u0C7F':
+                telugu_chars += 1
+                if telugu_chars * 100 > SCRIPT_SHARE_PCT * total:
+                    return "te"
+            elif '\u0900' <= c <= '\u097F':
+                hindi_chars += 1
+                # Hindi is settled once the rest of the text can't tip it to Telugu
+                if (hindi_chars * 100 > SCRIPT_SHARE_PCT * total
+                        and (telugu_chars + total - i - 1) * 100 <= SCRIPT_SHARE_PCT * total):
+                    return "hi"
+        return "hi" if hindi_chars * 100 > SCRIPT_SHARE_PCT * total else None
+
+    codes = np.frombuffer(text.encode('utf-32-le', errors='surrogatepass'), dtype=np.uint32)
+    counts = np.bincount(SCRIPT_TABLE[codes >> 7], minlength=3)
+    if counts[SCRIPT_TELUGU] * 100 > SCRIPT_SHARE_PCT * total:
         return "te"
-    elif hindi_chars / total > 0.15:
+    if counts[SCRIPT_DEVANAGARI] * 100 > SCRIPT_SHARE_PCT * total:
         return "hi"
+    return None
+
+# Short texts (greetings, common questions) recur often enough to be worth caching;
+# longer ones are rarely repeated and would only bloat the cache
+DETECT_CACHE_CHARS = 256
+
+def detect_language(text: str) -> str:
+    """Detect language from text"""
+    if len(text) <= DETECT_CACHE_CHARS:
+        return _detect_language_cached(text)
+    return _detect_language(text)
+
+@lru_cache(maxsize=2048)
+def _detect_language_cached(text: str) -> str:
+    return _detect_language(text)
+
+def _detect_language(text: str) -> str:
+    if not text:
+        return "en"
+
+    language = script_language(text)
+    if language:
+        return language
     
     # Check for common Hindi words in Roman script
-    hindi_words = ['kya', 'hai', 'mera', 'meri', 'kaise', 'karo', 'karna', 'fasal', 'kheti', 'pani', 'baarish']
-    text_lower = text.lower()
-    for word in hindi_words:
-        if word in text_lower:
-            return "hi"
+    if HINDI_ROMAN_RE.search(text.lower()):
+        return "hi"
     
     return "en"
 
+# District to state mapping
+DISTRICT_STATE_MAP: Mapping[str, str] = MappingProxyType({
+    'guntur': 'andhra pradesh', 'krishna': 'andhra pradesh', 'nellore': 'andhra pradesh',
+    'karimnagar': 'telangana', 'warangal': 'telangana', 'nizamabad': 'telangana',
+    'ludhiana': 'punjab', 'amritsar': 'punjab', 'jalandhar': 'punjab',
+    'meerut': 'uttar pradesh', 'lucknow': 'uttar pradesh', 'agra': 'uttar pradesh',
+    'nagpur': 'maharashtra', 'pune': 'maharashtra', 'nashik': 'maharashtra',
+    'indore': 'madhya pradesh', 'bhopal': 'madhya pradesh', 'ujjain': 'madhya pradesh',
+    'ahmedabad': 'gujarat', 'rajkot': 'gujarat', 'surat': 'gujarat',
+    'jaipur': 'rajasthan', 'jodhpur': 'rajasthan', 'bikaner': 'rajasthan',
+    'bengaluru': 'karnataka', 'mysore': 'karnataka', 'belgaum': 'karnataka',
+    'chennai': 'tamil nadu', 'coimbatore': 'tamil nadu', 'madurai': 'tamil nadu',
+    'kolkata': 'west bengal', 'patna': 'bihar', 'ranchi': 'jharkhand'
+})
+
+# A district anywhere in the location beats a state name, and within each table
+# the earlier entry wins, exactly as when the tables were scanned in order
+_DISTRICT_SCAN = NameScan(DISTRICT_STATE_MAP)
+_STATE_SCAN = NameScan(STATE_AGRI_INFO)
+
 def get_state_from_location(location: str) -> str:
     """Extract state name from location"""
     location_lower = location.lower()
-    
-    # District to state mapping
-    district_state_map = {
-        'guntur': 'andhra pradesh', 'krishna': 'andhra pradesh', 'nellore': 'andhra pradesh',
-        'karimnagar': 'telangana', 'warangal': 'telangana', 'nizamabad': 'telangana',
-        'ludhiana': 'punjab', 'amritsar': 'punjab', 'jalandhar': 'punjab',
-        'meerut': 'uttar pradesh', 'lucknow': 'uttar pradesh', 'agra': 'uttar pradesh',
-        'nagpur': 'maharashtra', 'pune': 'maharashtra', 'nashik': 'maharashtra',
-        'indore': 'madhya pradesh', 'bhopal': 'madhya pradesh', 'ujjain': 'madhya pradesh',
-        'ahmedabad': 'gujarat', 'rajkot': 'gujarat', 'surat': 'gujarat',
-        'jaipur': 'rajasthan', 'jodhpur': 'rajasthan', 'bikaner': 'rajasthan',
-        'bengaluru': 'karnataka', 'mysore': 'karnataka', 'belgaum': 'karnataka',
-        'chennai': 'tamil nadu', 'coimbatore': 'tamil nadu', 'madurai': 'tamil nadu',
-        'kolkata': 'west bengal', 'patna': 'bihar', 'ranchi': 'jharkhand'
-    }
-    
-    for district, state in district_state_map.items():
-        if district in location_lower:
-            return state
-    
-    # Check if it's already a state name
-    states = list(STATE_AGRI_INFO.keys())
-    for state in states:
-        if state in location_lower:
-            return state
-    
-    return location_lower
-
-def predict_yield_ml(farm_input: FarmInput) -> MLPrediction:
-    """Predict crop yield using trained Random Forest model"""
-    
+    district = _DISTRICT_SCAN.first(location_lower)
+    if district:
+        return DISTRICT_STATE_MAP[district]
+    return _STATE_SCAN.first(location_lower) or location_lower
+
+# Feature order expected by the yield model (see train_model.py)
+N_FEATURES = 9
+_feature_buffers = threading.local()
+
+def feature_row() -> np.ndarray:
+    """Get this thread's reusable (1, N_FEATURES) float32 model input buffer
+
+    The forest's trees compare float32 thresholds, so float32 input is used
+    as-is by predict() instead of being converted on every call.
+    """
+    row = getattr(_feature_buffers, 'row', None)
+    if row is None:
+        row = _feature_buffers.row = np.empty((1, N_FEATURES), dtype=np.float32)
+    return row
+
+def adjust_yield(base_yield: float, irrigation: float, rainfall: float, fertilizer: float,
+                 yield_min: float, yield_max: float) -> float:
+    """Knowledge-based yield estimate: scale the average yield by input factors, clamped to the crop's range"""
+    irrigation_factor = 1.0 + (irrigation - 50) / 100 * 0.3
+    rainfall_factor = 1.0 if 600 < rainfall < 1200 else 0.85
+    fertilizer_factor = 1.0 + (fertilizer - 100) / 200 * 0.2
+
+    predicted_yield = base_yield * irrigation_factor * rainfall_factor * fertilizer_factor
+    return max(yield_min, min(yield_max, predicted_yield))
+
+class YieldInputs(NamedTuple):
+    """Knowledge-base context and effective input values for one prediction"""
+    crop_info: Optional[Mapping]
+    crop: Optional[Crop]
+    state_name: str
+    rainfall: float
+    irrigation: float
+    fertilizer: float
+    temperature: float
+
+def resolve_yield_inputs(farm_input: FarmInput) -> YieldInputs:
+    """Look up the crop/state context and fill missing inputs with knowledge-base defaults"""
     crop_info = get_crop_info(farm_input.crop_type)
+    crop = get_crop(farm_input.crop_type)
     state_name = get_state_from_location(farm_input.location)
     state_info = get_state_info(state_name)
     
@@ -289,108 +443,145 @@ def predict_yield_ml(farm_input: FarmInput) -> MLPrediction:
     if state_info:
         default_rainfall = state_info['rainfall_mm']['avg']
     
-    if crop_info:
-        yield_range = crop_info.get('yield_range_kg_ha', {'avg': 3000})
-        default_yield = yield_range['avg']
-    else:
-        default_yield = 3000
+    return YieldInputs(
+        crop_info=crop_info,
+        crop=crop,
+        state_name=state_name,
+        rainfall=farm_input.rainfall_mm or default_rainfall,
+        irrigation=farm_input.irrigation_percent or default_irrigation,
+        fertilizer=farm_input.fertilizer_kg_ha or default_fertilizer,
+        temperature=farm_input.temperature_c or default_temp
+    )
+
+class FeatureKey(NamedTuple):
+    """Hashable model inputs: normalised category names and effective numeric values"""
+    crop: str
+    soil: str
+    season: str
+    rainfall: float
+    irrigation: float
+    fertilizer: float
+    temperature: float
+
+def feature_key(farm_input: FarmInput, inputs: YieldInputs) -> FeatureKey:
+    """Everything the model sees for one input, as a cache key"""
+    return FeatureKey(
+        farm_input.crop_type.lower().strip(), farm_input.soil_type.lower().strip(),
+        farm_input.season.lower().strip(),
+        inputs.rainfall, inputs.irrigation, inputs.fertilizer, inputs.temperature
+    )
+
+def encode_features(key: FeatureKey, out: np.ndarray):
+    """Write the model's feature vector for one input into out (a row of N_FEATURES)"""
+    crop_encoded = class_maps['Crop'].get(key.crop, 0)
+    soil_encoded = class_maps['Soil_Type'].get(key.soil, 0)
+    season_encoded = class_maps['Season'].get(key.season, 0)
     
-    rainfall = farm_input.rainfall_mm or default_rainfall
-    irrigation = farm_input.irrigation_percent or default_irrigation
-    fertilizer = farm_input.fertilizer_kg_ha or default_fertilizer
-    temperature = farm_input.temperature_c or default_temp
+    # Find matching state/district in training data
+    state_encoded = 0
+    district_encoded = 0
     
-    predicted_yield = default_yield
+    out[:] = (
+        state_encoded, district_encoded, crop_encoded,
+        season_encoded, soil_encoded,
+        key.rainfall, key.irrigation, key.fertilizer, key.temperature
+    )
+
+@lru_cache(maxsize=4096)
+def _predict_core(key: FeatureKey) -> Tuple[float, float]:
+    """Model yield and confidence for one input; memoised as chat turns resend the same farm"""
+    # Fill the feature row in place
+    features = feature_row()
+    encode_features(key, features[0])
+    return float(forest_predict(yield_forest, features)[0]), min(0.92, model_stats['test_score'])
+
+def fallback_yield(inputs: YieldInputs) -> float:
+    """Knowledge-based yield estimate used when the model is unavailable"""
+    crop = inputs.crop
+    if not crop:
+        return 3000
+    return adjust_yield(crop.yield_avg, inputs.irrigation, inputs.rainfall, inputs.fertilizer,
+                        crop.yield_min, crop.yield_max)
+
+def predict_yield_ml(farm_input: FarmInput) -> MLPrediction:
+    """Predict crop yield using trained Random Forest model"""
+    inputs = resolve_yield_inputs(farm_input)
+    
+    predicted_yield = inputs.crop.yield_avg if inputs.crop else 3000
     confidence = 0.75
     
-    if ML_MODEL_LOADED and yield_model is not None:
+    if ML_MODEL_LOADED and yield_forest is not None:
         try:
-            # Prepare features for model
-            crop_key = farm_input.crop_type.lower().strip()
-            if crop_key in encoders['Crop'].classes_:
-                crop_encoded = encoders['Crop'].transform([crop_key.title()])[0]
-            else:
-                crop_encoded = 0
-            
-            soil_key = farm_input.soil_type.lower().strip()
-            if soil_key in [s.lower() for s in encoders['Soil_Type'].classes_]:
-                soil_encoded = encoders['Soil_Type'].transform([soil_key.title()])[0]
-            else:
-                soil_encoded = 0
+            predicted_yield, confidence = _predict_core(feature_key(farm_input, inputs))
+        except Exception as e:
+            logger.warning(f"ML prediction error: {e}. Using knowledge-based estimate.")
+            # Fall back to knowledge-based calculation
+            predicted_yield = fallback_yield(inputs)
+    
+    return build_prediction(farm_input, inputs, predicted_yield, confidence)
+
+# Up to about this many rows the numpy forest walk beats sklearn's threaded predict()
+FOREST_BATCH_ROWS = 256
+
+def predict_yield_batch(farm_inputs: List[FarmInput]) -> List[MLPrediction]:
+    """Predict yields for many inputs with a single model call"""
+    inputs = [resolve_yield_inputs(farm_input) for farm_input in farm_inputs]
+    predicted_yields = [i.crop.yield_avg if i.crop else 3000 for i in inputs]
+    confidence = 0.75
+    
+    if ML_MODEL_LOADED and yield_forest is not None and farm_inputs:
+        try:
+            features = np.empty((len(farm_inputs), N_FEATURES), dtype=np.float32)
+            for row, farm_input, row_inputs in zip(features, farm_inputs, inputs):
+                encode_features(feature_key(farm_input, row_inputs), row)
             
-            season_key = farm_input.season.lower().strip()
-            if season_key in [s.lower() for s in encoders['Season'].classes_]:
-                season_encoded = encoders['Season'].transform([season_key.title()])[0]
+            if len(features) <= FOREST_BATCH_ROWS:
+                predicted_yields = forest_predict(yield_forest, features).tolist()
             else:
-                season_encoded = 0
-            
-            # Find matching state/district in training data
-            state_encoded = 0
-            district_encoded = 0
-            
-            # Create feature array
-            features = np.array([[
-                state_encoded, district_encoded, crop_encoded,
-                season_encoded, soil_encoded,
-                rainfall, irrigation, fertilizer, temperature
-            ]])
-            
-            predicted_yield = yield_model.predict(features)[0]
+                predicted_yields = get_yield_model().predict(features).tolist()
             confidence = min(0.92, model_stats['test_score'])
             
         except Exception as e:
-            logger.warning(f"ML prediction error: {e}. Using knowledge-based estimate.")
-            # Fall back to knowledge-based calculation
-            if crop_info:
-                yield_range = crop_info['yield_range_kg_ha']
-                base_yield = yield_range['avg']
-                
-                # Adjust based on factors
-                irrigation_factor = 1.0 + (irrigation - 50) / 100 * 0.3
-                rainfall_factor = 1.0 if 600 < rainfall < 1200 else 0.85
-                fertilizer_factor = 1.0 + (fertilizer - 100) / 200 * 0.2
-                
-                predicted_yield = base_yield * irrigation_factor * rainfall_factor * fertilizer_factor
-                predicted_yield = max(yield_range['min'], min(yield_range['max'], predicted_yield))
+            logger.warning(f"ML batch prediction error: {e}. Using knowledge-based estimates.")
+            predicted_yields = [fallback_yield(i) for i in inputs]
+    
+    return [
+        build_prediction(farm_input, row_inputs, predicted_yield, confidence)
+        for farm_input, row_inputs, predicted_yield in zip(farm_inputs, inputs, predicted_yields)
+    ]
+
+# Risk level by risk score: low irrigation (2), too little (2) or too much (1) rain, low fertilizer (1)
+RISK_LEVELS = ("Low", "Medium", "Medium", "High", "High", "High")
+
+def assess_risk(irrigation: float, rainfall: float, fertilizer: float) -> str:
+    """Score the input risks and map the score to a risk level"""
+    risk_score = (
+        2 * (irrigation < 40)
+        + (2 if rainfall < 500 else rainfall > 1500)
+        + (fertilizer < 80)
+    )
+    return RISK_LEVELS[risk_score]
+
+def build_prediction(farm_input: FarmInput, inputs: YieldInputs, predicted_yield: float,
+                     confidence: float) -> MLPrediction:
+    """Assemble risk, averages, factors and recommendations around a predicted yield"""
+    crop_info, crop, state_name = inputs.crop_info, inputs.crop, inputs.state_name
+    rainfall, irrigation, fertilizer = inputs.rainfall, inputs.irrigation, inputs.fertilizer
     
     # Convert to quintal/acre
     predicted_yield_quintal_acre = predicted_yield * 0.0404686 / 10  # kg/ha to quintal/acre
     
-    # Calculate risk level
-    risk_score = 0
-    risk_factors = []
-    
-    if irrigation < 40:
-        risk_score += 2
-        risk_factors.append("Low irrigation coverage")
-    if rainfall < 500:
-        risk_score += 2
-        risk_factors.append("Insufficient rainfall")
-    elif rainfall > 1500:
-        risk_score += 1
-        risk_factors.append("Excess rainfall - flood risk")
-    if fertilizer < 80:
-        risk_score += 1
-        risk_factors.append("Low fertilizer application")
-    
-    if risk_score >= 3:
-        risk_level = "High"
-    elif risk_score >= 1:
-        risk_level = "Medium"
-    else:
-        risk_level = "Low"
+    risk_level = assess_risk(irrigation, rainfall, fertilizer)
     
     # Get state and national averages from data
     state_avg = None
     national_avg = None
     
-    if crop_data is not None:
-        crop_match = crop_data[crop_data['Crop'].str.lower() == farm_input.crop_type.lower()]
-        if not crop_match.empty:
-            national_avg = crop_match['Yield_Kg_Ha'].mean()
-            state_match = crop_match[crop_match['State'].str.lower().str.contains(state_name[:5])]
-            if not state_match.empty:
-                state_avg = state_match['Yield_Kg_Ha'].mean()
+    state_yields = crop_state_yields.get(farm_input.crop_type.lower())
+    if state_yields:
+        national_avg = pooled_mean(state_yields.values())
+        state_key = state_name[:5]
+        state_avg = pooled_mean(v for state, v in state_yields.items() if state_key in state)
     
     # Generate influential factors
     factors = []
@@ -407,9 +598,8 @@ def predict_yield_ml(farm_input: FarmInput) -> MLPrediction:
     else:
         factors.append({"factor": "Rainfall", "impact": "Risk", "detail": f"{rainfall}mm - {'below' if rainfall < 600 else 'above'} optimal"})
     
-    if crop_info:
-        optimal_soils = crop_info.get('optimal_soil', [])
-        if farm_input.soil_type.title() in optimal_soils:
+    if crop:
+        if farm_input.soil_type.title() in crop.soils:
             factors.append({"factor": "Soil Type", "impact": "Positive", "detail": f"{farm_input.soil_type} is ideal for {farm_input.crop_type}"})
         else:
             factors.append({"factor": "Soil Type", "impact": "Moderate", "detail": f"{farm_input.soil_type} - consider soil amendments"})
@@ -424,8 +614,9 @@ def predict_yield_ml(farm_input: FarmInput) -> MLPrediction:
         fert_rec = crop_info.get('fertilizer_recommendation', {})
         recommendations.append(f"Recommended fertilizer: N-{fert_rec.get('N', '120 kg/ha')}, P-{fert_rec.get('P', '60 kg/ha')}, K-{fert_rec.get('K', '40 kg/ha')}")
         
-        if crop_info.get('tips'):
-            recommendations.extend(crop_info['tips'][:2])
+        tips = get_crop_tips(farm_input.crop_type).get('tips')
+        if tips:
+            recommendations.extend(tips[:2])
     
     if irrigation < 50:
         recommendations.append("Consider installing drip irrigation or micro-sprinklers to improve water efficiency")
@@ -454,42 +645,147 @@ def predict_yield_ml(farm_input: FarmInput) -> MLPrediction:
         national_avg_yield=round(national_avg, 2) if national_avg else None,
         influential_factors=factors[:5],
         recommendations=recommendations[:5],
-        crop_info=crop_info,
+        crop_info=thaw(crop_info),
         comparison=comparison,
         data_source="Government of India Agricultural Statistics (Ministry of Agriculture & Farmers Welfare, 2023)"
     )
 
-# Store for active chat sessions
-chat_sessions: Dict[str, LlmChat] = {}
+# Shared client for the Whisper/vision calls so connections are kept alive between requests
+http_client: Optional[httpx.AsyncClient] = None
+
+# HTTP/2 lets concurrent calls share one connection; httpx needs the optional h2 package for it
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use"""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=100)
+        )
+    return http_client
+
+# Bursts of voice/image requests wait here instead of all hitting OpenAI at once and
+# burning the rate limit on 429s; the slots are released as soon as each response arrives
+OPENAI_MEDIA_CONCURRENCY = int(os.environ.get('OPENAI_MEDIA_CONCURRENCY', 8))
+openai_media_slots: Optional[asyncio.Semaphore] = None
+_openai_media_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_openai_media_slots() -> asyncio.Semaphore:
+    """Get the semaphore for the running event loop, creating it on first use
+
+    Made lazily rather than at import so it always belongs to the loop that
+    waits on it, even when tests run several event loops one after another.
+    """
+    global openai_media_slots, _openai_media_loop
+    loop = asyncio.get_running_loop()
+    if openai_media_slots is None or _openai_media_loop is not loop:
+        openai_media_slots = asyncio.Semaphore(OPENAI_MEDIA_CONCURRENCY)
+        _openai_media_loop = loop
+    return openai_media_slots
+
+async def post_openai(path: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
+    """POST to the OpenAI API on the shared client, at most OPENAI_MEDIA_CONCURRENCY at a time"""
+    async with get_openai_media_slots():
+        return await get_http_client().post(
+            f"https://api.openai.com/v1/{path}",
+            headers={"Authorization": f"Bearer {EMERGENT_LLM_KEY}", **(headers or {})},
+            **kwargs
+        )
+
+# Uploaded audio is forwarded to Whisper in chunks of this size
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+def multipart_upload(upload: UploadFile, filename: str, content_type: str,
+                     fields: Dict[str, str]) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    """Headers and streamed body for a multipart/form-data POST of fields plus one uploaded file
+
+    The file is read through UploadFile.read(), which runs disk reads in the
+    threadpool once the spooled upload has rolled over to a temp file, so a
+    large recording is neither held in memory nor read on the event loop.
+    """
+    boundary = uuid.uuid4().hex
+    head = ''.join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+        for name, value in fields.items()
+    )
+    head += (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+             f'Content-Type: {content_type}\r\n\r\n')
+    head = head.encode()
+    tail = f'\r\n--{boundary}--\r\n'.encode()
+
+    async def body():
+        yield head
+        await upload.seek(0)
+        while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+            yield chunk
+        yield tail
+
+    headers = {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+    if upload.size is not None:
+        # A known length avoids a chunked upload
+        headers['Content-Length'] = str(len(head) + upload.size + len(tail))
+    return headers, body()
+
+# Stands in for the image's base64 in the encoded vision request until the bytes are spliced in
+IMAGE_DATA_SLOT = uuid.uuid4().hex
+
+# Store for active chat sessions, least recently used first; the oldest
+# session is dropped once more than CHAT_CACHE_SIZE are held
+CHAT_CACHE_SIZE = int(os.environ.get('CHAT_CACHE_SIZE', 1024))
+chat_sessions: "OrderedDict[str, LlmChat]" = OrderedDict()
 
 async def get_or_create_chat(session_id: str) -> LlmChat:
     """Get existing chat or create new one"""
-    if session_id not in chat_sessions:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=session_id,
-            system_message=SYSTEM_PROMPT
-        ).with_model("openai", "gpt-4o")
-        chat_sessions[session_id] = chat
-    return chat_sessions[session_id]
-
-def build_context_message(message: str, farm_context: Optional[Dict], language: str) -> str:
-    """Build enriched context message with knowledge base data"""
+    chat = chat_sessions.get(session_id)
+    if chat is not None:
+        chat_sessions.move_to_end(session_id)
+        return chat
+
+    chat = LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=session_id,
+        system_message=SYSTEM_PROMPT
+    ).with_model("openai", "gpt-4o")
+    chat_sessions[session_id] = chat
+    if len(chat_sessions) > CHAT_CACHE_SIZE:
+        chat_sessions.popitem(last=False)
+    return chat
+
+def prompt_list(values, sep: str = ', ') -> str:
+    """Render knowledge-base list values for the LLM prompt, whatever the container type"""
+    return sep.join(str(value) for value in values) or 'n/a'
+
+def prompt_range(value_range: Optional[Mapping[str, Any]], unit: str) -> str:
+    """Render a {"min", "avg", "max"} knowledge-base range for the LLM prompt"""
+    if not value_range:
+        return 'n/a'
+    return f"{value_range['min']}-{value_range['max']} {unit} (avg {value_range['avg']})"
+
+def build_context(message: str, farm_context: Optional[Dict], language: str) -> Tuple[str, Optional[MLPrediction]]:
+    """Build enriched context message with knowledge base data
+
+    Returns (message, prediction); the ML prediction made for the context is
+    returned too so callers don't have to run the model again.
+    """
     context_parts = []
+    prediction = None
     
     # Add farm context
     if farm_context:
-        context_parts.append(f"Farm Details: {farm_context}")
+        context_parts.append(f"Farm Details: {orjson.dumps(farm_context).decode()}")
         
         # Add crop-specific knowledge
         crop_type = farm_context.get('crop_type', '')
         if crop_type:
             crop_info = get_crop_info(crop_type)
             if crop_info:
-                context_parts.append(f"Crop Knowledge ({crop_type}): Optimal soil: {crop_info.get('optimal_soil')}, "
-                                   f"Yield range: {crop_info.get('yield_range_kg_ha')}, "
-                                   f"Major pests: {crop_info.get('major_pests', [])[:3]}, "
-                                   f"Key tips: {crop_info.get('tips', [])[:2]}")
+                context_parts.append(f"Crop Knowledge ({crop_type}): Optimal soil: {prompt_list(crop_info.get('optimal_soil', ()))}, "
+                                   f"Yield range: {prompt_range(crop_info.get('yield_range_kg_ha'), 'kg/ha')}, "
+                                   f"Major pests: {prompt_list(crop_info.get('major_pests', ())[:3])}, "
+                                   f"Key tips: {prompt_list(get_crop_tips(crop_type).get('tips', ())[:2], '; ')}")
         
         # Add state-specific knowledge
         location = farm_context.get('location', '')
@@ -497,8 +793,8 @@ def build_context_message(message: str, farm_context: Optional[Dict], language:
             state_name = get_state_from_location(location)
             state_info = get_state_info(state_name)
             if state_info:
-                context_parts.append(f"Region Info ({state_name}): Major crops: {state_info.get('major_crops')[:5]}, "
-                                   f"Typical rainfall: {state_info.get('rainfall_mm')}, "
+                context_parts.append(f"Region Info ({state_name}): Major crops: {prompt_list(state_info.get('major_crops', ())[:5])}, "
+                                   f"Typical rainfall: {prompt_range(state_info.get('rainfall_mm'), 'mm')}, "
                                    f"Agri helpline: {state_info.get('agri_helpline')}")
         
         # Generate ML prediction if enough data
@@ -519,38 +815,105 @@ def build_context_message(message: str, farm_context: Optional[Dict], language:
                                    f"({prediction.predicted_yield_quintal_acre} quintal/acre), "
                                    f"Confidence: {prediction.confidence_score*100:.0f}%, "
                                    f"Risk: {prediction.risk_level}, "
-                                   f"Factors: {[f['factor'] + ':' + f['impact'] for f in prediction.influential_factors[:3]]}")
+                                   f"Factors: {prompt_list(f['factor'] + ':' + f['impact'] for f in prediction.influential_factors[:3])}")
             except Exception as e:
                 logger.warning(f"Could not generate ML prediction: {e}")
     
     # Build final message
     if context_parts:
-        return f"[CONTEXT FOR ASSISTANT - Use this to provide accurate advice]\n{chr(10).join(context_parts)}\n\n[FARMER'S QUESTION in {language}]: {message}"
+        return f"[CONTEXT FOR ASSISTANT - Use this to provide accurate advice]\n{chr(10).join(context_parts)}\n\n[FARMER'S QUESTION in {language}]: {message}", prediction
     else:
-        return f"[FARMER'S QUESTION in {language}]: {message}"
+        return f"[FARMER'S QUESTION in {language}]: {message}", prediction
 
 # API Routes
-@api_router.get("/")
-async def root():
-    return {
-        "message": "Farmer Voice Assistant API",
-        "status": "running",
-        "ml_model_loaded": ML_MODEL_LOADED,
-        "data_source": "Government of India Agricultural Statistics",
-        "supported_languages": ["English", "Hindi", "Telugu"],
-        "supported_crops": list(CROP_KNOWLEDGE.keys()),
-        "supported_states": list(STATE_AGRI_INFO.keys())
+class StaticJSON(NamedTuple):
+    """A response body encoded once, with its ETag"""
+    body: bytes
+    etag: str
+
+def static_json(payload) -> StaticJSON:
+    """Encode a payload that never changes after startup"""
+    body = orjson.dumps(payload, default=thaw)
+    return StaticJSON(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+def serve_static(cached: StaticJSON, request: Request) -> Response:
+    """Send pre-encoded JSON, or 304 if the client already has it"""
+    headers = {"ETag": cached.etag}
+    if request.headers.get("if-none-match") == cached.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+# The knowledge base and model are fixed once loaded, so these listings are encoded at import
+ROOT_RESPONSE = static_json({
+    "message": "Farmer Voice Assistant API",
+    "status": "running",
+    "ml_model_loaded": ML_MODEL_LOADED,
+    "data_source": "Government of India Agricultural Statistics",
+    "supported_languages": ["English", "Hindi", "Telugu"],
+    "supported_crops": list(CROP_KNOWLEDGE.keys()),
+    "supported_states": list(STATE_AGRI_INFO.keys())
+})
+
+def crop_summaries(crop_keys) -> List[Dict]:
+    """Basic info for each crop, as listed by /crops"""
+    crops = []
+    for crop_key in crop_keys:
+        info = CROP_KNOWLEDGE[crop_key]
+        crops.append({
+            "name": crop_key.title(),
+            "name_hi": localized_name(crop_key, 'hi'),
+            "name_te": localized_name(crop_key, 'te'),
+            "optimal_season": info.get('optimal_season'),
+            "yield_range": info.get('yield_range_kg_ha'),
+            "top_states": info.get('top_states')
+        })
+    return crops
+
+CROPS_RESPONSE = static_json(crop_summaries(CROP_KNOWLEDGE.keys()))
+
+STATES_RESPONSE = static_json([
+    {
+        "name": state_key.title(),
+        "name_hi": info.get('name_hi'),
+        "name_te": info.get('name_te'),
+        "major_crops": info.get('major_crops'),
+        "rainfall_range": info.get('rainfall_mm'),
+        "agri_helpline": info.get('agri_helpline')
     }
+    for state_key, info in STATE_AGRI_INFO.items()
+])
+
+SCHEMES_RESPONSE = static_json(GOVT_SCHEMES)
+
+@api_router.get("/")
+async def root(request: Request):
+    return serve_static(ROOT_RESPONSE, request)
+
+# Background DB writes; held here so the event loop doesn't drop them before they finish
+pending_writes = set()
+
+async def _safe_insert(collection, docs: List[Dict], what: str):
+    """Insert documents, logging instead of raising on failure"""
+    try:
+        if len(docs) == 1:
+            await collection.insert_one(docs[0])
+        else:
+            await collection.insert_many(docs, ordered=False)
+    except Exception as e:
+        logger.warning(f"Failed to save {what} to DB: {e}")
+
+def write_in_background(collection, docs: List[Dict], what: str):
+    """Schedule a DB write without holding up the response"""
+    task = asyncio.create_task(_safe_insert(collection, docs, what))
+    pending_writes.add(task)
+    task.add_done_callback(pending_writes.discard)
 
 @api_router.post("/session", response_model=Session)
 async def create_session(language: str = "en"):
     session = Session(language=language)
 
-    if db:
-        try:
-            await db.sessions.insert_one(session.dict())
-        except Exception as e:
-            logger.warning(f"Failed to save session to DB: {e}")
+    if db is not None:
+        write_in_background(db.sessions, [session.model_dump()], "session")
     else:
         logger.info("DB disabled: session not stored")
 
@@ -560,7 +923,7 @@ async def create_session(language: str = "en"):
 @api_router.get("/session/{session_id}", response_model=Session)
 async def get_session(session_id: str):
     """Get session details"""
-    if not db:
+    if db is None:
         raise HTTPException(status_code=503, detail="Database disabled")
 
     session = await db.sessions.find_one({"id": session_id})
@@ -577,8 +940,8 @@ async def chat(request: ChatRequest):
         # Detect language
         detected_language = request.language or detect_language(request.message)
         
-        # Build enriched context message
-        enriched_message = build_context_message(
+        # Build enriched context message (and the ML prediction it is based on)
+        enriched_message, prediction = build_context(
             request.message, 
             request.farm_context, 
             detected_language
@@ -591,27 +954,10 @@ async def chat(request: ChatRequest):
         user_message = UserMessage(text=enriched_message)
         response_text = await chat_instance.send_message(user_message)
         
-        # Generate ML prediction for response if applicable
-        ml_prediction = None
+        ml_prediction = prediction.model_dump() if prediction else None
         knowledge_context = {}
         
         if request.farm_context:
-            if all(k in request.farm_context for k in ['crop_type', 'soil_type', 'season', 'location']):
-                try:
-                    farm_input = FarmInput(
-                        crop_type=request.farm_context.get('crop_type', ''),
-                        soil_type=request.farm_context.get('soil_type', ''),
-                        season=request.farm_context.get('season', ''),
-                        location=request.farm_context.get('location', ''),
-                        rainfall_mm=request.farm_context.get('rainfall_mm'),
-                        irrigation_percent=request.farm_context.get('irrigation_percent'),
-                        fertilizer_kg_ha=request.farm_context.get('fertilizer_kg_ha')
-                    )
-                    prediction = predict_yield_ml(farm_input)
-                    ml_prediction = prediction.dict()
-                except Exception as e:
-                    logger.warning(f"ML prediction error: {e}")
-            
             # Add knowledge context
             crop_info = get_crop_info(request.farm_context.get('crop_type', ''))
             if crop_info:
@@ -635,13 +981,10 @@ async def chat(request: ChatRequest):
             language=detected_language
         )
 
-    if db:
-    try:
-        await db.messages.insert_many([user_msg.dict(), assistant_msg.dict()])
-    except Exception as e:
-        logger.warning(f"Failed to save messages to DB: {e}")
-else:
-    logger.info("DB disabled: messages not stored")
+        if message_log is not None:
+            write_in_background(message_log, [user_msg.model_dump(), assistant_msg.model_dump()], "messages")
+        else:
+            logger.info("DB disabled: messages not stored")
 
         
         return ChatResponse(
@@ -656,35 +999,83 @@ else:
         logger.error(f"Chat error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
+@api_router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Send a message and stream the AI response back as plain text while it is generated"""
+    detected_language = request.language or detect_language(request.message)
+    enriched_message, _ = build_context(request.message, request.farm_context, detected_language)
+    chat_instance = await get_or_create_chat(request.session_id)
+
+    async def relay():
+        parts = []
+        async for chunk in chat_instance.stream_message(UserMessage(text=enriched_message)):
+            parts.append(chunk)
+            yield chunk
+
+        if message_log is not None:
+            write_in_background(message_log, [
+                ChatMessage(session_id=request.session_id, role="user",
+                            content=request.message, language=detected_language).model_dump(),
+                ChatMessage(session_id=request.session_id, role="assistant",
+                            content="".join(parts), language=detected_language).model_dump()
+            ], "messages")
+
+    return StreamingResponse(
+        relay(),
+        media_type="text/plain; charset=utf-8",
+        headers={"X-Detected-Language": detected_language}
+    )
+
 @api_router.get("/messages/{session_id}", response_model=List[ChatMessage])
 async def get_messages(session_id: str):
     """Get chat history for a session"""
-    if not db:
-    raise HTTPException(status_code=503, detail="Database disabled")
+    if db is None:
+        raise HTTPException(status_code=503, detail="Database disabled")
+
+    messages = await db.messages.find({"session_id": session_id}, {"_id": 0}).sort("timestamp", 1).to_list(100)
+    return [ChatMessage(**msg) for msg in messages]
 
-messages = await db.messages.find({"session_id": session_id}).sort("timestamp", 1).to_list(100)
-return [ChatMessage(**msg) for msg in messages]
 
+# Model inference runs on these threads so a large batch doesn't stall the event loop
+# (feature rows are per-thread, and sklearn/numpy release the GIL for much of the work)
+PREDICTION_THREADS = int(os.environ.get('PREDICTION_THREADS', min(4, os.cpu_count() or 1)))
+prediction_pool = ThreadPoolExecutor(max_workers=PREDICTION_THREADS, thread_name_prefix="predict")
+
+async def run_prediction(func, *args):
+    """Run a blocking prediction function on prediction_pool"""
+    return await asyncio.get_running_loop().run_in_executor(prediction_pool, func, *args)
 
 @api_router.post("/predict", response_model=MLPrediction)
 async def predict(farm_input: FarmInput):
     """Get ML prediction for crop yield based on Government of India data"""
-    return predict_yield_ml(farm_input)
+    return await run_prediction(predict_yield_ml, farm_input)
+
+MAX_BATCH_SIZE = 500
+
+@api_router.post("/predict/batch", response_model=List[MLPrediction])
+async def predict_batch(farm_inputs: List[FarmInput]):
+    """Get ML yield predictions for several farms in one request"""
+    if len(farm_inputs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} inputs per batch")
+    return await run_prediction(predict_yield_batch, farm_inputs)
 
 @api_router.get("/crops")
-async def get_crops():
-    """Get list of supported crops with basic info"""
-    crops = []
-    for crop_key, info in CROP_KNOWLEDGE.items():
-        crops.append({
-            "name": crop_key.title(),
-            "name_hi": info.get('name_hi'),
-            "name_te": info.get('name_te'),
-            "optimal_season": info.get('optimal_season'),
-            "yield_range": info.get('yield_range_kg_ha'),
-            "top_states": info.get('top_states')
-        })
-    return crops
+async def get_crops(request: Request, season: Optional[str] = None, soil: Optional[str] = None,
+                    state: Optional[str] = None, ph: Optional[float] = None,
+                    category: Optional[str] = None):
+    """Get list of supported crops with basic info, optionally filtered by season/soil/state/pH/category"""
+    if not (season or soil or state or ph is not None or category):
+        return serve_static(CROPS_RESPONSE, request)
+    return crop_summaries(filter_crops(season=season, soil=soil, ph=ph, state=state, category=category))
+
+@api_router.get("/crops/recommend")
+async def get_crop_recommendations(soil: str, season: str, ph: Optional[float] = None,
+                                   rainfall_mm: Optional[float] = None, top_k: int = 5):
+    """Rank crops by suitability for a soil type, season, soil pH and expected rainfall"""
+    return [
+        {"name": crop_key.title(), "score": round(score, 2)}
+        for crop_key, score in recommend_crops(soil, season, ph, top_k, rainfall_mm)
+    ]
 
 @api_router.get("/crops/{crop_name}")
 async def get_crop_details(crop_name: str):
@@ -692,22 +1083,17 @@ async def get_crop_details(crop_name: str):
     crop_info = get_crop_info(crop_name)
     if not crop_info:
         raise HTTPException(status_code=404, detail=f"Crop '{crop_name}' not found in knowledge base")
-    return crop_info
+    return {
+        "name_hi": localized_name(crop_name, 'hi'),
+        "name_te": localized_name(crop_name, 'te'),
+        **crop_info,
+        **get_crop_tips(crop_name)
+    }
 
 @api_router.get("/states")
-async def get_states():
+async def get_states(request: Request):
     """Get list of supported states with agricultural info"""
-    states = []
-    for state_key, info in STATE_AGRI_INFO.items():
-        states.append({
-            "name": state_key.title(),
-            "name_hi": info.get('name_hi'),
-            "name_te": info.get('name_te'),
-            "major_crops": info.get('major_crops'),
-            "rainfall_range": info.get('rainfall_mm'),
-            "agri_helpline": info.get('agri_helpline')
-        })
-    return states
+    return serve_static(STATES_RESPONSE, request)
 
 @api_router.get("/states/{state_name}")
 async def get_state_details(state_name: str):
@@ -718,9 +1104,9 @@ async def get_state_details(state_name: str):
     return state_info
 
 @api_router.get("/schemes")
-async def get_schemes():
+async def get_schemes(request: Request):
     """Get list of government schemes for farmers"""
-    return GOVT_SCHEMES
+    return serve_static(SCHEMES_RESPONSE, request)
 
 @api_router.post("/detect-language")
 async def detect_lang(text: str):
@@ -750,13 +1136,19 @@ async def get_weather(location: str, language: str = "en"):
     weather_data = await get_weather_advisory(location, language)
     return weather_data
 
+MAX_WEATHER_BATCH = 50
+
+@api_router.post("/weather/batch")
+async def get_weather_batch(locations: List[str], language: str = "en"):
+    """Get weather data and agricultural advisories for several locations at once"""
+    if len(locations) > MAX_WEATHER_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_WEATHER_BATCH} locations per batch")
+    return await get_weather_advisories(locations, language)
+
 @api_router.post("/speech-to-text")
 async def speech_to_text(file: UploadFile = File(...), language: str = "auto"):
     """Convert speech to text using OpenAI Whisper API - supports Hindi, Telugu, English"""
     try:
-        # Read audio file
-        contents = await file.read()
-        
         # Language mapping for Whisper
         lang_map = {
             "hi": "hi",  # Hindi
@@ -768,67 +1160,45 @@ async def speech_to_text(file: UploadFile = File(...), language: str = "auto"):
         whisper_lang = lang_map.get(language)
         
         # Prepare multipart form data for Whisper API
-        import io
-        
-        # Create form data
-        files = {
-            'file': ('audio.m4a', io.BytesIO(contents), 'audio/m4a'),
-            'model': (None, 'whisper-1'),
-        }
+        fields = {'model': 'whisper-1'}
         
         if whisper_lang:
-            files['language'] = (None, whisper_lang)
+            fields['language'] = whisper_lang
         
         # Add prompt to help with agricultural terminology
-        files['prompt'] = (None, 'This is a farmer asking about crops, farming, agriculture, पंट, फसल, खेती, धान, गेहूं, వరి, పంట, వ్యవసాయం')
+        fields['prompt'] = 'This is a farmer asking about crops, farming, agriculture, पंट, फसल, खेती, धान, गेहूं, వరి, పంట, వ్యవసాయం'
+        
+        # The upload is streamed from its spooled temp file rather than read into memory first
+        headers, body = multipart_upload(file, 'audio.m4a', 'audio/m4a', fields)
+        response = await post_openai("audio/transcriptions", headers=headers, content=body)
+        
+        if response.status_code != 200:
+            logger.error(f"Whisper API error: {response.status_code} - {response.text}")
+            raise HTTPException(status_code=500, detail=f"Speech recognition failed: {response.text}")
+        
+        result = orjson.loads(response.content)
+        transcribed_text = result.get('text', '')
+        
+        # Detect language of transcribed text
+        detected_lang = detect_language(transcribed_text)
+        
+        return {
+            "success": True,
+            "text": transcribed_text,
+            "detected_language": detected_lang,
+            "confidence": "high" if len(transcribed_text) > 10 else "medium"
+        }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/audio/transcriptions",
-                headers={
-                    "Authorization": f"Bearer {EMERGENT_LLM_KEY}",
-                },
-                files=files
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Whisper API error: {response.status_code} - {response.text}")
-                raise HTTPException(status_code=500, detail=f"Speech recognition failed: {response.text}")
-            
-            result = response.json()
-            transcribed_text = result.get('text', '')
-            
-            # Detect language of transcribed text
-            detected_lang = detect_language(transcribed_text)
-            
-            return {
-                "success": True,
-                "text": transcribed_text,
-                "detected_language": detected_lang,
-                "confidence": "high" if len(transcribed_text) > 10 else "medium"
-            }
-            
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Speech-to-text error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Speech recognition error: {str(e)}")
 
-@api_router.post("/analyze-pest-image")
-async def analyze_pest_image(file: UploadFile = File(...), language: str = "en", crop: str = ""):
-    """Analyze uploaded image for pest/disease identification using GPT-4o Vision"""
-    try:
-        # Read image and convert to base64
-        contents = await file.read()
-        base64_image = base64.b64encode(contents).decode('utf-8')
-        
-        # Determine mime type
-        content_type = file.content_type or "image/jpeg"
-        
-        # Create prompt for pest analysis
-        analysis_prompt = f"""You are an expert agricultural scientist specializing in plant pathology and entomology in India.
+# Pest analysis prompt; filled with the crop and the instruction for the response language
+PEST_ANALYSIS_PROMPT = """You are an expert agricultural scientist specializing in plant pathology and entomology in India.
 
-Analyze this image of a crop (likely {crop if crop else 'unknown crop'}) and identify:
+Analyze this image of a crop (likely {crop}) and identify:
 
 1. PEST/DISEASE IDENTIFICATION:
    - Name of the pest or disease (common name and scientific name if possible)
@@ -856,79 +1226,146 @@ Analyze this image of a crop (likely {crop if crop else 'unknown crop'}) and ide
    - Expected recovery rate
    - Yield improvement after treatment
 
-Respond in {language.upper()} language (en=English, hi=Hindi, te=Telugu).
+{response_language}
 Be specific with Indian brand names of pesticides/fungicides available in the market.
 Include safety precautions for chemical application."""
 
+PEST_ANALYSIS_LANGUAGES = ("en", "hi", "te")
+# language="all" gets every translation from one model call instead of one call per language
+PEST_ANALYSIS_ALL_LANGUAGES = (
+    'Respond with strict JSON of the form {"en": "...", "hi": "...", "te": "..."}, '
+    'giving the full analysis in English, Hindi and Telugu respectively.'
+)
+
+PEST_ANALYSIS_DISCLAIMERS: Mapping[str, str] = MappingProxyType({
+    "en": "This is an AI-based preliminary analysis. For severe infestations, consult a local agricultural officer.",
+    "hi": "यह AI आधारित प्रारंभिक विश्लेषण है। गंभीर संक्रमण के लिए स्थानीय कृषि अधिकारी से परामर्श लें।",
+    "te": "ఇది AI ఆధారిత ప్రాథమిక విశ్లేషణ. తీవ్రమైన ముట్టడికి స్థానిక వ్యవసాయ అధికారిని సంప్రదించండి."
+})
+
+MAX_IMAGE_BYTES = int(os.environ.get('MAX_IMAGE_BYTES', 8 * 1024 * 1024))
+
+@api_router.post("/analyze-pest-image")
+async def analyze_pest_image(file: UploadFile = File(...), language: str = "en", crop: str = ""):
+    """Analyze uploaded image for pest/disease identification using GPT-4o Vision
+
+    language="all" returns the analysis and disclaimer in English, Hindi and
+    Telugu at once, as {"en": ..., "hi": ..., "te": ...} objects.
+    """
+    all_languages = language == "all"
+    if file.size is not None and file.size > MAX_IMAGE_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+    try:
+        # Read image, never more than the limit plus one byte
+        contents = await file.read(MAX_IMAGE_BYTES + 1)
+        if len(contents) > MAX_IMAGE_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large")
+        
+        # Determine mime type
+        content_type = file.content_type or "image/jpeg"
+        
+        # Create prompt for pest analysis
+        if all_languages:
+            response_language = PEST_ANALYSIS_ALL_LANGUAGES
+        else:
+            response_language = f"Respond in {language.upper()} language (en=English, hi=Hindi, te=Telugu)."
+        analysis_prompt = PEST_ANALYSIS_PROMPT.format(crop=crop or 'unknown crop', response_language=response_language)
+
         # Use OpenAI API directly for vision
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {EMERGENT_LLM_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": [
+        request_body = orjson.dumps({
+            "model": "gpt-4o",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": analysis_prompt},
                         {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": analysis_prompt},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:{content_type};base64,{base64_image}"
-                                    }
-                                }
-                            ]
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:{content_type};base64,{IMAGE_DATA_SLOT}"
+                            }
                         }
-                    ],
-                    "max_tokens": 2000
+                    ]
                 }
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"OpenAI Vision API error: {response.text}")
-                raise HTTPException(status_code=500, detail="Image analysis failed")
-            
-            result = response.json()
-            analysis_text = result['choices'][0]['message']['content']
-            
+            ],
+            **({"response_format": {"type": "json_object"}} if all_languages else {}),
+            "max_tokens": 2000 * len(PEST_ANALYSIS_LANGUAGES) if all_languages else 2000
+        })
+        # Base64 needs no JSON escaping, so the encoded image goes straight into the body
+        # bytes instead of being copied through a str and the JSON encoder
+        body_head, _, body_tail = request_body.partition(IMAGE_DATA_SLOT.encode())
+        response = await post_openai(
+            "chat/completions",
+            headers={"Content-Type": "application/json"},
+            content=b"".join((body_head, base64.b64encode(contents), body_tail))
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"OpenAI Vision API error: {response.text}")
+            raise HTTPException(status_code=500, detail="Image analysis failed")
+        
+        result = orjson.loads(response.content)
+        analysis_text = result['choices'][0]['message']['content']
+        
+        if all_languages:
+            translations = orjson.loads(analysis_text)
             return {
                 "success": True,
-                "analysis": analysis_text,
+                "analysis": {lang: translations.get(lang, "") for lang in PEST_ANALYSIS_LANGUAGES},
                 "language": language,
                 "crop": crop,
-                "disclaimer": {
-                    "en": "This is an AI-based preliminary analysis. For severe infestations, consult a local agricultural officer.",
-                    "hi": "यह AI आधारित प्रारंभिक विश्लेषण है। गंभीर संक्रमण के लिए स्थानीय कृषि अधिकारी से परामर्श लें।",
-                    "te": "ఇది AI ఆధారిత ప్రాథమిక విశ్లేషణ. తీవ్రమైన ముట్టడికి స్థానిక వ్యవసాయ అధికారిని సంప్రదించండి."
-                }.get(language, "This is an AI-based preliminary analysis.")
+                "disclaimer": dict(PEST_ANALYSIS_DISCLAIMERS)
             }
-            
+        
+        return {
+            "success": True,
+            "analysis": analysis_text,
+            "language": language,
+            "crop": crop,
+            "disclaimer": PEST_ANALYSIS_DISCLAIMERS.get(language, "This is an AI-based preliminary analysis.")
+        }
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Pest image analysis error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Image analysis error: {str(e)}")
 
-@api_router.post("/chart-data/yield-comparison")
-async def get_yield_comparison_chart(farm_input: FarmInput):
-    """Generate chart data for yield comparison visualization"""
-    prediction = predict_yield_ml(farm_input)
-    
+class ChartResponse(ORJSONResponse):
+    """Chart JSON encoded straight by orjson, numpy values included
+
+    Returning a response object skips FastAPI's jsonable_encoder pass over
+    the payload, which costs more than orjson's encoding itself.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=thaw, option=orjson.OPT_SERIALIZE_NUMPY)
+
+CHART_COLORS = ("#4CAF50", "#2196F3", "#FF9800", "#9C27B0", "#E91E63")
+YIELD_COMPARISON_LABELS = ("Your Prediction", "State Average", "National Average", "Best Case")
+# Baseline share of each factor in the factors chart, nudged by the prediction's factor impacts
+FACTOR_WEIGHTS: Mapping[str, int] = MappingProxyType({
+    "Irrigation": 30,
+    "Rainfall": 25,
+    "Soil Type": 20,
+    "Fertilizer": 15,
+    "Season": 10
+})
+
+def yield_comparison_chart(farm_input: FarmInput, prediction: MLPrediction) -> Dict[str, Any]:
+    """Bar chart comparing the predicted yield with state, national and best-case yields"""
     # Prepare bar chart data for comparison
     chart_data = {
         "chart_type": "bar",
         "title": f"{farm_input.crop_type.title()} Yield Comparison",
         "data": {
-            "labels": ["Your Prediction", "State Average", "National Average", "Best Case"],
+            "labels": YIELD_COMPARISON_LABELS,
             "values": [
                 prediction.predicted_yield_kg_ha,
                 prediction.state_avg_yield or prediction.predicted_yield_kg_ha * 0.9,
                 prediction.national_avg_yield or prediction.predicted_yield_kg_ha * 0.85,
                 prediction.crop_info.get('yield_range_kg_ha', {}).get('max', prediction.predicted_yield_kg_ha * 1.2) if prediction.crop_info else prediction.predicted_yield_kg_ha * 1.2
             ],
-            "colors": ["#4CAF50", "#2196F3", "#FF9800", "#9C27B0"]
+            "colors": CHART_COLORS[:4]
         },
         "unit": "kg/ha",
         "analysis": prediction.comparison
@@ -936,19 +1373,18 @@ async def get_yield_comparison_chart(farm_input: FarmInput):
     
     return chart_data
 
-@api_router.post("/chart-data/factors")
-async def get_factors_chart(farm_input: FarmInput):
-    """Generate chart data for influential factors visualization"""
-    prediction = predict_yield_ml(farm_input)
-    
+@api_router.post("/chart-data/yield-comparison")
+async def get_yield_comparison_chart(farm_input: FarmInput):
+    """Generate chart data for yield comparison visualization"""
+    prediction = await run_prediction(predict_yield_ml, farm_input)
+    return ChartResponse(yield_comparison_chart(farm_input, prediction))
+
+def factors_chart(farm_input: FarmInput, prediction: MLPrediction) -> Dict[str, Any]:
+    """Pie chart of how much each input factor weighs on the yield"""
     # Prepare pie/donut chart for factors
-    factor_values = {
-        "Irrigation": 30 if prediction.influential_factors else 25,
-        "Rainfall": 25,
-        "Soil Type": 20,
-        "Fertilizer": 15,
-        "Season": 10
-    }
+    factor_values = dict(FACTOR_WEIGHTS)
+    if not prediction.influential_factors:
+        factor_values["Irrigation"] = 25
     
     # Adjust based on actual factors
     for factor in prediction.influential_factors:
@@ -964,17 +1400,21 @@ async def get_factors_chart(farm_input: FarmInput):
         "data": {
             "labels": list(factor_values.keys()),
             "values": list(factor_values.values()),
-            "colors": ["#4CAF50", "#2196F3", "#FF9800", "#9C27B0", "#E91E63"]
+            "colors": CHART_COLORS
         },
         "insights": prediction.influential_factors
     }
     
     return chart_data
 
-@api_router.post("/chart-data/recommendations")
-async def get_recommendations_chart(farm_input: FarmInput):
-    """Generate chart data showing potential improvement with recommendations"""
-    prediction = predict_yield_ml(farm_input)
+@api_router.post("/chart-data/factors")
+async def get_factors_chart(farm_input: FarmInput):
+    """Generate chart data for influential factors visualization"""
+    prediction = await run_prediction(predict_yield_ml, farm_input)
+    return ChartResponse(factors_chart(farm_input, prediction))
+
+def recommendations_chart(farm_input: FarmInput, prediction: MLPrediction) -> Dict[str, Any]:
+    """Improvement roadmap: potential yield gain per recommended action"""
     crop_info = prediction.crop_info or {}
     
     current_yield = prediction.predicted_yield_kg_ha
@@ -1045,62 +1485,108 @@ async def get_recommendations_chart(farm_input: FarmInput):
     
     return chart_data
 
-@api_router.get("/chart-data/seasonal/{crop}")
-async def get_seasonal_chart(crop: str):
-    """Get seasonal calendar chart data for a crop"""
+@api_router.post("/chart-data/recommendations")
+async def get_recommendations_chart(farm_input: FarmInput):
+    """Generate chart data showing potential improvement with recommendations"""
+    prediction = await run_prediction(predict_yield_ml, farm_input)
+    return ChartResponse(recommendations_chart(farm_input, prediction))
+
+@api_router.post("/chart-data/all")
+async def get_all_charts(farm_input: FarmInput):
+    """Generate the yield comparison, factors and recommendations charts from one prediction"""
+    prediction = await run_prediction(predict_yield_ml, farm_input)
+    return ChartResponse({
+        "yield_comparison": yield_comparison_chart(farm_input, prediction),
+        "factors": factors_chart(farm_input, prediction),
+        "recommendations": recommendations_chart(farm_input, prediction)
+    })
+
+CALENDAR_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+ACTIVITIES = ("land_prep", "sowing", "growing", "harvest")
+
+def activity_template(**month_slices: slice) -> np.ndarray:
+    """An (activity x month) 0/1 grid with the given month ranges marked per activity"""
+    grid = np.zeros((len(ACTIVITIES), 12), dtype=np.uint8)
+    for activity, months in month_slices.items():
+        for month_range in (months if isinstance(months, tuple) else (months,)):
+            grid[ACTIVITIES.index(activity), month_range] = 1
+    return grid
+
+# (month names found in the sowing/harvest periods, activities they imply); month indexes are 0-based
+SOWING_RULES = (
+    (re.compile("June|July"), activity_template(
+        land_prep=slice(4, 6), sowing=slice(5, 7), growing=slice(6, 10))),
+    (re.compile("October|November"), activity_template(
+        land_prep=slice(8, 10), sowing=slice(9, 11), growing=(slice(10, 12), slice(0, 2)))),
+)
+HARVEST_RULES = (
+    (re.compile("October|November"), activity_template(harvest=slice(9, 11))),
+    (re.compile("February|March"), activity_template(harvest=slice(1, 4))),
+)
+
+@lru_cache(maxsize=256)
+def seasonal_payload(crop: str) -> Optional[StaticJSON]:
+    """Encoded seasonal calendar chart for a crop name, None if the crop is unknown"""
     crop_info = get_crop_info(crop)
     if not crop_info:
-        raise HTTPException(status_code=404, detail=f"Crop '{crop}' not found")
-    
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    
-    # Create activity timeline
-    activities = {
-        "land_prep": [0] * 12,
-        "sowing": [0] * 12,
-        "growing": [0] * 12,
-        "harvest": [0] * 12
-    }
-    
-    sowing_months = crop_info.get('sowing_months', {})
-    harvest_months = crop_info.get('harvest_months', {})
+        return None
     
-    # Map activities to months (simplified)
-    for season, period in sowing_months.items():
-        if "June" in period or "July" in period:
-            activities["land_prep"][4:6] = [1, 1]
-            activities["sowing"][5:7] = [1, 1]
-            activities["growing"][6:10] = [1, 1, 1, 1]
-        if "October" in period or "November" in period:
-            activities["land_prep"][8:10] = [1, 1]
-            activities["sowing"][9:11] = [1, 1]
-            activities["growing"][10:12] = [1, 1]
-            activities["growing"][0:2] = [1, 1]
+    # Map activities to months (simplified): OR in the template of every matching rule
+    activities = np.zeros((len(ACTIVITIES), 12), dtype=np.uint8)
+    sowing = " ".join(crop_info.get('sowing_months', {}).values())
+    harvest = " ".join(crop_info.get('harvest_months', {}).values())
+    for pattern, template in SOWING_RULES:
+        if pattern.search(sowing):
+            activities |= template
+    for pattern, template in HARVEST_RULES:
+        if pattern.search(harvest):
+            activities |= template
     
-    for season, period in harvest_months.items():
-        if "October" in period or "November" in period:
-            activities["harvest"][9:11] = [1, 1]
-        if "February" in period or "March" in period:
-            activities["harvest"][1:4] = [1, 1, 1]
-    
-    return {
+    return static_json({
         "chart_type": "calendar",
         "title": f"{crop.title()} - Seasonal Calendar",
         "crop": crop,
-        "months": months,
-        "activities": activities,
+        "months": CALENDAR_MONTHS,
+        "activities": dict(zip(ACTIVITIES, activities.tolist())),
         "irrigation_stages": crop_info.get('irrigation_stages', []),
         "critical_periods": [
             {"stage": "Sowing", "tip": "Ensure adequate soil moisture"},
             {"stage": "Flowering", "tip": "Critical for yield - avoid water stress"},
             {"stage": "Harvest", "tip": "Harvest at right maturity"}
         ]
-    }
+    })
+
+@api_router.get("/chart-data/seasonal/{crop}")
+async def get_seasonal_chart(crop: str, request: Request):
+    """Get seasonal calendar chart data for a crop"""
+    payload = seasonal_payload(crop)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Crop '{crop}' not found")
+    return serve_static(payload, request)
 
 # Include the router in the main app
 app.include_router(api_router)
 
 
+@app.on_event("shutdown")
+async def shutdown_llm_client():
+    global openai_media_slots, _openai_media_loop
+    await close_llm_client()
+    if http_client is not None:
+        await http_client.aclose()
+    openai_media_slots = _openai_media_loop = None
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    if pending_writes:
+        await asyncio.gather(*pending_writes, return_exceptions=True)
+    if client is not None:
+        client.close()
+
+@app.on_event("shutdown")
+async def shutdown_prediction_pool():
+    prediction_pool.shutdown(wait=False)
+
+@app.on_event("shutdown")
+async def shutdown_weather_service():
+    await weather_service.close()
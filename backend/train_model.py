@@ -2,6 +2,8 @@
 India Crop Yield Prediction Model
 Trained on Government of India Agricultural Statistics
 Based on data from Ministry of Agriculture & Farmers Welfare
+
+Run from the repository root: python -m backend.train_model
 """
 
 import pandas as pd
@@ -10,26 +12,52 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 import joblib
+import importlib.util
 import os
 from pathlib import Path
+from backend.model_artifacts import file_digest, flatten_forest, save_encoder_classes, save_forest
 
 # Paths
 DATA_DIR = Path(__file__).parent / 'data'
 MODEL_DIR = Path(__file__).parent / 'models'
+FOREST_DIR = MODEL_DIR / 'forest'
+
+def physical_cores() -> int:
+    """Physical CPU cores when psutil is installed to count them, else logical CPUs"""
+    if importlib.util.find_spec('psutil') is not None:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    return os.cpu_count() or 1
+
+# Tree building is compute-bound, so hyperthread siblings add little but contention;
+# default to one job per physical core
+TRAIN_JOBS = int(os.environ.get('TRAIN_JOBS', physical_cores()))
+
+CSV_DTYPES = {
+    'State': 'category', 'District': 'category', 'Crop': 'category',
+    'Season': 'category', 'Soil_Type': 'category',
+    'Annual_Rainfall_mm': 'float32', 'Irrigation_Percent': 'float32',
+    'Fertilizer_Kg_Ha': 'float32', 'Temperature_Avg_C': 'float32',
+    'Yield_Kg_Ha': 'float32'
+}
 
 def train_model():
     """Train Random Forest model on India crop data"""
     
-    # Load data
-    df = pd.read_csv(DATA_DIR / 'india_crop_data.csv')
+    # Load data with a fixed schema instead of per-column type inference
+    df = pd.read_csv(DATA_DIR / 'india_crop_data.csv', dtype=CSV_DTYPES)
     
-    # Create encoders
+    # Create encoders; pandas sorts inferred categories just as LabelEncoder sorts
+    # classes, so the category codes are the encoder's labels
     encoders = {}
     categorical_cols = ['State', 'District', 'Crop', 'Season', 'Soil_Type']
     
     for col in categorical_cols:
         encoders[col] = LabelEncoder()
-        df[f'{col}_encoded'] = encoders[col].fit_transform(df[col])
+        encoders[col].classes_ = df[col].cat.categories.to_numpy(dtype=object)
+        df[f'{col}_encoded'] = df[col].cat.codes.astype(np.int32)
     
     # Features for prediction
     feature_cols = [
@@ -52,7 +80,7 @@ def train_model():
         min_samples_split=5,
         min_samples_leaf=2,
         random_state=42,
-        n_jobs=-1
+        n_jobs=TRAIN_JOBS
     )
     
     model.fit(X_train, y_train)
@@ -75,6 +103,11 @@ def train_model():
     joblib.dump(model, MODEL_DIR / 'yield_model.pkl')
     joblib.dump(encoders, MODEL_DIR / 'encoders.pkl')
     
+    # Flattened trees for the server's numpy forest walk, memory-mapped at startup
+    save_forest(flatten_forest(model), FOREST_DIR, file_digest(MODEL_DIR / 'yield_model.pkl'))
+    # Encoder classes as JSON, so the server needn't import scikit-learn to unpickle them
+    save_encoder_classes(encoders, FOREST_DIR / 'encoder_classes.json', file_digest(MODEL_DIR / 'encoders.pkl'))
+    
     # Save training stats
     stats = {
         'train_score': train_score,
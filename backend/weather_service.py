@@ -5,12 +5,145 @@ Provides real-time weather and agricultural advisories
 """
 
 import httpx
-from typing import Dict, Any, Optional
+import orjson
+import asyncio
+import importlib.util
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
+from urllib.parse import urlencode
+
+from backend.name_scan import NameScan
 
 logger = logging.getLogger(__name__)
 
+# Open-Meteo responses are reused for nearby requests: coordinates rounded to
+# 2 decimals (about 1 km), kept for 15 minutes, at most 512 locations
+WEATHER_CACHE_TTL = 900
+WEATHER_CACHE_SIZE = 512
+# Upstream calls in flight at once across get_weather_many batches
+WEATHER_CONCURRENCY = 10
+
+# Open-Meteo client tuning: per-phase timeouts so a hung connect or DNS lookup
+# fails fast, and a keep-alive pool sized for get_weather_many bursts
+HTTP_TIMEOUT = httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=5.0)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+# HTTP/2 multiplexes concurrent calls over one connection; httpx needs the optional h2 package for it
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# WMO weather code -> description
+WMO_CONDITIONS: Mapping[int, str] = MappingProxyType({
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Foggy",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Moderate drizzle",
+    55: "Dense drizzle",
+    61: "Slight rain",
+    63: "Moderate rain",
+    65: "Heavy rain",
+    71: "Slight snow",
+    73: "Moderate snow",
+    75: "Heavy snow",
+    80: "Slight rain showers",
+    81: "Moderate rain showers",
+    82: "Violent rain showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail",
+    99: "Thunderstorm with heavy hail"
+})
+
+# Advisory entries by type; the rain messages are formatted with the 7-day total as {rain_mm}
+ADVISORY_TEMPLATES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "heat_stress": MappingProxyType({
+        "type": "heat_stress",
+        "severity": "high",
+        "message_en": "Extreme heat alert! Avoid field work 11 AM - 4 PM. Irrigate in evening only.",
+        "message_hi": "अत्यधिक गर्मी की चेतावनी! सुबह 11 से शाम 4 बजे तक खेत में काम न करें। शाम को ही सिंचाई करें।",
+        "message_te": "తీవ్ర వేడి హెచ్చరిక! 11 AM - 4 PM మధ్య పొలం పనులు చేయకండి. సాయంత్రం మాత్రమే నీరు పెట్టండి."
+    }),
+    "heat_advisory": MappingProxyType({
+        "type": "heat_advisory",
+        "severity": "medium",
+        "message_en": "High temperature. Provide shade for nurseries. Mulch to conserve moisture.",
+        "message_hi": "उच्च तापमान। नर्सरी को छाया दें। पानी बचाने के लिए मल्चिंग करें।",
+        "message_te": "అధిక ఉష్ణోగ్రత. నర్సరీలకు నీడ ఇవ్వండి. తేమ కాపాడటానికి మల్చింగ్ చేయండి."
+    }),
+    "cold_advisory": MappingProxyType({
+        "type": "cold_advisory",
+        "severity": "medium",
+        "message_en": "Low temperature. Protect crops from frost. Irrigate in morning to reduce frost damage.",
+        "message_hi": "कम तापमान। फसलों को पाले से बचाएं। पाले के नुकसान को कम करने के लिए सुबह सिंचाई करें।",
+        "message_te": "తక్కువ ఉష్ణోగ్రత. పంటలను మంచు నుండి రక్షించండి. మంచు నష్టాన్ని తగ్గించడానికి ఉదయం నీరు పెట్టండి."
+    }),
+    "heavy_rain_warning": MappingProxyType({
+        "type": "heavy_rain_warning",
+        "severity": "high",
+        "message_en": "Heavy rainfall expected ({rain_mm:.0f}mm in 7 days). Ensure field drainage. Postpone fertilizer application.",
+        "message_hi": "भारी बारिश की संभावना ({rain_mm:.0f}mm 7 दिनों में)। खेत में जल निकासी सुनिश्चित करें। उर्वरक डालने में देरी करें।",
+        "message_te": "భారీ వర్షం అంచనా ({rain_mm:.0f}mm 7 రోజుల్లో). పొలంలో డ్రైనేజీ నిర్ధారించుకోండి. ఎరువులు వేయడం వాయిదా వేయండి."
+    }),
+    "rain_expected": MappingProxyType({
+        "type": "rain_expected",
+        "severity": "low",
+        "message_en": "Good rainfall expected ({rain_mm:.0f}mm). Favorable for sowing. Complete land preparation.",
+        "message_hi": "अच्छी बारिश की संभावना ({rain_mm:.0f}mm)। बुवाई के लिए अनुकूल। भूमि की तैयारी पूरी करें।",
+        "message_te": "మంచి వర్షం అంచనా ({rain_mm:.0f}mm). విత్తనానికి అనుకూలం. భూమి సిద్ధం పూర్తి చేయండి."
+    }),
+    "dry_spell": MappingProxyType({
+        "type": "dry_spell",
+        "severity": "medium",
+        "message_en": "Dry spell expected. Plan irrigation. Watch for pest buildup in dry conditions.",
+        "message_hi": "सूखे की संभावना। सिंचाई की योजना बनाएं। सूखी परिस्थितियों में कीटों पर नजर रखें।",
+        "message_te": "పొడి వాతావరణం అంచనా. నీటిపారుదల ప్రణాళిక చేయండి. పొడి పరిస్థితుల్లో పురుగుల పెరుగుదలను గమనించండి."
+    }),
+    "disease_risk": MappingProxyType({
+        "type": "disease_risk",
+        "severity": "medium",
+        "message_en": "High humidity increases disease risk. Apply preventive fungicide. Avoid overhead irrigation.",
+        "message_hi": "उच्च आर्द्रता से रोग का खतरा बढ़ता है। निवारक फफूंदनाशक लगाएं। ऊपरी सिंचाई से बचें।",
+        "message_te": "అధిక తేమ వల్ల వ్యాధుల ప్రమాదం పెరుగుతుంది. నివారణ శిలీంద్ర నాశిని చల్లండి. పై నుండి నీరు పెట్టడం మానండి."
+    }),
+    "spray_favorable": MappingProxyType({
+        "type": "spray_favorable",
+        "severity": "info",
+        "message_en": "Low wind - favorable for pesticide/fertilizer spraying. Best time: early morning or late evening.",
+        "message_hi": "कम हवा - कीटनाशक/उर्वरक छिड़काव के लिए अनुकूल। सबसे अच्छा समय: सुबह जल्दी या शाम देर से।",
+        "message_te": "తక్కువ గాలి - పురుగుమందు/ఎరువుల పిచికారికి అనుకూలం. ఉత్తమ సమయం: పొద్దున్నే లేదా సాయంత్రం."
+    }),
+    "spray_unfavorable": MappingProxyType({
+        "type": "spray_unfavorable",
+        "severity": "info",
+        "message_en": "High wind - avoid spraying pesticides/fertilizers. Risk of drift and wastage.",
+        "message_hi": "तेज हवा - कीटनाशक/उर्वरक छिड़काव न करें। बहाव और बर्बादी का खतरा।",
+        "message_te": "అధిక గాలి - పురుగుమందులు/ఎరువులు పిచికారీ చేయకండి. కొట్టుకుపోయే ప్రమాదం."
+    })
+})
+
+# Rain advisories whose messages include the forecast total
+RAIN_ADVISORY_TYPES = frozenset({"heavy_rain_warning", "rain_expected"})
+
+# Advisories as the API returns them, per language: {"type", "severity", "message"}.
+# Read-only templates; each response gets its own copy
+ADVISORY_LANGUAGES = ("en", "hi", "te")
+LOCALIZED_ADVISORIES: Mapping[str, Mapping[str, Mapping[str, str]]] = MappingProxyType({
+    language: MappingProxyType({
+        advisory_type: MappingProxyType({
+            "type": advisory_type,
+            "severity": template["severity"],
+            "message": template[f"message_{language}"]
+        })
+        for advisory_type, template in ADVISORY_TEMPLATES.items()
+    })
+    for language in ADVISORY_LANGUAGES
+})
+
 # Indian state capitals coordinates for weather data
 INDIA_LOCATIONS = {
     "andhra pradesh": {"lat": 16.5062, "lon": 80.6480, "city": "Vijayawada"},
@@ -36,7 +169,7 @@ INDIA_LOCATIONS = {
 }
 
 # District coordinates (major agricultural districts)
-DISTRICT_COORDS = {
+DISTRICT_COORDS: Mapping[str, Mapping[str, float]] = MappingProxyType({name: MappingProxyType(coords) for name, coords in {
     # Andhra Pradesh
     "guntur": {"lat": 16.3067, "lon": 80.4365},
     "krishna": {"lat": 16.6100, "lon": 80.7214},
@@ -82,51 +215,99 @@ DISTRICT_COORDS = {
     "coimbatore": {"lat": 11.0168, "lon": 76.9558},
     "madurai": {"lat": 9.9252, "lon": 78.1198},
     "thanjavur": {"lat": 10.7870, "lon": 79.1378},
-}
+}.items()})
+
+# Coordinates by state name, shaped like DISTRICT_COORDS
+STATE_COORDS: Mapping[str, Mapping[str, float]] = MappingProxyType({
+    state: MappingProxyType({"lat": data["lat"], "lon": data["lon"]}) for state, data in INDIA_LOCATIONS.items()
+})
+
+# District and state names found in a location string, districts taking precedence
+_DISTRICT_SCAN = NameScan(DISTRICT_COORDS)
+_STATE_SCAN = NameScan(STATE_COORDS)
+
+def select_advisory_types(temp: float, humidity: float, wind_speed: float, total_rain_7days: float) -> List[str]:
+    """Pick the ADVISORY_TEMPLATES types that apply to the current conditions and 7-day rain"""
+    advisory_types = []
+    
+    # Temperature advisories
+    if temp > 40:
+        advisory_types.append("heat_stress")
+    elif temp > 35:
+        advisory_types.append("heat_advisory")
+    elif temp < 10:
+        advisory_types.append("cold_advisory")
+    
+    # Rain forecast advisories
+    if total_rain_7days > 100:
+        advisory_types.append("heavy_rain_warning")
+    elif total_rain_7days > 50:
+        advisory_types.append("rain_expected")
+    elif total_rain_7days < 5:
+        advisory_types.append("dry_spell")
+    
+    # Humidity advisories (disease risk)
+    if humidity > 85:
+        advisory_types.append("disease_risk")
+    
+    # Spray timing advisory
+    if wind_speed < 10:
+        advisory_types.append("spray_favorable")
+    elif wind_speed > 20:
+        advisory_types.append("spray_unfavorable")
+    
+    return advisory_types
 
 class WeatherService:
     """Weather service using Open-Meteo API"""
     
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
+    # Only the coordinates vary between calls, so the rest of the query is encoded once
+    FORECAST_URL = BASE_URL + "?latitude={lat}&longitude={lon}&" + urlencode({
+        "current": "temperature_2m,relative_humidity_2m,precipitation,weather_code,wind_speed_10m",
+        "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,weather_code",
+        "timezone": "Asia/Kolkata",
+        "forecast_days": 7
+    })
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Created on first use inside the running event loop, closed by close() at shutdown
+        self.client: Optional[httpx.AsyncClient] = None
+        # (lat, lon) -> (fetched at, raw Open-Meteo data), oldest first
+        self._cache: "OrderedDict[Tuple[float, float], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # One lock per location, so concurrent misses share a single upstream call
+        self._locks: Dict[Tuple[float, float], asyncio.Lock] = {}
+        # Limits get_weather_many's upstream calls; made per event loop by _get_slots()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def get_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, creating it on first use"""
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS, http2=HTTP2_AVAILABLE)
+        return self.client
     
-    def get_coordinates(self, location: str) -> Optional[Dict[str, float]]:
+    def get_coordinates(self, location: str) -> Optional[Mapping[str, float]]:
         """Get coordinates for a location"""
         location_lower = location.lower().strip()
         
         # Check districts first
-        for district, coords in DISTRICT_COORDS.items():
-            if district in location_lower:
-                return coords
+        district = _DISTRICT_SCAN.first(location_lower)
+        if district:
+            return DISTRICT_COORDS[district]
         
         # Check states
-        for state, data in INDIA_LOCATIONS.items():
-            if state in location_lower:
-                return {"lat": data["lat"], "lon": data["lon"]}
-        
-        return None
+        state = _STATE_SCAN.first(location_lower)
+        return STATE_COORDS[state] if state else None
     
-    async def get_weather(self, location: str) -> Optional[Dict[str, Any]]:
-        """Get current and forecast weather for location"""
+    async def get_weather(self, location: str, language: str = "en") -> Optional[Dict[str, Any]]:
+        """Get current and forecast weather for location, with advisories in language"""
         coords = self.get_coordinates(location)
         if not coords:
             return None
         
         try:
-            params = {
-                "latitude": coords["lat"],
-                "longitude": coords["lon"],
-                "current": "temperature_2m,relative_humidity_2m,precipitation,weather_code,wind_speed_10m",
-                "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,weather_code",
-                "timezone": "Asia/Kolkata",
-                "forecast_days": 7
-            }
-            
-            response = await self.client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_forecast_data(coords)
             
             # Process current weather
             current = data.get("current", {})
@@ -148,18 +329,26 @@ class WeatherService:
             
             # Process 7-day forecast
             if daily:
-                for i in range(min(7, len(daily.get("time", [])))):
-                    weather_info["forecast"].append({
-                        "date": daily["time"][i],
-                        "max_temp_c": daily["temperature_2m_max"][i],
-                        "min_temp_c": daily["temperature_2m_min"][i],
-                        "precipitation_mm": daily["precipitation_sum"][i],
-                        "rain_probability": daily["precipitation_probability_max"][i],
-                        "condition": self._get_weather_condition(daily["weather_code"][i])
-                    })
+                days = zip(
+                    daily.get("time", [])[:7], daily["temperature_2m_max"], daily["temperature_2m_min"],
+                    daily["precipitation_sum"], daily["precipitation_probability_max"], daily["weather_code"]
+                )
+                weather_info["forecast"] = [
+                    {
+                        "date": date,
+                        "max_temp_c": max_temp,
+                        "min_temp_c": min_temp,
+                        "precipitation_mm": precipitation,
+                        "rain_probability": rain_probability,
+                        "condition": WMO_CONDITIONS.get(code, "Unknown")
+                    }
+                    for date, max_temp, min_temp, precipitation, rain_probability, code in days
+                ]
             
-            # Generate agricultural advisory
-            weather_info["agricultural_advisory"] = self._generate_agri_advisory(weather_info)
+            # Generate agricultural advisory; the 7-day rain total is summed straight
+            # from the raw series, skipping missing (None) days
+            total_rain_7days = sum(filter(None, daily.get("precipitation_sum", [])[:len(weather_info["forecast"])]))
+            weather_info["agricultural_advisory"] = self._generate_agri_advisory(weather_info, total_rain_7days, language)
             
             return weather_info
             
@@ -167,161 +356,118 @@ class WeatherService:
             logger.error(f"Weather API error: {e}")
             return None
     
+    async def get_weather_many(self, locations: List[str], language: str = "en") -> List[Optional[Dict[str, Any]]]:
+        """Get weather for several locations concurrently, in the order given"""
+        return await asyncio.gather(*(self._get_weather_limited(location, language) for location in locations))
+    
+    async def _get_weather_limited(self, location: str, language: str) -> Optional[Dict[str, Any]]:
+        """get_weather, waiting for one of the WEATHER_CONCURRENCY slots first"""
+        async with self._get_slots():
+            return await self.get_weather(location, language)
+    
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Get the WEATHER_CONCURRENCY semaphore for the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(WEATHER_CONCURRENCY)
+            self._slots_loop = loop
+        return self._slots
+    
+    def _cached_forecast(self, key: Tuple[float, float]) -> Optional[Dict[str, Any]]:
+        """Return the cached Open-Meteo data for key if it is still fresh"""
+        entry = self._cache.get(key)
+        if entry is None or time.monotonic() - entry[0] >= WEATHER_CACHE_TTL:
+            return None
+        return entry[1]
+    
+    async def _get_forecast_data(self, coords: Mapping[str, float]) -> Dict[str, Any]:
+        """Fetch raw Open-Meteo data for coords, served from the TTL cache when fresh"""
+        key = (round(coords["lat"], 2), round(coords["lon"], 2))
+        data = self._cached_forecast(key)
+        if data is not None:
+            return data
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            data = self._cached_forecast(key)
+            if data is not None:
+                return data
+            
+            url = self.FORECAST_URL.format(lat=coords["lat"], lon=coords["lon"])
+            response = await self.get_client().get(url)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            
+            self._cache[key] = (time.monotonic(), data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > WEATHER_CACHE_SIZE:
+                evicted, _ = self._cache.popitem(last=False)
+                self._locks.pop(evicted, None)
+            return data
+    
     def _get_weather_condition(self, code: int) -> str:
         """Convert WMO weather code to description"""
-        conditions = {
-            0: "Clear sky",
-            1: "Mainly clear",
-            2: "Partly cloudy",
-            3: "Overcast",
-            45: "Foggy",
-            48: "Depositing rime fog",
-            51: "Light drizzle",
-            53: "Moderate drizzle",
-            55: "Dense drizzle",
-            61: "Slight rain",
-            63: "Moderate rain",
-            65: "Heavy rain",
-            71: "Slight snow",
-            73: "Moderate snow",
-            75: "Heavy snow",
-            80: "Slight rain showers",
-            81: "Moderate rain showers",
-            82: "Violent rain showers",
-            95: "Thunderstorm",
-            96: "Thunderstorm with slight hail",
-            99: "Thunderstorm with heavy hail"
-        }
-        return conditions.get(code, "Unknown")
+        return WMO_CONDITIONS.get(code, "Unknown")
     
-    def _generate_agri_advisory(self, weather: Dict) -> list:
-        """Generate agricultural advisories based on weather"""
-        advisories = []
+    def _generate_agri_advisory(self, weather: Dict, total_rain_7days: float, language: str = "en") -> list:
+        """Generate agricultural advisories in language based on current weather and the 7-day rain total"""
         current = weather.get("current", {})
-        forecast = weather.get("forecast", [])
         
         temp = current.get("temperature_c", 25)
         humidity = current.get("humidity_percent", 60)
+        wind_speed = current.get("wind_speed_kmh", 0)
+        advisory_types = select_advisory_types(temp, humidity, wind_speed, total_rain_7days)
         
-        # Temperature advisories
-        if temp > 40:
-            advisories.append({
-                "type": "heat_stress",
-                "severity": "high",
-                "message_en": "Extreme heat alert! Avoid field work 11 AM - 4 PM. Irrigate in evening only.",
-                "message_hi": "अत्यधिक गर्मी की चेतावनी! सुबह 11 से शाम 4 बजे तक खेत में काम न करें। शाम को ही सिंचाई करें।",
-                "message_te": "తీవ్ర వేడి హెచ్చరిక! 11 AM - 4 PM మధ్య పొలం పనులు చేయకండి. సాయంత్రం మాత్రమే నీరు పెట్టండి."
-            })
-        elif temp > 35:
-            advisories.append({
-                "type": "heat_advisory",
-                "severity": "medium",
-                "message_en": "High temperature. Provide shade for nurseries. Mulch to conserve moisture.",
-                "message_hi": "उच्च तापमान। नर्सरी को छाया दें। पानी बचाने के लिए मल्चिंग करें।",
-                "message_te": "అధిక ఉష్ణోగ్రత. నర్సరీలకు నీడ ఇవ్వండి. తేమ కాపాడటానికి మల్చింగ్ చేయండి."
-            })
-        elif temp < 10:
-            advisories.append({
-                "type": "cold_advisory",
-                "severity": "medium",
-                "message_en": "Low temperature. Protect crops from frost. Irrigate in morning to reduce frost damage.",
-                "message_hi": "कम तापमान। फसलों को पाले से बचाएं। पाले के नुकसान को कम करने के लिए सुबह सिंचाई करें।",
-                "message_te": "తక్కువ ఉష్ణోగ్రత. పంటలను మంచు నుండి రక్షించండి. మంచు నష్టాన్ని తగ్గించడానికి ఉదయం నీరు పెట్టండి."
-            })
-        
-        # Rain forecast advisories
-        total_rain_7days = sum(f.get("precipitation_mm", 0) or 0 for f in forecast[:7])
+        # Unsupported languages fall back to English
+        if language not in LOCALIZED_ADVISORIES:
+            language = "en"
+        localized = LOCALIZED_ADVISORIES[language]
         
-        if total_rain_7days > 100:
-            advisories.append({
-                "type": "heavy_rain_warning",
-                "severity": "high",
-                "message_en": f"Heavy rainfall expected ({total_rain_7days:.0f}mm in 7 days). Ensure field drainage. Postpone fertilizer application.",
-                "message_hi": f"भारी बारिश की संभावना ({total_rain_7days:.0f}mm 7 दिनों में)। खेत में जल निकासी सुनिश्चित करें। उर्वरक डालने में देरी करें।",
-                "message_te": f"భారీ వర్షం అంచనా ({total_rain_7days:.0f}mm 7 రోజుల్లో). పొలంలో డ్రైనేజీ నిర్ధారించుకోండి. ఎరువులు వేయడం వాయిదా వేయండి."
-            })
-        elif total_rain_7days > 50:
-            advisories.append({
-                "type": "rain_expected",
-                "severity": "low",
-                "message_en": f"Good rainfall expected ({total_rain_7days:.0f}mm). Favorable for sowing. Complete land preparation.",
-                "message_hi": f"अच्छी बारिश की संभावना ({total_rain_7days:.0f}mm)। बुवाई के लिए अनुकूल। भूमि की तैयारी पूरी करें।",
-                "message_te": f"మంచి వర్షం అంచనా ({total_rain_7days:.0f}mm). విత్తనానికి అనుకూలం. భూమి సిద్ధం పూర్తి చేయండి."
-            })
-        elif total_rain_7days < 5:
-            advisories.append({
-                "type": "dry_spell",
-                "severity": "medium",
-                "message_en": "Dry spell expected. Plan irrigation. Watch for pest buildup in dry conditions.",
-                "message_hi": "सूखे की संभावना। सिंचाई की योजना बनाएं। सूखी परिस्थितियों में कीटों पर नजर रखें।",
-                "message_te": "పొడి వాతావరణం అంచనా. నీటిపారుదల ప్రణాళిక చేయండి. పొడి పరిస్థితుల్లో పురుగుల పెరుగుదలను గమనించండి."
-            })
-        
-        # Humidity advisories (disease risk)
-        if humidity > 85:
-            advisories.append({
-                "type": "disease_risk",
-                "severity": "medium",
-                "message_en": "High humidity increases disease risk. Apply preventive fungicide. Avoid overhead irrigation.",
-                "message_hi": "उच्च आर्द्रता से रोग का खतरा बढ़ता है। निवारक फफूंदनाशक लगाएं। ऊपरी सिंचाई से बचें।",
-                "message_te": "అధిక తేమ వల్ల వ్యాధుల ప్రమాదం పెరుగుతుంది. నివారణ శిలీంద్ర నాశిని చల్లండి. పై నుండి నీరు పెట్టడం మానండి."
-            })
-        
-        # Spray timing advisory
-        if current.get("wind_speed_kmh", 0) < 10:
-            advisories.append({
-                "type": "spray_favorable",
-                "severity": "info",
-                "message_en": "Low wind - favorable for pesticide/fertilizer spraying. Best time: early morning or late evening.",
-                "message_hi": "कम हवा - कीटनाशक/उर्वरक छिड़काव के लिए अनुकूल। सबसे अच्छा समय: सुबह जल्दी या शाम देर से।",
-                "message_te": "తక్కువ గాలి - పురుగుమందు/ఎరువుల పిచికారికి అనుకూలం. ఉత్తమ సమయం: పొద్దున్నే లేదా సాయంత్రం."
-            })
-        elif current.get("wind_speed_kmh", 0) > 20:
-            advisories.append({
-                "type": "spray_unfavorable",
-                "severity": "info",
-                "message_en": "High wind - avoid spraying pesticides/fertilizers. Risk of drift and wastage.",
-                "message_hi": "तेज हवा - कीटनाशक/उर्वरक छिड़काव न करें। बहाव और बर्बादी का खतरा।",
-                "message_te": "అధిక గాలి - పురుగుమందులు/ఎరువులు పిచికారీ చేయకండి. కొట్టుకుపోయే ప్రమాదం."
-            })
+        advisories = []
+        for advisory_type in advisory_types:
+            advisory = dict(localized[advisory_type])
+            if advisory_type in RAIN_ADVISORY_TYPES:
+                advisory["message"] = advisory["message"].format(rain_mm=total_rain_7days)
+            advisories.append(advisory)
         
         return advisories
     
     async def close(self):
         """Close the HTTP client"""
-        await self.client.aclose()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
 
 
 # Singleton instance
 weather_service = WeatherService()
 
 
-async def get_weather_advisory(location: str, language: str = "en") -> Dict[str, Any]:
-    """Get weather and agricultural advisory for a location"""
-    weather = await weather_service.get_weather(location)
-    
+def format_weather_advisory(weather: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shape weather from WeatherService.get_weather into the API response"""
     if not weather:
         return {
             "error": True,
             "message": "Could not fetch weather data for this location"
         }
     
-    # Format advisories in the requested language
-    lang_key = f"message_{language}"
-    formatted_advisories = []
-    
-    for advisory in weather.get("agricultural_advisory", []):
-        formatted_advisories.append({
-            "type": advisory["type"],
-            "severity": advisory["severity"],
-            "message": advisory.get(lang_key, advisory.get("message_en"))
-        })
-    
     return {
         "error": False,
         "location": weather["location"],
         "current": weather["current"],
         "forecast_7day": weather["forecast"],
-        "advisories": formatted_advisories,
+        "advisories": weather["agricultural_advisory"],
         "data_source": "Open-Meteo Weather API"
     }
+
+
+async def get_weather_advisory(location: str, language: str = "en") -> Dict[str, Any]:
+    """Get weather and agricultural advisory for a location"""
+    weather = await weather_service.get_weather(location, language)
+    return format_weather_advisory(weather)
+
+
+async def get_weather_advisories(locations: List[str], language: str = "en") -> List[Dict[str, Any]]:
+    """Get weather and agricultural advisories for several locations concurrently"""
+    weathers = await weather_service.get_weather_many(locations, language)
+    return [format_weather_advisory(weather) for weather in weathers]
@@ -4,19 +4,54 @@ Comprehensive Backend API Tests for Farmer Voice Assistant
 Tests all backend endpoints with multilingual support
 """
 
-import requests
+import asyncio
+import importlib.util
+import httpx
+import io
+import sys
 import json
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 # Use the production URL from frontend/.env
 BASE_URL = "https://agri-assist-36.preview.emergentagent.com/api"
 
+# Chat calls wait on the LLM, so allow well beyond httpx's 5 s default
+REQUEST_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+# HTTP/2 lets the concurrent tests share one connection; httpx needs the optional h2 package for it
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+class PredictionResponse(BaseModel):
+    """Shape test_ml_prediction expects from POST /api/predict, validated in one pass from raw JSON"""
+    model_config = ConfigDict(strict=True)
+    
+    predicted_yield: float = Field(gt=0)
+    confidence: float = Field(ge=0, le=1)
+    risk_level: Literal["Low", "Medium", "High"]
+    influential_factors: List[Any] = Field(min_length=1)
+    recommendations: List[Any] = Field(min_length=1)
+
+# Issue reported for each PredictionResponse field that fails validation
+PREDICTION_ISSUES = {
+    "predicted_yield": "Invalid predicted_yield",
+    "confidence": "Invalid confidence (should be 0-1)",
+    "risk_level": "Invalid risk_level",
+    "influential_factors": "Invalid influential_factors",
+    "recommendations": "Invalid recommendations"
+}
+
+def error_field(err: Dict[str, Any]) -> str:
+    """Top-level field a pydantic validation error refers to ("__root__" for whole-body errors)"""
+    return str(err["loc"][0]) if err["loc"] else "__root__"
+
 class FarmerAssistantTester:
     def __init__(self):
-        self.session = requests.Session()
+        self.client: Optional[httpx.AsyncClient] = None
         self.test_results = []
         self.session_ids = []
+        # Per-test log lines, written to stdout in one go before the summary
+        self._stdout_buf = io.StringIO()
         
     def log_test(self, test_name: str, success: bool, details: str, response_data: Any = None):
         """Log test results"""
@@ -25,18 +60,18 @@ class FarmerAssistantTester:
             "success": success,
             "details": details,
             "response_data": response_data,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": time.time()
         }
         self.test_results.append(result)
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {details}")
+        self._stdout_buf.write(f"{status} {test_name}: {details}\n")
         if response_data and not success:
-            print(f"   Response: {response_data}")
+            self._stdout_buf.write(f"   Response: {response_data}\n")
     
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self):
         """Test GET /api/ - Root endpoint"""
         try:
-            response = self.session.get(f"{BASE_URL}/")
+            response = await self.client.get(f"{BASE_URL}/")
             
             if response.status_code == 200:
                 data = response.json()
@@ -54,10 +89,10 @@ class FarmerAssistantTester:
             self.log_test("Root Endpoint", False, f"Request failed: {str(e)}")
             return False
     
-    def test_create_session(self, language: str = "en"):
+    async def test_create_session(self, language: str = "en"):
         """Test POST /api/session - Create new session"""
         try:
-            response = self.session.post(f"{BASE_URL}/session", params={"language": language})
+            response = await self.client.post(f"{BASE_URL}/session", params={"language": language})
             
             if response.status_code == 200:
                 data = response.json()
@@ -80,7 +115,7 @@ class FarmerAssistantTester:
             self.log_test(f"Create Session ({language})", False, f"Request failed: {str(e)}")
             return None
     
-    def test_chat_api(self, session_id: str, message: str, language: str, test_name: str):
+    async def test_chat_api(self, session_id: str, message: str, language: str, test_name: str):
         """Test POST /api/chat - Chat with AI assistant"""
         try:
             payload = {
@@ -89,7 +124,7 @@ class FarmerAssistantTester:
                 "language": language
             }
             
-            response = self.session.post(f"{BASE_URL}/chat", json=payload)
+            response = await self.client.post(f"{BASE_URL}/chat", json=payload)
             
             if response.status_code == 200:
                 data = response.json()
@@ -120,7 +155,7 @@ class FarmerAssistantTester:
             self.log_test(test_name, False, f"Request failed: {str(e)}")
             return False
     
-    def test_ml_prediction(self):
+    async def test_ml_prediction(self):
         """Test POST /api/predict - ML crop prediction"""
         try:
             payload = {
@@ -132,41 +167,31 @@ class FarmerAssistantTester:
                 "irrigation": True
             }
             
-            response = self.session.post(f"{BASE_URL}/predict", json=payload)
+            response = await self.client.post(f"{BASE_URL}/predict", json=payload)
             
             if response.status_code == 200:
-                data = response.json()
-                required_fields = ["predicted_yield", "confidence", "risk_level", "influential_factors", "recommendations"]
-                
-                if all(field in data for field in required_fields):
-                    # Validate data types and ranges
-                    issues = []
-                    
-                    if not isinstance(data["predicted_yield"], (int, float)) or data["predicted_yield"] <= 0:
-                        issues.append("Invalid predicted_yield")
-                    
-                    if not isinstance(data["confidence"], (int, float)) or not (0 <= data["confidence"] <= 1):
-                        issues.append("Invalid confidence (should be 0-1)")
-                    
-                    if data["risk_level"] not in ["Low", "Medium", "High"]:
-                        issues.append("Invalid risk_level")
-                    
-                    if not isinstance(data["influential_factors"], list) or len(data["influential_factors"]) == 0:
-                        issues.append("Invalid influential_factors")
-                    
-                    if not isinstance(data["recommendations"], list) or len(data["recommendations"]) == 0:
-                        issues.append("Invalid recommendations")
-                    
-                    if issues:
-                        self.log_test("ML Prediction", False, f"Data validation issues: {', '.join(issues)}", data)
-                        return False
+                try:
+                    prediction = PredictionResponse.model_validate_json(response.content)
+                except ValidationError as e:
+                    try:
+                        data = response.json()
+                    except ValueError:
+                        data = response.text[:500]
+                    errors = e.errors()
+                    missing = [error_field(err) for err in errors if err["type"] == "missing"]
+                    if missing:
+                        self.log_test("ML Prediction", False, f"Missing fields: {missing}", data)
                     else:
-                        self.log_test("ML Prediction", True, f"Yield: {data['predicted_yield']}, Confidence: {data['confidence']}, Risk: {data['risk_level']}", data)
-                        return True
-                else:
-                    missing = [f for f in required_fields if f not in data]
-                    self.log_test("ML Prediction", False, f"Missing fields: {missing}", data)
+                        # Validate data types and ranges
+                        issues = list(dict.fromkeys(
+                            PREDICTION_ISSUES.get(error_field(err), f"Invalid response: {err['msg']}")
+                            for err in errors
+                        ))
+                        self.log_test("ML Prediction", False, f"Data validation issues: {', '.join(issues)}", data)
                     return False
+                
+                self.log_test("ML Prediction", True, f"Yield: {prediction.predicted_yield}, Confidence: {prediction.confidence}, Risk: {prediction.risk_level}", prediction.model_dump())
+                return True
             else:
                 self.log_test("ML Prediction", False, f"HTTP {response.status_code}: {response.text}")
                 return False
@@ -175,10 +200,10 @@ class FarmerAssistantTester:
             self.log_test("ML Prediction", False, f"Request failed: {str(e)}")
             return False
     
-    def test_get_messages(self, session_id: str):
+    async def test_get_messages(self, session_id: str):
         """Test GET /api/messages/{session_id} - Get chat history"""
         try:
-            response = self.session.get(f"{BASE_URL}/messages/{session_id}")
+            response = await self.client.get(f"{BASE_URL}/messages/{session_id}")
             
             if response.status_code == 200:
                 data = response.json()
@@ -214,7 +239,7 @@ class FarmerAssistantTester:
             self.log_test("Get Messages", False, f"Request failed: {str(e)}")
             return False
     
-    def test_language_detection(self):
+    async def test_language_detection(self):
         """Test POST /api/detect-language - Language detection"""
         test_cases = [
             ("Hello, how are you?", "en"),
@@ -224,9 +249,16 @@ class FarmerAssistantTester:
         
         all_passed = True
         
-        for text, expected_lang in test_cases:
+        # Send every case at once, then check them in order
+        responses = await asyncio.gather(
+            *(self.client.post(f"{BASE_URL}/detect-language", params={"text": text}) for text, _ in test_cases),
+            return_exceptions=True
+        )
+        
+        for (text, expected_lang), response in zip(test_cases, responses):
             try:
-                response = self.session.post(f"{BASE_URL}/detect-language", params={"text": text})
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -251,39 +283,55 @@ class FarmerAssistantTester:
         
         return all_passed
     
-    def run_all_tests(self):
-        """Run comprehensive test suite"""
-        print("🚀 Starting Farmer Voice Assistant Backend API Tests")
-        print(f"🌐 Testing against: {BASE_URL}")
-        print("=" * 80)
-        
-        # Test 1: Root endpoint
-        self.test_root_endpoint()
-        
+    async def test_chat_flow(self):
+        """Create sessions, chat in each language, then read back the history"""
         # Test 2: Create sessions
-        session_en = self.test_create_session("en")
-        session_hi = self.test_create_session("hi") 
-        session_te = self.test_create_session("te")
+        session_en, session_hi, session_te = await asyncio.gather(
+            self.test_create_session("en"),
+            self.test_create_session("hi"),
+            self.test_create_session("te")
+        )
         
         # Test 3: Chat API with different languages
+        chats = []
         if session_en:
-            self.test_chat_api(session_en, "What crops grow in kharif season?", "en", "Chat API (English)")
+            chats.append(self.test_chat_api(session_en, "What crops grow in kharif season?", "en", "Chat API (English)"))
         
         if session_hi:
-            self.test_chat_api(session_hi, "मेरी फसल में पीले पत्ते हैं", "hi", "Chat API (Hindi)")
+            chats.append(self.test_chat_api(session_hi, "मेरी फसल में पीले पत्ते हैं", "hi", "Chat API (Hindi)"))
         
         if session_te:
-            self.test_chat_api(session_te, "నా పంట ఆకులు పసుపు", "te", "Chat API (Telugu)")
+            chats.append(self.test_chat_api(session_te, "నా పంట ఆకులు పసుపు", "te", "Chat API (Telugu)"))
         
-        # Test 4: ML Prediction
-        self.test_ml_prediction()
+        await asyncio.gather(*chats)
         
         # Test 5: Get messages (use first session if available)
-        if self.session_ids:
-            self.test_get_messages(self.session_ids[0])
+        first_session = session_en or session_hi or session_te
+        if first_session:
+            await self.test_get_messages(first_session)
+    
+    async def run_all_tests(self):
+        """Run comprehensive test suite"""
+        print("🚀 Starting Farmer Voice Assistant Backend API Tests")
+        print(f"🌐 Testing against: {BASE_URL}")
+        print("=" * 80)
+        
+        # Independent tests run concurrently; only the session -> chat -> messages chain is ordered
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, http2=HTTP2_AVAILABLE,
+                                     limits=httpx.Limits(max_connections=20)) as self.client:
+            await asyncio.gather(
+                # Test 1: Root endpoint
+                self.test_root_endpoint(),
+                # Tests 2, 3 and 5: Sessions, chat and message history
+                self.test_chat_flow(),
+                # Test 4: ML Prediction
+                self.test_ml_prediction(),
+                # Test 6: Language detection
+                self.test_language_detection()
+            )
         
-        # Test 6: Language detection
-        self.test_language_detection()
+        sys.stdout.write(self._stdout_buf.getvalue())
+        sys.stdout.flush()
         
         # Summary
         print("\n" + "=" * 80)
@@ -308,7 +356,7 @@ class FarmerAssistantTester:
 
 if __name__ == "__main__":
     tester = FarmerAssistantTester()
-    success = tester.run_all_tests()
+    success = asyncio.run(tester.run_all_tests())
     
     if success:
         print("\n🎉 All tests passed! Backend APIs are working correctly.")
@@ -0,0 +1,30 @@
+"""
+LLM context prompt: knowledge-base values are rendered as plain text, not container reprs
+"""
+
+import pytest
+
+server = pytest.importorskip('backend.server')
+
+FARM = {"crop_type": "rice", "location": "Ludhiana", "soil_type": "alluvial", "season": "kharif"}
+
+
+def test_context_renders_lists_and_ranges_as_text():
+    message, _ = server.build_context("When to sow?", FARM, "en")
+    crop = server.get_crop_info("rice")
+    state = server.get_state_info("punjab")
+
+    assert f"Optimal soil: {', '.join(crop['optimal_soil'])}," in message
+    assert f"Major pests: {', '.join(crop['major_pests'][:3])}," in message
+    assert f"Key tips: {'; '.join(server.get_crop_tips('rice')['tips'][:2])}" in message
+    assert f"Major crops: {', '.join(state['major_crops'][:5])}," in message
+    yield_range = crop['yield_range_kg_ha']
+    assert f"Yield range: {yield_range['min']}-{yield_range['max']} kg/ha (avg {yield_range['avg']})" in message
+    for container in ("('", "['", "{'", "mappingproxy"):
+        assert container not in message
+
+
+def test_prompt_helpers_handle_missing_values():
+    assert server.prompt_list(()) == 'n/a'
+    assert server.prompt_list(['a', 'b']) == server.prompt_list(('a', 'b')) == 'a, b'
+    assert server.prompt_range(None, 'mm') == 'n/a'
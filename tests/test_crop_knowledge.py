@@ -0,0 +1,201 @@
+"""
+Crop knowledge base: the indexed and vectorised queries against a brute-force scan of the raw JSON tables
+"""
+
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from backend import crop_knowledge as ck
+
+RAW_CROPS = json.loads((ck.DATA_DIR / 'crop_knowledge.json').read_text(encoding='utf-8'))
+RAW_STATES = json.loads((ck.DATA_DIR / 'state_agri_info.json').read_text(encoding='utf-8'))
+
+SEASONS = ["Kharif", "rabi", " ZAID ", "Annual", "winter"]
+SOILS = ["Loamy", "black", "Sandy loam", "CLAY", "Red ", "Light soils", "granite"]
+STATES = ["Punjab", "punjab", "ANDHRA PRADESH", " Tamil Nadu", "Bihar", "west bengal", "Atlantis"]
+CATEGORIES = ["Pulses", "oilseeds", "VEGETABLES", "Fruits"]
+PH_VALUES = sorted({float(v) for info in RAW_CROPS.values() for v in info['optimal_ph'].split('-')}
+                   | {4.0, 5.25, 6.75, 9.0})
+
+
+def ph_range(info):
+    low, high = info['optimal_ph'].split('-')
+    return float(low), float(high)
+
+
+def listed(value, values):
+    return value.lower().strip() in {v.lower() for v in values}
+
+
+def brute_state_crops(state):
+    """Crops with the state among top_states, or among the state's own major crops"""
+    key = state.lower().strip()
+    crops = {crop for crop, info in RAW_CROPS.items() if listed(key, info['top_states'])}
+    for name, info in RAW_STATES.items():
+        if name.lower() == key:
+            crops |= {ck.resolve_crop(c) for c in info['major_crops']} - {None}
+    return crops
+
+
+def brute_filter(season=None, soil=None, ph=None, state=None, category=None):
+    crops = []
+    for crop, info in RAW_CROPS.items():
+        if season and not listed(season, info['optimal_season']):
+            continue
+        if soil and not listed(soil, info['optimal_soil']):
+            continue
+        if ph is not None and not ph_range(info)[0] <= ph <= ph_range(info)[1]:
+            continue
+        if state and crop not in brute_state_crops(state):
+            continue
+        if category and category.lower().strip() != info.get('category', '').lower():
+            continue
+        crops.append(crop)
+    return crops
+
+
+def brute_score(info, soil, season, ph):
+    if not listed(season, info['optimal_season']):
+        return 0.0
+    low, high = ph_range(info)
+    ph_score = max(0.0, 1.0 - max(low - ph, ph - high, 0.0))
+    return (1.0 if listed(soil, info['optimal_soil']) else 0.5) * ph_score
+
+
+def bucket_ph(bucket):
+    return ck.PH_BUCKET_MIN + ck.PH_BUCKET_WIDTH * bucket
+
+
+@pytest.mark.parametrize('season, soil', list(itertools.product([None] + SEASONS, [None] + SOILS)))
+def test_filter_crops_by_season_and_soil_matches_brute_force(season, soil):
+    known = {s.lower() for s in ck.SEASONS}, {s.lower() for info in RAW_CROPS.values() for s in info['optimal_soil']}
+    if (season and season.lower().strip() not in known[0]) or (soil and soil.lower().strip() not in known[1]):
+        assert ck.filter_crops(season=season, soil=soil) == ()
+        return
+    assert list(ck.filter_crops(season=season, soil=soil)) == brute_filter(season=season, soil=soil)
+
+
+@pytest.mark.parametrize('ph', PH_VALUES)
+def test_filter_crops_by_ph_matches_brute_force(ph):
+    assert list(ck.filter_crops(ph=ph)) == brute_filter(ph=ph)
+
+
+@pytest.mark.parametrize('state', STATES)
+def test_filter_crops_by_state_matches_brute_force(state):
+    assert set(ck.crops_by_state(state)) == brute_state_crops(state)
+    assert list(ck.filter_crops(state=state)) == brute_filter(state=state)
+    assert list(ck.filter_crops(season="Kharif", state=state)) == brute_filter(season="Kharif", state=state)
+
+
+@pytest.mark.parametrize('category', CATEGORIES)
+def test_filter_crops_by_category_matches_brute_force(category):
+    if category.lower() not in {c.lower() for c in ck.CATEGORIES}:
+        assert ck.filter_crops(category=category) == ()
+        return
+    assert list(ck.filter_crops(category=category)) == brute_filter(category=category)
+
+
+@pytest.mark.parametrize('kind, field', ck._INDEXED_FIELDS.items())
+def test_crop_indexes_match_brute_force(kind, field):
+    index = ck._crop_indexes()[kind]
+    values = {v for info in RAW_CROPS.values() for v in np.atleast_1d(info.get(field, [])).tolist()}
+    if kind == 'state':
+        values |= set(RAW_STATES)
+    for value in values:
+        if kind == 'state':
+            expected = brute_state_crops(value)
+        else:
+            expected = {crop for crop, info in RAW_CROPS.items()
+                        if listed(value, np.atleast_1d(info.get(field, [])).tolist())}
+        assert index[value.lower()] == expected, value
+        assert ck.crops_with(kind, value.upper()) == expected
+    assert all(key == key.lower() for key in index)
+
+
+def test_mixed_case_state_keys_are_indexed_lower_cased(monkeypatch):
+    states = {"Punjab": {"major_crops": ["Wheat", "Moong"]}, "TAMIL NADU": {"major_crops": ["Rice"]}}
+    monkeypatch.setattr(ck, '_load_state_agri_info', lambda: states)
+    ck._crop_indexes.cache_clear()
+    try:
+        assert {"wheat", "moong"} <= ck.crops_by_state("punjab")
+        assert "rice" in ck.crops_by_state("Tamil Nadu")
+        assert all(key == key.lower() for key in ck._crop_indexes()['state'])
+    finally:
+        ck._crop_indexes.cache_clear()
+
+
+def test_suitability_scores_match_brute_force():
+    scores = ck.suitability_scores()
+    cols = ck.crop_columns()
+    assert list(cols.names) == list(RAW_CROPS)
+    for c, info in enumerate(RAW_CROPS.values()):
+        for s, soil in enumerate(cols.soils):
+            for t, season in enumerate(ck.SEASONS):
+                expected = [brute_score(info, soil, season, bucket_ph(b)) for b in range(ck.PH_BUCKETS)]
+                np.testing.assert_allclose(scores[c, s, t], expected, atol=1e-6)
+
+
+@pytest.mark.parametrize('soil, season, ph, rainfall_mm', [
+    ("Loamy", "Kharif", None, None),
+    ("black", "RABI", 6.0, None),
+    ("Alluvial", "Zaid", 7.3, 600.0),
+    ("Red", "kharif", 5.0, 1200.0),
+    ("Sandy", "Annual", None, 3000.0),
+])
+def test_recommend_crops_matches_brute_force(soil, season, ph, rainfall_mm):
+    buckets = range(ck.PH_BUCKETS) if ph is None else [ck._ph_bucket(ph)]
+    expected = []
+    for crop, info in RAW_CROPS.items():
+        score = max(brute_score(info, soil, season, bucket_ph(b)) for b in buckets)
+        if rainfall_mm is not None:
+            score *= max(0.0, 1.0 - abs(info['water_requirement_mm'] - rainfall_mm) / ck.RAINFALL_TOLERANCE_MM)
+        expected.append((crop, score))
+
+    ranked = ck.recommend_crops(soil, season, ph=ph, top_k=len(RAW_CROPS), rainfall_mm=rainfall_mm)
+    assert {crop for crop, _ in ranked} == {crop for crop, score in expected if score > 1e-6}
+    expected_scores = dict(expected)
+    for crop, score in ranked:
+        assert score == pytest.approx(expected_scores[crop], abs=1e-5)
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+    assert ck.recommend_crops(soil, season, ph=ph, top_k=3, rainfall_mm=rainfall_mm) == ranked[:3]
+
+
+def test_recommend_crops_unknown_soil_or_season():
+    assert ck.recommend_crops("granite", "Kharif") == []
+    assert ck.recommend_crops("Loamy", "winter") == []
+
+
+def test_thaw_inverts_freeze():
+    data = {"a": [1, 2.5, {"b": ["x" * 40, None, True]}], "c": {}, "d": [], "e": "short"}
+    assert ck.thaw(ck._freeze(data)) == data
+    for name in ('crop_knowledge', 'state_agri_info', 'pest_disease_control', 'govt_schemes', 'crop_tips'):
+        raw = json.loads((ck.DATA_DIR / f'{name}.json').read_text(encoding='utf-8'))
+        assert ck.thaw(ck._freeze(raw)) == raw
+
+
+def test_json_snapshot_is_invalidated_when_data_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(ck, 'CACHE_DIR', tmp_path / 'cache')
+    path = tmp_path / 'table.json'
+    path.write_text(json.dumps({"rice": {"seasons": ["Kharif"]}}))
+
+    first = ck._load_json_snapshot(path)
+    snapshots = list((tmp_path / 'cache').glob('table_*.marshal'))
+    assert len(snapshots) == 1
+    assert ck.thaw(ck._load_json_snapshot(path)) == ck.thaw(first) == {"rice": {"seasons": ["Kharif"]}}
+
+    path.write_text(json.dumps({"rice": {"seasons": ["Rabi"]}}))
+    assert ck.thaw(ck._load_json_snapshot(path)) == {"rice": {"seasons": ["Rabi"]}}
+    assert len(list((tmp_path / 'cache').glob('table_*.marshal'))) == 2
+
+
+def test_corrupt_snapshot_falls_back_to_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(ck, 'CACHE_DIR', tmp_path / 'cache')
+    path = tmp_path / 'table.json'
+    path.write_text(json.dumps({"wheat": [1, 2]}))
+    ck._load_json_snapshot(path)
+    snapshot, = (tmp_path / 'cache').glob('table_*.marshal')
+    snapshot.write_bytes(b'\x00garbage')
+    assert ck.thaw(ck._load_json_snapshot(path)) == {"wheat": [1, 2]}
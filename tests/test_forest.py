@@ -0,0 +1,138 @@
+"""
+Parity tests for the numpy forest walk against scikit-learn's own predict()
+"""
+
+import random
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+
+from backend.model_artifacts import (
+    file_digest, flatten_forest, forest_predict, load_forest, save_forest
+)
+
+# The model was fitted on a DataFrame; plain arrays are fine for prediction
+pytestmark = pytest.mark.filterwarnings('ignore:X does not have valid feature names')
+
+MODEL_PATH = Path(__file__).parent.parent / 'backend' / 'models' / 'yield_model.pkl'
+
+
+@pytest.fixture(scope='module')
+def model():
+    return joblib.load(MODEL_PATH)
+
+
+@pytest.fixture(scope='module')
+def forest(model):
+    return flatten_forest(model)
+
+
+def random_rows(n: int, seed: int = 0) -> np.ndarray:
+    """Rows spanning the encoded categories and the numeric feature ranges"""
+    rng = np.random.default_rng(seed)
+    rows = np.empty((n, 9), dtype=np.float32)
+    rows[:, :5] = rng.integers(0, 40, size=(n, 5))
+    rows[:, 5] = rng.uniform(0, 3500, n)
+    rows[:, 6] = rng.uniform(0, 100, n)
+    rows[:, 7] = rng.uniform(0, 400, n)
+    rows[:, 8] = rng.uniform(5, 45, n)
+    return rows
+
+
+def threshold_rows(model, n: int, seed: int = 1) -> np.ndarray:
+    """Rows whose split feature sits exactly on, just below or just above a split threshold"""
+    rng = np.random.default_rng(seed)
+    base = random_rows(n, seed)
+    rows = []
+    for row in base:
+        tree = model.estimators_[rng.integers(len(model.estimators_))].tree_
+        splits = np.flatnonzero(tree.children_left != -1)
+        node = rng.choice(splits)
+        at = np.float32(tree.threshold[node])
+        for value in (at, np.nextafter(at, np.float32(-np.inf)), np.nextafter(at, np.float32(np.inf))):
+            edge = row.copy()
+            edge[tree.feature[node]] = value
+            rows.append(edge)
+    return np.array(rows, dtype=np.float32)
+
+
+def test_random_rows_match_sklearn(model, forest):
+    X = random_rows(500)
+    np.testing.assert_array_equal(forest_predict(forest, X), model.predict(X))
+
+
+def test_single_rows_match_sklearn(model, forest):
+    for row in random_rows(20, seed=2):
+        X = row[None, :]
+        np.testing.assert_array_equal(forest_predict(forest, X), model.predict(X))
+
+
+def test_threshold_values_match_sklearn(model, forest):
+    X = threshold_rows(model, 300)
+    np.testing.assert_array_equal(forest_predict(forest, X), model.predict(X))
+
+
+@pytest.mark.parametrize('column', range(9))
+def test_nan_inputs_follow_sklearn_missing_value_routing(model, forest, column):
+    X = random_rows(50, seed=3)
+    X[::2, column] = np.nan
+    np.testing.assert_array_equal(forest_predict(forest, X), model.predict(X))
+
+
+@pytest.mark.parametrize('value', [np.inf, -np.inf])
+def test_infinite_inputs_are_rejected_like_sklearn(model, forest, value):
+    X = random_rows(3, seed=4)
+    X[1, 5] = value
+    with pytest.raises(ValueError):
+        model.predict(X)
+    with pytest.raises(ValueError):
+        forest_predict(forest, X)
+
+
+def test_saved_forest_round_trips(model, forest, tmp_path):
+    digest = file_digest(MODEL_PATH)
+    save_forest(forest, tmp_path, digest)
+    loaded = load_forest(tmp_path, digest)
+    assert loaded is not None and loaded.depth == forest.depth
+    X = random_rows(100, seed=5)
+    np.testing.assert_array_equal(forest_predict(loaded, X), model.predict(X))
+
+
+def test_stale_or_missing_forest_is_not_loaded(forest, tmp_path):
+    assert load_forest(tmp_path, 'digest') is None
+    save_forest(forest, tmp_path, 'old-digest')
+    assert load_forest(tmp_path, 'new-digest') is None
+
+
+def test_committed_forest_matches_committed_model(model):
+    forest = load_forest(MODEL_PATH.parent / 'forest', file_digest(MODEL_PATH))
+    assert forest is not None, "run python -m backend.train_model to refresh models/forest"
+    X = random_rows(200, seed=6)
+    np.testing.assert_array_equal(forest_predict(forest, X), model.predict(X))
+
+
+def test_batch_predictions_agree_across_forest_and_sklearn_paths():
+    server = pytest.importorskip('backend.server')
+    if not server.ML_MODEL_LOADED:
+        pytest.skip("ML model not loaded")
+    rng = random.Random(3)
+    farm_inputs = [
+        server.FarmInput(
+            crop_type=rng.choice(["rice", "wheat", "maize", "cotton", "chickpea", "bajra"]),
+            soil_type=rng.choice(["alluvial", "black", "red", "loamy"]),
+            season=rng.choice(["kharif", "rabi"]),
+            location=rng.choice(["Punjab", "Ludhiana", "Maharashtra", "Guntur"]),
+            rainfall_mm=rng.randint(200, 2000),
+            irrigation_percent=rng.randint(0, 100),
+            fertilizer_kg_ha=rng.randint(0, 300)
+        )
+        for _ in range(server.FOREST_BATCH_ROWS + 44)
+    ]
+    # One call over the limit goes to sklearn, the chunks at or under it to the forest walk
+    whole = server.predict_yield_batch(farm_inputs)
+    split = server.FOREST_BATCH_ROWS
+    chunked = server.predict_yield_batch(farm_inputs[:split]) + server.predict_yield_batch(farm_inputs[split:])
+    assert [p.model_dump() for p in whole] == [p.model_dump() for p in chunked]
+    assert [p.model_dump() for p in whole[:10]] == [server.predict_yield_ml(f).model_dump() for f in farm_inputs[:10]]
@@ -0,0 +1,101 @@
+"""
+Equivalence tests for script_language / detect_language against the original per-character rules
+"""
+
+import random
+import re
+
+import pytest
+
+server = pytest.importorskip('backend.server')
+
+HINDI_WORDS = ['kya', 'hai', 'mera', 'meri', 'kaise', 'karo', 'karna', 'fasal', 'kheti', 'pani', 'baarish']
+
+
+def reference_script(text: str):
+    """The original per-character counting, kept verbatim as the oracle"""
+    telugu_chars = sum(1 for c in text if '\u0C00' <= c <= '\u0C7F')
+    hindi_chars = sum(1 for c in text if '\u0900' <= c <= '\u097F')
+    total = len(text)
+    if total == 0:
+        return None
+    if telugu_chars / total > 0.15:
+        return "te"
+    elif hindi_chars / total > 0.15:
+        return "hi"
+    return None
+
+
+def reference_detect(text: str) -> str:
+    """Original rules; Roman-script Hindi words match whole words since chunk2-2"""
+    language = reference_script(text)
+    if language:
+        return language
+    lowered = text.lower()
+    if any(re.search(rf'\b{word}\b', lowered) for word in HINDI_WORDS):
+        return "hi"
+    return "en"
+
+
+DEVANAGARI = "मेरी फसल में कीड़े लग गए हैं क्या करूं"
+TELUGU = "నా పంటకు ఏ ఎరువు వేయాలి"
+TAMIL = "என் பயிருக்கு எந்த உரம் போட வேண்டும்"
+KANNADA = "ನನ್ನ ಬೆಳೆಗೆ ಯಾವ ಗೊಬ್ಬರ ಹಾಕಬೇಕು"
+
+CASES = [
+    "",
+    "What fertilizer should I use for rice?",
+    "mera fasal kharab ho gaya",
+    "Is my kheti plan ok",
+    "chair and khaki",
+    DEVANAGARI,
+    TELUGU,
+    TAMIL,
+    KANNADA,
+    TAMIL + " kya karu",
+    TELUGU + " " + DEVANAGARI,
+    DEVANAGARI + " " + TELUGU[:5],
+    "rice " + DEVANAGARI[:3],
+    # Exactly 15% Devanagari is not enough; one more character tips it
+    "क" * 3 + "a" * 17,
+    "क" * 4 + "a" * 16,
+    "త" * 3 + "a" * 17,
+    "త" * 4 + "a" * 16,
+    # Telugu wins over Devanagari whenever both clear the threshold
+    "क" * 10 + "త" * 4 + "a" * 6,
+    "Crop 🌾 help",
+    "📈" + DEVANAGARI,
+]
+
+
+@pytest.mark.parametrize('text', CASES)
+def test_short_text_matches_reference(text):
+    assert server.script_language(text) == reference_script(text)
+    assert server.detect_language(text) == reference_detect(text)
+
+
+@pytest.mark.parametrize('text', [case for case in CASES if case])
+def test_long_text_matches_reference(text):
+    # Repeating past DETECT_CACHE_CHARS takes the uncached path and the vectorised scan
+    long_text = (text + " ") * (server.DETECT_CACHE_CHARS // (len(text) + 1) + 1)
+    assert len(long_text) > server.DETECT_CACHE_CHARS
+    assert server.script_language(long_text) == reference_script(long_text)
+    assert server.detect_language(long_text) == reference_detect(long_text)
+
+
+def test_random_mixed_text_matches_reference():
+    rng = random.Random(7)
+    alphabet = "abcdefghij kya " + DEVANAGARI + TELUGU + TAMIL + KANNADA + "🌾"
+    for _ in range(500):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 400)))
+        assert server.script_language(text) == reference_script(text), text
+        assert server.detect_language(text) == reference_detect(text), text
+
+
+def test_repeated_text_is_served_from_cache():
+    server._detect_language_cached.cache_clear()
+    server.detect_language(TELUGU)
+    server.detect_language(TELUGU)
+    assert server._detect_language_cached.cache_info().hits == 1
+    server.detect_language("a" * (server.DETECT_CACHE_CHARS + 1))
+    assert server._detect_language_cached.cache_info().currsize == 1
@@ -0,0 +1,171 @@
+"""
+LLM client retries and streaming, driven through httpx.MockTransport
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from backend.emergentintegrations.llm import chat
+
+
+def reply(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of waiting them out"""
+    delays = []
+
+    async def fake_sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr(chat.asyncio, 'sleep', fake_sleep)
+    return delays
+
+
+def post_with(monkeypatch, outcomes):
+    """Run LlmChat._post against a transport that returns (or raises) each outcome in turn"""
+    calls = []
+
+    def handler(request):
+        outcome = outcomes[len(calls)]
+        calls.append(request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(chat, '_http_client', client)
+        try:
+            response = await chat.LlmChat("sk-test", "session", "system")._post(b'{}')
+            await response.aread()
+            return response
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run()), calls
+
+
+def test_rate_limit_then_success(monkeypatch, sleeps):
+    response, calls = post_with(monkeypatch, [httpx.Response(429, headers={"Retry-After": "2"}), reply("ok")])
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert sleeps == [2.0]
+
+
+def test_transport_error_then_success(monkeypatch, sleeps):
+    response, calls = post_with(monkeypatch, [httpx.ConnectError("refused"), reply("ok")])
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert len(sleeps) == 1 and 1.0 <= sleeps[0] <= 1.25
+
+
+def test_exhausted_retries_return_final_server_error(monkeypatch, sleeps):
+    outcomes = [httpx.Response(503, text=f"busy {i}") for i in range(chat.MAX_ATTEMPTS)]
+    response, calls = post_with(monkeypatch, outcomes)
+    assert response.status_code == 503
+    assert response.text == f"busy {chat.MAX_ATTEMPTS - 1}"
+    assert len(calls) == chat.MAX_ATTEMPTS
+    # No sleep after the last attempt
+    assert len(sleeps) == chat.MAX_ATTEMPTS - 1
+
+
+def test_transport_error_on_last_attempt_is_raised(monkeypatch, sleeps):
+    outcomes = [httpx.Response(502)] * (chat.MAX_ATTEMPTS - 1) + [httpx.ReadTimeout("slow")]
+    with pytest.raises(httpx.ReadTimeout):
+        post_with(monkeypatch, outcomes)
+    assert len(sleeps) == chat.MAX_ATTEMPTS - 1
+
+
+def test_client_errors_are_not_retried(monkeypatch, sleeps):
+    response, calls = post_with(monkeypatch, [httpx.Response(401), reply("unused")])
+    assert response.status_code == 401
+    assert len(calls) == 1 and sleeps == []
+
+
+@pytest.mark.parametrize('header, expected', [
+    ("0", 0.0),
+    ("7", 7.0),
+    ("1.5", 1.5),
+    ("3600", chat.MAX_RETRY_AFTER),
+    ("-5", 0.0),
+])
+def test_retry_after_seconds(header, expected):
+    assert chat._retry_delay(0, httpx.Response(429, headers={"Retry-After": header})) == expected
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=10)
+    delay = chat._retry_delay(0, httpx.Response(503, headers={"Retry-After": format_datetime(when, usegmt=True)}))
+    assert 8.0 <= delay <= 10.0
+
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert chat._retry_delay(0, httpx.Response(503, headers={"Retry-After": format_datetime(past, usegmt=True)})) == 0.0
+
+    far = datetime.now(timezone.utc) + timedelta(hours=1)
+    assert chat._retry_delay(0, httpx.Response(503, headers={"Retry-After": format_datetime(far, usegmt=True)})) == chat.MAX_RETRY_AFTER
+
+
+@pytest.mark.parametrize('attempt', range(chat.MAX_ATTEMPTS))
+def test_backoff_without_usable_retry_after(attempt):
+    base = min(2 ** attempt, 8)
+    for response in (None, httpx.Response(503), httpx.Response(503, headers={"Retry-After": "soon"})):
+        assert base <= chat._retry_delay(attempt, response) <= base + 0.25
+
+
+def sse(*deltas: str) -> httpx.Response:
+    lines = [b'data: ' + chat.orjson.dumps({"choices": [{"delta": {"content": d}}]}) for d in deltas]
+    return httpx.Response(200, content=b'\n\n'.join(lines + [b'data: [DONE]']) + b'\n\n')
+
+
+def stream_reply(monkeypatch, response: httpx.Response):
+    """Send one message against a transport that answers with response; returns (reply, chat)"""
+    llm = chat.LlmChat("sk-test", "session", "system")
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: response))
+        monkeypatch.setattr(chat, '_http_client', client)
+        try:
+            return await llm.send_message(chat.UserMessage("When to sow rice?"))
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run()), llm
+
+
+def test_malformed_stream_event_is_skipped(monkeypatch):
+    good = sse("Sow ", "in June")
+    lines = good.content.split(b'\n\n')
+    body = b'\n\n'.join([lines[0], b'data: {"choices": [', lines[1], *lines[2:]])
+    text, llm = stream_reply(monkeypatch, httpx.Response(200, content=body))
+    assert text == "Sow in June"
+    assert llm.history[-1] == {"role": "assistant", "content": "Sow in June"}
+
+
+def test_interrupted_stream_keeps_partial_reply(monkeypatch):
+    async def body():
+        yield b'data: ' + chat.orjson.dumps({"choices": [{"delta": {"content": "Sow in "}}]}) + b'\n\n'
+        raise httpx.ReadError("connection reset")
+
+    text, llm = stream_reply(monkeypatch, httpx.Response(200, content=body()))
+    assert text == "Sow in "
+    assert llm.history[-2:] == [
+        {"role": "user", "content": "When to sow rice?"},
+        {"role": "assistant", "content": "Sow in "},
+    ]
+
+
+def test_failure_before_any_reply_reports_error(monkeypatch):
+    async def body():
+        raise httpx.ReadError("connection reset")
+        yield b''
+
+    text, llm = stream_reply(monkeypatch, httpx.Response(200, content=body()))
+    assert text.startswith("Sorry, I am having trouble connecting to the server.")
+    assert llm.history == [llm._system_turn]
@@ -0,0 +1,108 @@
+"""
+Location resolution: regex lookups against the original in-order table scans
+"""
+
+import itertools
+import random
+
+import pytest
+
+from backend import weather_service as ws
+from backend.name_scan import NameScan
+
+server = pytest.importorskip('backend.server')
+
+
+def reference_state(location):
+    """The original get_state_from_location: districts in table order, then states"""
+    location_lower = location.lower()
+    for district, state in server.DISTRICT_STATE_MAP.items():
+        if district in location_lower:
+            return state
+    for state in server.STATE_AGRI_INFO:
+        if state in location_lower:
+            return state
+    return location_lower
+
+
+def reference_coordinates(location):
+    """The original WeatherService.get_coordinates: districts in table order, then states"""
+    location_lower = location.lower().strip()
+    for district, coords in ws.DISTRICT_COORDS.items():
+        if district in location_lower:
+            return coords
+    for state, data in ws.INDIA_LOCATIONS.items():
+        if state in location_lower:
+            return {"lat": data["lat"], "lon": data["lon"]}
+    return None
+
+
+NAMES = ["Maharashtra", "Nizamabad", "Punjab", "Guntur", "Tamil Nadu", "Pune", "Krishna", "Uttar Pradesh",
+         "Agra", "Telangana", "Warangal", "Andhra Pradesh", "Karnal", "Kolkata", "Mars"]
+LOCATIONS = [
+    "Maharashtra farmer near Nizamabad",
+    "Nizamabad, Telangana",
+    "Punjab border, Amritsar district",
+    "Krishna district near Guntur",
+    "Guntur near Krishna",
+    "village in Tamil Nadu and Karnataka",
+    "Punjab and Telangana",
+    "  LUDHIANA  ",
+    "Agra",
+    "",
+    "Atlantis",
+] + [f"{a} near {b}" for a, b in itertools.permutations(NAMES[:10], 2)]
+
+
+def overlapping(names):
+    """Texts where one name's tail is the next name's head, e.g. bhopal + lucknow -> bhopalucknow"""
+    texts = []
+    for a, b in itertools.permutations(names, 2):
+        for k in range(1, min(len(a), len(b))):
+            if a[-k:] == b[:k]:
+                texts.append(a + b[k:])
+    return texts
+
+
+SERVER_NAMES = list(server.DISTRICT_STATE_MAP) + list(server.STATE_AGRI_INFO)
+WEATHER_NAMES = list(ws.DISTRICT_COORDS) + list(ws.INDIA_LOCATIONS)
+SERVER_OVERLAPS = ["bhopalucknow", "nashikrishna"] + overlapping(SERVER_NAMES)
+WEATHER_OVERLAPS = ["mysoreast godavari", "patialamritsar"] + overlapping(WEATHER_NAMES)
+
+
+def test_name_scan_matches_in_order_scan():
+    names = ["abc", "ab", "bcd", "cd", "b", "xyz"]
+    scan = NameScan(names)
+    rng = random.Random(5)
+    for _ in range(2000):
+        text = ''.join(rng.choice("abcdxyz ") for _ in range(rng.randint(0, 12)))
+        assert scan.first(text) == next((name for name in names if name in text), None), text
+
+
+def test_district_beats_earlier_state_name():
+    assert server.get_state_from_location("Maharashtra farmer near Nizamabad") == "telangana"
+    coords = ws.WeatherService().get_coordinates("Maharashtra farmer near Nizamabad")
+    assert dict(coords) == dict(ws.DISTRICT_COORDS["nizamabad"])
+
+
+@pytest.mark.parametrize('location', LOCATIONS)
+def test_state_from_location_matches_reference(location):
+    assert server.get_state_from_location(location) == reference_state(location)
+
+
+@pytest.mark.parametrize('location', LOCATIONS)
+def test_weather_coordinates_match_reference(location):
+    coords = ws.WeatherService().get_coordinates(location)
+    expected = reference_coordinates(location)
+    assert (dict(coords) if coords is not None else None) == expected
+
+
+@pytest.mark.parametrize('location', SERVER_OVERLAPS)
+def test_state_from_overlapping_names_matches_reference(location):
+    assert server.get_state_from_location(location) == reference_state(location)
+
+
+@pytest.mark.parametrize('location', WEATHER_OVERLAPS)
+def test_weather_coordinates_for_overlapping_names_match_reference(location):
+    coords = ws.WeatherService().get_coordinates(location)
+    assert (dict(coords) if coords is not None else None) == reference_coordinates(location)
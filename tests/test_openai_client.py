@@ -0,0 +1,36 @@
+"""
+OpenAI media requests: the concurrency limit is bound to the running event loop
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+server = pytest.importorskip('backend.server')
+
+
+def test_post_openai_works_across_event_loops(monkeypatch):
+    async def post_twice():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        monkeypatch.setattr(server, 'get_http_client', lambda: client)
+        try:
+            responses = await asyncio.gather(*(server.post_openai("audio/transcriptions") for _ in range(2)))
+            return [r.status_code for r in responses], server.get_openai_media_slots()
+        finally:
+            await client.aclose()
+
+    # Each asyncio.run is a new loop; a semaphore left over from the last one must not be reused
+    first_codes, first_slots = asyncio.run(post_twice())
+    second_codes, second_slots = asyncio.run(post_twice())
+    assert first_codes == second_codes == [200, 200]
+    assert first_slots is not second_slots
+
+
+def test_slots_are_created_on_first_use():
+    async def get_twice():
+        return server.get_openai_media_slots(), server.get_openai_media_slots()
+
+    first, again = asyncio.run(get_twice())
+    assert first is again
+    assert first._value == server.OPENAI_MEDIA_CONCURRENCY
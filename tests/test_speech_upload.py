@@ -0,0 +1,104 @@
+"""
+Speech-to-text upload: the multipart body streamed to Whisper from the spooled audio file
+"""
+
+import asyncio
+import os
+import threading
+from email import message_from_bytes
+from email.policy import HTTP
+from tempfile import SpooledTemporaryFile
+
+import httpx
+import pytest
+from starlette.datastructures import UploadFile
+
+server = pytest.importorskip('backend.server')
+
+PROMPT = 'फसल, వరి'
+
+
+def spooled_upload(data: bytes, max_size: int) -> UploadFile:
+    spooled = SpooledTemporaryFile(max_size=max_size)
+    spooled.write(data)
+    return UploadFile(spooled, size=len(data), filename='voice.m4a')
+
+
+class ReadThreads:
+    """File wrapper recording which threads read from it"""
+
+    def __init__(self, file):
+        self._file = file
+        self.threads = set()
+
+    def read(self, size=-1):
+        self.threads.add(threading.get_ident())
+        return self._file.read(size)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def parse_form(content_type: str, body: bytes) -> dict:
+    """Decode a multipart/form-data body into {field name: payload bytes}"""
+    message = message_from_bytes(f'Content-Type: {content_type}\r\n\r\n'.encode() + body, policy=HTTP)
+    return {part.get_param('name', header='content-disposition'): part.get_payload(decode=True)
+            for part in message.iter_parts()}
+
+
+async def collect(body) -> bytes:
+    return b''.join([chunk async for chunk in body])
+
+
+@pytest.mark.parametrize('max_size', [1 << 20, 1024])
+def test_multipart_upload_streams_the_whole_file(max_size):
+    audio = os.urandom(3 * server.UPLOAD_CHUNK_BYTES + 17)
+    upload = spooled_upload(audio, max_size)
+    # Rolled over to disk when larger than max_size
+    assert upload._in_memory == (max_size > len(audio))
+
+    headers, body = server.multipart_upload(upload, 'audio.m4a', 'audio/m4a',
+                                            {'model': 'whisper-1', 'prompt': PROMPT})
+    content = asyncio.run(collect(body))
+    assert int(headers['Content-Length']) == len(content)
+    form = parse_form(headers['Content-Type'], content)
+    assert form == {'model': b'whisper-1', 'prompt': PROMPT.encode(), 'file': audio}
+
+
+def test_multipart_upload_reads_disk_files_off_the_event_loop():
+    upload = spooled_upload(os.urandom(server.UPLOAD_CHUNK_BYTES * 2), 1024)
+    upload.file = reader = ReadThreads(upload.file)
+    _, body = server.multipart_upload(upload, 'audio.m4a', 'audio/m4a', {'model': 'whisper-1'})
+    asyncio.run(collect(body))
+    assert reader.threads and threading.get_ident() not in reader.threads
+
+
+def test_speech_to_text_posts_streamed_form(monkeypatch):
+    audio = os.urandom(100_000)
+    requests = []
+
+    async def handler(request):
+        requests.append((request, await request.aread()))
+        return httpx.Response(200, json={"text": "mera fasal kharab ho gaya"})
+
+    async def run():
+        whisper = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(server, 'get_http_client', lambda: whisper)
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app),
+                                         base_url='http://testserver') as client:
+                return await client.post('/api/speech-to-text', params={'language': 'hi'},
+                                         files={'file': ('voice.m4a', audio, 'audio/m4a')})
+        finally:
+            await whisper.aclose()
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert response.json()['detected_language'] == 'hi'
+
+    request, content = requests[0]
+    assert request.url.path == '/v1/audio/transcriptions'
+    assert int(request.headers['Content-Length']) == len(content)
+    form = parse_form(request.headers['Content-Type'], content)
+    assert form['file'] == audio
+    assert form['model'] == b'whisper-1' and form['language'] == b'hi'
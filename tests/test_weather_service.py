@@ -0,0 +1,52 @@
+"""
+Weather service: advisory responses and per-loop concurrency limits
+"""
+
+import asyncio
+
+import pytest
+
+from backend import weather_service as ws
+
+HOT_AND_WET = {"current": {"temperature_c": 42, "humidity_percent": 90, "wind_speed_kmh": 30}}
+
+
+@pytest.mark.parametrize('language', ws.ADVISORY_LANGUAGES)
+def test_advisories_are_fresh_per_response(language):
+    service = ws.WeatherService()
+    first = service._generate_agri_advisory(HOT_AND_WET, 120.0, language)
+    assert first
+    for advisory in first:
+        advisory["message"] = "tampered"
+        advisory["extra"] = True
+
+    second = service._generate_agri_advisory(HOT_AND_WET, 120.0, language)
+    assert [a["type"] for a in second] == [a["type"] for a in first]
+    assert all(a["message"] != "tampered" and "extra" not in a for a in second)
+
+
+def test_advisory_templates_are_read_only():
+    template = ws.LOCALIZED_ADVISORIES["en"]["heat_stress"]
+    with pytest.raises(TypeError):
+        template["message"] = "tampered"
+
+
+def test_concurrency_slots_follow_the_running_loop(monkeypatch):
+    service = ws.WeatherService()
+    assert service._slots is None
+
+    async def fake_get_weather(location, language="en"):
+        await asyncio.sleep(0)
+        return {"location": location}
+
+    monkeypatch.setattr(service, 'get_weather', fake_get_weather)
+
+    async def fetch():
+        results = await service.get_weather_many(["Guntur", "Pune", "Agra"])
+        return [r["location"] for r in results], service._get_slots()
+
+    first, first_slots = asyncio.run(fetch())
+    second, second_slots = asyncio.run(fetch())
+    assert first == second == ["Guntur", "Pune", "Agra"]
+    assert first_slots is not second_slots
+    assert second_slots._value == ws.WEATHER_CONCURRENCY